@@ -1,18 +1,29 @@
 # Q8. ATM Transaction Simulation
-balance = float(input("Enter Account Balance: "))
-withdraw = float(input("Enter Amount to Withdraw: "))
-account_type = input("Enter Account Type (Saving/Current): ").lower()
-day = input("Enter Day (weekday/weekend): ").lower()
+MIN_BALANCE = 1000
+LIMITS = {"saving": 25000, "current": 50000}
+WEEKEND_FEE = 50
+FIELDS = (("balance", float), ("withdraw", float), ("account_type", str.lower), ("day", str.lower))
+RESULTS = ("status", "balance")
 
-min_balance = 1000
-limit = 25000 if account_type == "saving" else 50000
-fee = 50 if day == "weekend" else 0
 
-if withdraw > limit:
-    print("Failure: Exceeds daily limit")
-elif balance < withdraw + min_balance + fee:
-    print("Failure: Insufficient balance")
-else:
-    balance -= (withdraw + fee)
-    print("Withdrawal Successful")
-    print("Updated Balance =", balance)
+def atm_transaction(balance, withdraw, account_type, day):
+    limit = LIMITS["saving"] if account_type == "saving" else LIMITS["current"]
+    fee = WEEKEND_FEE if day == "weekend" else 0
+
+    if withdraw > limit:
+        return {"status": "Failure: Exceeds daily limit", "balance": balance}
+    if balance < withdraw + MIN_BALANCE + fee:
+        return {"status": "Failure: Insufficient balance", "balance": balance}
+    return {"status": "Withdrawal Successful", "balance": balance - (withdraw + fee)}
+
+
+if __name__ == "__main__":
+    balance = float(input("Enter Account Balance: "))
+    withdraw = float(input("Enter Amount to Withdraw: "))
+    account_type = input("Enter Account Type (Saving/Current): ").lower()
+    day = input("Enter Day (weekday/weekend): ").lower()
+
+    result = atm_transaction(balance, withdraw, account_type, day)
+    print(result["status"])
+    if result["status"] == "Withdrawal Successful":
+        print("Updated Balance =", result["balance"])
@@ -1,19 +1,31 @@
 # Q4. E-Commerce Discount Calculator
-price = float(input("Enter Product Price: "))
-user_type = input("Enter User Type (Regular/Premium/VIP): ").lower()
-payment = input("Payment Mode (Online/Offline): ").lower()
+REGULAR_RATES, REGULAR_FROM = (0.05, 0.10), 500  # rate below REGULAR_FROM, rate from it on
+PREMIUM_RATES, PREMIUM_FROM = (0.15, 0.20), 1000
+VIP_RATE = 0.25
+ONLINE_DISCOUNT = 0.05
+FIELDS = (("price", float), ("user_type", str.lower), ("payment", str.lower))
+RESULTS = ("discount", "final_price")
 
-discount = 0
 
-if user_type == "regular":
-    discount = 0.05 if price < 500 else 0.10
-elif user_type == "premium":
-    discount = 0.15 if price < 1000 else 0.20
-elif user_type == "vip":
-    discount = 0.25
+def discounted_price(price, user_type, payment):
+    discount = 0
 
-if payment == "online":
-    discount += 0.05
+    if user_type == "regular":
+        discount = REGULAR_RATES[0] if price < REGULAR_FROM else REGULAR_RATES[1]
+    elif user_type == "premium":
+        discount = PREMIUM_RATES[0] if price < PREMIUM_FROM else PREMIUM_RATES[1]
+    elif user_type == "vip":
+        discount = VIP_RATE
 
-final_price = price * (1 - discount)
-print("Final Discounted Price =", final_price)
+    if payment == "online":
+        discount += ONLINE_DISCOUNT
+
+    return {"discount": discount, "final_price": price * (1 - discount)}
+
+
+if __name__ == "__main__":
+    price = float(input("Enter Product Price: "))
+    user_type = input("Enter User Type (Regular/Premium/VIP): ").lower()
+    payment = input("Payment Mode (Online/Offline): ").lower()
+
+    print("Final Discounted Price =", discounted_price(price, user_type, payment)["final_price"])
@@ -1,19 +1,32 @@
 # Q1. Employee Salary Slip Generator
-basic = float(input("Enter Basic Salary: "))
+HRA_RATE, DA_RATE, PF_RATE = 0.20, 0.10, 0.12
+HIGH_NET, MID_NET = 80000, 50000
+CATEGORIES = ("High Earner", "Mid Earner", "Low Earner")
+FIELDS = (("basic", float),)
+RESULTS = ("hra", "da", "pf", "gross", "net", "category")
 
-hra = 0.20 * basic
-da = 0.10 * basic
-pf = 0.12 * basic
-gross = basic + hra + da
-net = gross - pf
 
-if net >= 80000:
-    category = "High Earner"
-elif net >= 50000:
-    category = "Mid Earner"
-else:
-    category = "Low Earner"
+def salary_slip(basic):
+    hra = HRA_RATE * basic
+    da = DA_RATE * basic
+    pf = PF_RATE * basic
+    gross = basic + hra + da
+    net = gross - pf
 
-print(f"Basic: {basic}, HRA: {hra}, DA: {da}, PF: {pf}")
-print(f"Gross Salary = {gross}, Net Salary = {net}")
-print("Category:", category)
+    if net >= HIGH_NET:
+        category = CATEGORIES[0]
+    elif net >= MID_NET:
+        category = CATEGORIES[1]
+    else:
+        category = CATEGORIES[2]
+
+    return {"hra": hra, "da": da, "pf": pf, "gross": gross, "net": net, "category": category}
+
+
+if __name__ == "__main__":
+    basic = float(input("Enter Basic Salary: "))
+
+    slip = salary_slip(basic)
+    print(f"Basic: {basic}, HRA: {slip['hra']}, DA: {slip['da']}, PF: {slip['pf']}")
+    print(f"Gross Salary = {slip['gross']}, Net Salary = {slip['net']}")
+    print("Category:", slip["category"])
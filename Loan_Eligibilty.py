@@ -1,16 +1,38 @@
 # Q2. Loan Eligibility System
-age = int(input("Enter Age: "))
-income = float(input("Enter Monthly Income: "))
-existing_loan = float(input("Enter Existing Loan Amount: "))
-cibil = int(input("Enter CIBIL Score: "))
+MIN_AGE, MAX_AGE = 21, 60
+MIN_INCOME = 25000
+MAX_LOAN_RATIO = 0.5
+MIN_CIBIL = 700
+# in the order the rules are checked; the first failing one is reported
+REASONS = (
+    "Eligible for Loan",
+    "Rejected due to age criteria",
+    "Rejected due to low income",
+    "Rejected due to high existing loan",
+    "Rejected due to low CIBIL score",
+)
+FIELDS = (("age", int), ("income", float), ("existing_loan", float), ("cibil", int))
+RESULTS = ("decision",)
 
-if not (21 <= age <= 60):
-    print("Rejected due to age criteria")
-elif income < 25000:
-    print("Rejected due to low income")
-elif existing_loan > 0.5 * income:
-    print("Rejected due to high existing loan")
-elif cibil < 700:
-    print("Rejected due to low CIBIL score")
-else:
-    print("Eligible for Loan")
+
+def loan_eligibility(age, income, existing_loan, cibil):
+    if not (MIN_AGE <= age <= MAX_AGE):
+        decision = REASONS[1]
+    elif income < MIN_INCOME:
+        decision = REASONS[2]
+    elif existing_loan > MAX_LOAN_RATIO * income:
+        decision = REASONS[3]
+    elif cibil < MIN_CIBIL:
+        decision = REASONS[4]
+    else:
+        decision = REASONS[0]
+    return {"decision": decision}
+
+
+if __name__ == "__main__":
+    age = int(input("Enter Age: "))
+    income = float(input("Enter Monthly Income: "))
+    existing_loan = float(input("Enter Existing Loan Amount: "))
+    cibil = int(input("Enter CIBIL Score: "))
+
+    print(loan_eligibility(age, income, existing_loan, cibil)["decision"])
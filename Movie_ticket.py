@@ -1,17 +1,26 @@
 # Q6. Movie Ticket Pricing System
-age = int(input("Enter Age: "))
-movie_type = input("Enter Movie Type (2D/3D): ").lower()
-day = input("Enter Day (weekday/weekend): ").lower()
+FIELDS = (("age", int), ("movie_type", str.lower), ("day", str.lower))
+RESULTS = ("price",)
 
-price = 200
-if movie_type == "3d":
-    price += 100
-if day == "weekend":
-    price += 50
 
-if age < 12:
-    price *= 0.5
-elif age > 60:
-    price *= 0.7
+def ticket_price(age, movie_type, day):
+    price = 200
+    if movie_type == "3d":
+        price += 100
+    if day == "weekend":
+        price += 50
 
-print("Final Ticket Price =", price)
+    if age < 12:
+        price *= 0.5
+    elif age > 60:
+        price *= 0.7
+
+    return {"price": price}
+
+
+if __name__ == "__main__":
+    age = int(input("Enter Age: "))
+    movie_type = input("Enter Movie Type (2D/3D): ").lower()
+    day = input("Enter Day (weekday/weekend): ").lower()
+
+    print("Final Ticket Price =", ticket_price(age, movie_type, day)["price"])
@@ -1,20 +1,30 @@
 # Q7. Online Examination Result
-correct = int(input("Enter Correct Answers: "))
-wrong = int(input("Enter Wrong Answers: "))
-unattempted = int(input("Enter Unattempted Questions: "))
+FIELDS = (("correct", int), ("wrong", int), ("unattempted", int))
+RESULTS = ("score", "result", "improve_accuracy")
 
-score = (correct * 4) + (wrong * -1)
 
-if score >= 180:
-    result = "Excellent"
-elif score >= 120:
-    result = "Good"
-elif score >= 60:
-    result = "Average"
-else:
-    result = "Fail"
+def exam_result(correct, wrong, unattempted):
+    score = (correct * 4) + (wrong * -1)
 
-print("Score =", score, "Result =", result)
+    if score >= 180:
+        result = "Excellent"
+    elif score >= 120:
+        result = "Good"
+    elif score >= 60:
+        result = "Average"
+    else:
+        result = "Fail"
 
-if wrong > correct:
-    print("Improve accuracy!")
+    return {"score": score, "result": result, "improve_accuracy": wrong > correct}
+
+
+if __name__ == "__main__":
+    correct = int(input("Enter Correct Answers: "))
+    wrong = int(input("Enter Wrong Answers: "))
+    unattempted = int(input("Enter Unattempted Questions: "))
+
+    outcome = exam_result(correct, wrong, unattempted)
+    print("Score =", outcome["score"], "Result =", outcome["result"])
+
+    if outcome["improve_accuracy"]:
+        print("Improve accuracy!")
@@ -1,23 +1,30 @@
 # Q9. Online Food Delivery Charges
-distance = int(input("Enter Delivery Distance (km): "))
-order_amount = float(input("Enter Order Amount: "))
-user_type = input("Enter User Type (Normal/Gold/Platinum): ").lower()
+BASE_DELIVERY = 50
+FREE_KM, PER_KM = 5, 10
+FREE_DELIVERY_FROM = 1000
+MEMBER_DISCOUNT = {"gold": 0.20, "platinum": 0.30}
+FIELDS = (("distance", int), ("order_amount", float), ("user_type", str.lower))
+RESULTS = ("delivery", "discount", "final_bill")
 
-# Delivery charges
-delivery = 50
-if distance > 5:
-    delivery += (distance - 5) * 10
-if order_amount >= 1000:
-    delivery = 0
 
-# Membership discount
-discount = 0
-if user_type == "gold":
-    discount = 0.20
-elif user_type == "platinum":
-    discount = 0.30
+def food_bill(distance, order_amount, user_type):
+    # Delivery charges
+    delivery = BASE_DELIVERY
+    if distance > FREE_KM:
+        delivery += (distance - FREE_KM) * PER_KM
+    if order_amount >= FREE_DELIVERY_FROM:
+        delivery = 0
 
-order_amount -= order_amount * discount
-final_bill = order_amount + delivery
+    # Membership discount
+    discount = MEMBER_DISCOUNT.get(user_type, 0)
 
-print("Final Bill Amount =", final_bill)
+    order_amount -= order_amount * discount
+    return {"delivery": delivery, "discount": discount, "final_bill": order_amount + delivery}
+
+
+if __name__ == "__main__":
+    distance = int(input("Enter Delivery Distance (km): "))
+    order_amount = float(input("Enter Order Amount: "))
+    user_type = input("Enter User Type (Normal/Gold/Platinum): ").lower()
+
+    print("Final Bill Amount =", food_bill(distance, order_amount, user_type)["final_bill"])
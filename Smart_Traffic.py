@@ -1,21 +1,31 @@
 # Q3. Smart Traffic Fine System
-speed = int(input("Enter Vehicle Speed: "))
-vehicle_type = input("Enter Vehicle Type (car/bike/truck): ").lower()
-seat_belt = input("Wearing Seat Belt? (Yes/No): ").lower()
-helmet = input("Wearing Helmet? (Yes/No): ").lower()
+FIELDS = (("speed", int), ("vehicle_type", str.lower), ("seat_belt", str.lower), ("helmet", str.lower))
+RESULTS = ("fine",)
 
-fine = 0
 
-if speed > 80:
-    fine += 2000
-if vehicle_type == "car" and seat_belt == "no":
-    fine += 1000
-if vehicle_type == "bike" and helmet == "no":
-    fine += 1500
-if vehicle_type == "truck" and speed > 60:
-    fine += 3000
+def traffic_fine(speed, vehicle_type, seat_belt, helmet):
+    fine = 0
 
-if fine > 0:
-    print("Total Fine =", fine)
-else:
-    print("No Fine. Drive Safe 🚗")
+    if speed > 80:
+        fine += 2000
+    if vehicle_type == "car" and seat_belt == "no":
+        fine += 1000
+    if vehicle_type == "bike" and helmet == "no":
+        fine += 1500
+    if vehicle_type == "truck" and speed > 60:
+        fine += 3000
+
+    return {"fine": fine}
+
+
+if __name__ == "__main__":
+    speed = int(input("Enter Vehicle Speed: "))
+    vehicle_type = input("Enter Vehicle Type (car/bike/truck): ").lower()
+    seat_belt = input("Wearing Seat Belt? (Yes/No): ").lower()
+    helmet = input("Wearing Helmet? (Yes/No): ").lower()
+
+    fine = traffic_fine(speed, vehicle_type, seat_belt, helmet)["fine"]
+    if fine > 0:
+        print("Total Fine =", fine)
+    else:
+        print("No Fine. Drive Safe 🚗")
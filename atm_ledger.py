@@ -0,0 +1,236 @@
+"""
+Streaming ATM ledger over many accounts.
+
+ATM_transaction.py checks one withdrawal against a typed-in balance. The
+Ledger here keeps every account's balance and the amount it has withdrawn
+today, and applies the same rules to a chronological stream of
+withdrawals:
+
+    - today's withdrawals may not exceed the account type's limit
+      (LIMITS: saving 25000, anything else 50000)
+    - weekends (Saturday/Sunday of the event date) add WEEKEND_FEE
+    - the balance after amount + fee must stay at MIN_BALANCE or more
+
+Each event is answered in order with the same status strings the script
+prints, and rejected withdrawals leave the account untouched.
+
+State lives in flat arrays indexed by a dict from account id to slot
+(8 byte balance, 8 byte day total, 4 byte day number, 1 byte type), so
+memory per account is mostly the dict entry and the id itself.
+
+    python atm_ledger.py accounts.csv events.csv > outcomes.csv
+    python atm_ledger.py accounts.csv - --output jsonl --balances final.csv < events.jsonl
+
+accounts: account, account_type, balance        events: date, account, amount
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import sys
+from array import array
+from datetime import date as Date
+
+from ATM_transaction import LIMITS, MIN_BALANCE, WEEKEND_FEE
+
+OK = "Withdrawal Successful"
+OVER_LIMIT = "Failure: Exceeds daily limit"
+NO_FUNDS = "Failure: Insufficient balance"
+UNKNOWN = "Failure: Unknown account"
+BAD_EVENT = "Failure: Invalid event"
+
+SAVING, CURRENT = 0, 1
+TYPE_NAMES = ("saving", "current")
+
+
+def limit_for(account_type):
+    return LIMITS["saving"] if account_type == "saving" else LIMITS["current"]
+
+
+def decide(balance, withdrawn_today, amount, limit, weekend):
+    """Status and fee for one withdrawal; the caller applies it only on OK."""
+    if not (amount > 0 and math.isfinite(amount)):
+        return BAD_EVENT, 0
+    if withdrawn_today + amount > limit:
+        return OVER_LIMIT, 0
+    fee = WEEKEND_FEE if weekend else 0
+    if balance < amount + MIN_BALANCE + fee:
+        return NO_FUNDS, 0
+    return OK, fee
+
+
+class Ledger:
+    def __init__(self):
+        self.index = {}
+        self.balance = array("d")
+        self.day_total = array("d")
+        self.day = array("l")
+        self.kind = bytearray()
+        self.limits = (float(LIMITS["saving"]), float(LIMITS["current"]))
+        self._dates = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def open_account(self, account, account_type, balance):
+        kind = SAVING if account_type.strip().lower() == "saving" else CURRENT
+        slot = self.index.get(account)
+        if slot is None:
+            self.index[account] = len(self.balance)
+            self.balance.append(float(balance))
+            self.day_total.append(0.0)
+            self.day.append(-1)
+            self.kind.append(kind)
+        else:
+            self.balance[slot] = float(balance)
+            self.kind[slot] = kind
+
+    def load_accounts(self, stream):
+        """Read account, account_type, balance rows from a CSV stream with a header."""
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [h.strip() for h in header]
+        a, t, b = (header.index(n) for n in ("account", "account_type", "balance"))
+        for row in reader:
+            if row:
+                self.open_account(row[a], row[t], row[b])
+
+    def _day(self, when):
+        # few distinct dates in a stream, so parse each once; keyed on the date
+        # alone so timestamped events don't add an entry per event
+        when = when[:10]
+        day = self._dates.get(when)
+        if day is None:
+            d = Date.fromisoformat(when)
+            day = self._dates[when] = (d.toordinal(), d.weekday() >= 5)
+        return day
+
+    def withdraw(self, account, amount, when):
+        """Apply one withdrawal; returns (status, fee, balance after)."""
+        slot = self.index.get(account)
+        if slot is None:
+            return UNKNOWN, 0, None
+        day, weekend = self._day(when)
+        if self.day[slot] != day:
+            self.day[slot] = day
+            self.day_total[slot] = 0.0
+        balance = self.balance[slot]
+        status, fee = decide(balance, self.day_total[slot], amount, self.limits[self.kind[slot]], weekend)
+        if status is not OK:
+            return status, fee, balance
+        balance -= amount + fee
+        self.balance[slot] = balance
+        self.day_total[slot] += amount
+        return OK, fee, balance
+
+    def process(self, events):
+        """Yield (date, account, amount, status, fee, balance) for (date, account, amount) events."""
+        withdraw = self.withdraw
+        for when, account, amount in events:
+            try:
+                amount = float(amount)
+                status, fee, balance = withdraw(account, amount, when)
+            except (TypeError, ValueError, OverflowError):
+                status, fee, balance = BAD_EVENT, 0, None
+            yield when, account, amount, status, fee, balance
+
+    def balances(self):
+        for account, slot in self.index.items():
+            yield account, TYPE_NAMES[self.kind[slot]], self.balance[slot]
+
+
+# ----------------------------- STREAMS -----------------------------
+
+
+def read_events(stream, fmt):
+    """Yield (date, account, amount) from CSV with a header or JSON Lines.
+
+    A short CSV row or a bad JSON line comes out with amount None, which
+    process() answers with BAD_EVENT instead of stopping the stream.
+    """
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [h.strip() for h in header]
+        d, a, m = (header.index(n) for n in ("date", "account", "amount"))
+        width = max(d, a, m) + 1
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:  # short row: no amount, so process() answers BAD_EVENT
+                row = row + [""] * (width - len(row))
+                yield row[d], row[a], None
+            else:
+                yield row[d], row[a], row[m]
+    else:
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                e = json.loads(line)
+                event = e["date"], str(e["account"]), e["amount"]
+            except (ValueError, KeyError, TypeError):  # not JSON, not an object or a field missing
+                event = "", "", None
+            yield event
+
+
+COLUMNS = ("date", "account", "amount", "status", "fee", "balance")
+
+
+def write_outcomes(out, outcomes, fmt="csv"):
+    n = 0
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        for n, row in enumerate(outcomes, 1):
+            writer.writerow(row)
+    else:
+        dumps = json.JSONEncoder(separators=(",", ":")).encode
+        for n, row in enumerate(outcomes, 1):
+            out.write(dumps(dict(zip(COLUMNS, row))))
+            out.write("\n")
+    return n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a stream of ATM withdrawals against account balances")
+    parser.add_argument("accounts", help="CSV of account, account_type, balance")
+    parser.add_argument("events", nargs="?", default="-", help="CSV/JSONL of date, account, amount; - for stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="event format (default: from extension, csv)")
+    parser.add_argument("--output", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--balances", help="write final balances to this CSV file")
+    args = parser.parse_args(argv)
+
+    ledger = Ledger()
+    with open(args.accounts, newline="", encoding="utf-8") as f:
+        ledger.load_accounts(f)
+
+    fmt = args.format
+    if args.events == "-":
+        src = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    else:
+        src = open(args.events, newline="", encoding="utf-8")
+        fmt = fmt or ("jsonl" if args.events.endswith((".jsonl", ".ndjson")) else "csv")
+    out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+    try:
+        write_outcomes(out, ledger.process(read_events(src, fmt or "csv")), args.output)
+    finally:
+        src.close()
+        out.flush()
+
+    if args.balances:
+        with open(args.balances, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(("account", "account_type", "balance"))
+            writer.writerows(ledger.balances())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
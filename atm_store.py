@@ -0,0 +1,176 @@
+"""
+Persistent ATM accounts in SQLite, safe for concurrent withdrawals.
+
+Every withdrawal is one check-and-debit transaction opened with BEGIN
+IMMEDIATE, which takes the write lock before the balance is read. Two
+withdrawals against the same account can't both see the old balance, so
+the minimum balance and daily limit hold however many threads or
+processes share the file. When another writer holds the lock the
+transaction is retried with capped exponential backoff and jitter.
+
+The rules are atm_ledger.decide(), the same ones the streaming Ledger
+and ATM_transaction.py apply. Every attempt is logged to `withdrawals`
+(accepted or not); the day's running total is summed from that log and
+verify() audits balances against it.
+
+    store = AccountStore("atm.db")
+    store.open_account("AC1", "saving", 30000)
+    status, fee, balance = store.withdraw("AC1", 2000)
+"""
+
+import math
+import random
+import sqlite3
+import time
+from datetime import date as Date
+
+from atm_ledger import BAD_EVENT, MIN_BALANCE, OK, UNKNOWN, decide, limit_for
+
+RETRIES = 50
+
+
+def connect(path, timeout=0.05):
+    # autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    # switching to WAL needs the write lock too, so it backs off like _write() does
+    delay = 0.001
+    for attempt in range(RETRIES):
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            break
+        except sqlite3.OperationalError as e:
+            if not _busy(e):
+                conn.close()
+                raise
+            time.sleep(delay * (0.5 + random.random()))
+            delay = min(delay * 2, 0.05)
+    else:
+        conn.close()
+        raise sqlite3.OperationalError(f"database still locked after {RETRIES} attempts to enable WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _busy(error):
+    return "locked" in str(error) or "busy" in str(error)
+
+
+def ensure_tables(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS accounts (
+                    account TEXT PRIMARY KEY,
+                    account_type TEXT NOT NULL,
+                    opening REAL NOT NULL,
+                    balance REAL NOT NULL
+                    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS withdrawals (
+                    id INTEGER PRIMARY KEY,
+                    account TEXT NOT NULL,
+                    day INTEGER NOT NULL,
+                    amount REAL NOT NULL,
+                    fee REAL NOT NULL,
+                    status TEXT NOT NULL
+                    )""")
+    # serves the per-day total of each withdrawal check
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_withdrawals_day "
+                 "ON withdrawals(account, day, status, amount)")
+
+
+class AccountStore:
+    """One connection per instance; give each thread or process its own store."""
+
+    def __init__(self, path, timeout=0.05, retries=RETRIES):
+        self.conn = connect(path, timeout)
+        self.retries = retries
+        self.retried = 0
+        self._write(lambda: ensure_tables(self.conn))
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self, fn):
+        """Run fn() inside BEGIN IMMEDIATE ... COMMIT, retrying while the database is locked."""
+        delay = 0.001
+        for attempt in range(self.retries):
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                if not _busy(e):
+                    raise
+                self.retried += 1
+                time.sleep(delay * (0.5 + random.random()))
+                delay = min(delay * 2, 0.05)
+                continue
+            try:
+                result = fn()
+                self.conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        raise sqlite3.OperationalError(f"database still locked after {self.retries} attempts")
+
+    def open_account(self, account, account_type, balance):
+        """Create an account; returns False if it already exists (it is left as is)."""
+        account_type = account_type.strip().lower()
+        return self._write(lambda: self.conn.execute(
+            "INSERT OR IGNORE INTO accounts (account, account_type, opening, balance) "
+            "VALUES (?, ?, ?, ?)", (account, account_type, float(balance), float(balance))).rowcount == 1)
+
+    def balance(self, account):
+        row = self.conn.execute("SELECT balance FROM accounts WHERE account = ?", (account,)).fetchone()
+        return row[0] if row else None
+
+    def withdraw(self, account, amount, when=None):
+        """Atomically check and debit; returns (status, fee, balance after)."""
+        d = Date.fromisoformat(when[:10]) if when else Date.today()
+        day, weekend = d.toordinal(), d.weekday() >= 5
+        amount = float(amount)
+        if not (amount > 0 and math.isfinite(amount)):
+            # decide() would say the same; answered here because NaN can't go in the log's NOT NULL column
+            return BAD_EVENT, 0, self.balance(account)
+
+        def txn():
+            row = self.conn.execute("SELECT account_type, balance FROM accounts WHERE account = ?",
+                                    (account,)).fetchone()
+            if row is None:
+                return UNKNOWN, 0, None
+            account_type, balance = row
+            # summed from the log so requests may arrive in any date order
+            day_total = self.conn.execute(
+                "SELECT COALESCE(SUM(amount), 0) FROM withdrawals "
+                "WHERE account = ? AND day = ? AND status = ?", (account, day, OK)).fetchone()[0]
+            status, fee = decide(balance, day_total, amount, limit_for(account_type), weekend)
+            if status is OK:
+                balance -= amount + fee
+                self.conn.execute("UPDATE accounts SET balance = ? WHERE account = ?",
+                                  (balance, account))
+            self.conn.execute("INSERT INTO withdrawals (account, day, amount, fee, status) "
+                              "VALUES (?, ?, ?, ?, ?)", (account, day, amount, fee, status))
+            return status, fee, balance
+
+        return self._write(txn)
+
+
+def verify(conn):
+    """Audit balances against the withdrawal log.
+
+    Returns a list of (account, problem) for accounts whose balance
+    doesn't equal opening minus accepted withdrawals and fees, that went
+    below MIN_BALANCE, or that withdrew more than their limit on a day.
+    """
+    problems = []
+    for account, account_type, opening, balance, spent in conn.execute(
+            "SELECT a.account, a.account_type, a.opening, a.balance, "
+            "COALESCE((SELECT SUM(w.amount + w.fee) FROM withdrawals w "
+            "          WHERE w.account = a.account AND w.status = ?), 0) "
+            "FROM accounts a", (OK,)):
+        if abs(opening - spent - balance) > 1e-6:
+            problems.append((account, f"balance {balance} != {opening} - {spent}"))
+        if balance < MIN_BALANCE and spent:
+            problems.append((account, f"balance {balance} below minimum"))
+    for account, account_type, day, total in conn.execute(
+            "SELECT w.account, a.account_type, w.day, SUM(w.amount) FROM withdrawals w "
+            "JOIN accounts a USING (account) WHERE w.status = ? GROUP BY w.account, w.day", (OK,)):
+        if total > limit_for(account_type):
+            problems.append((account, f"withdrew {total} on day {day}"))
+    return problems
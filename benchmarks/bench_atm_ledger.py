@@ -0,0 +1,94 @@
+"""
+Benchmark: atm_ledger.Ledger throughput and memory per account.
+
+    python benchmarks/bench_atm_ledger.py [events] [accounts]      (default 2000000 100000)
+
+Opens `accounts` accounts (ids like "AC0000042"), then runs `events`
+withdrawals spread over 30 consecutive days, first from in-memory tuples
+(engine only) and then end to end from a CSV file to a byte-counting
+sink. Memory per account is measured with tracemalloc while opening the
+accounts. One JSON object per line.
+"""
+
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from atm_ledger import OK, Ledger, read_events, write_outcomes
+
+
+class Sink:
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, s):
+        self.bytes += len(s)
+
+
+def make_accounts(n, rng):
+    return [(f"AC{i:07d}", rng.choice(("saving", "current")), float(rng.randint(0, 200_000)))
+            for i in range(n)]
+
+
+def make_events(n, accounts, rng):
+    start = date(2026, 1, 1)
+    days = [(start + timedelta(d)).isoformat() for d in range(30)]
+    ids = [a[0] for a in accounts]
+    per_day = max(1, n // len(days))
+    for i in range(n):
+        yield days[min(i // per_day, len(days) - 1)], rng.choice(ids), str(rng.randint(100, 20_000))
+
+
+def open_all(accounts):
+    ledger = Ledger()
+    for a in accounts:
+        ledger.open_account(*a)
+    return ledger
+
+
+if __name__ == "__main__":
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_accounts = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    rng = random.Random(7)
+    accounts = make_accounts(n_accounts, rng)
+
+    tracemalloc.start()
+    ledger = open_all(accounts)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(json.dumps({"bench": "atm_ledger", "mode": "memory", "accounts": n_accounts,
+                      "bytes_per_account": used / n_accounts}), flush=True)
+
+    events = list(make_events(n_events, accounts, rng))
+    t = time.perf_counter()
+    ok = sum(1 for row in ledger.process(events) if row[3] == OK)
+    seconds = time.perf_counter() - t
+    print(json.dumps({"bench": "atm_ledger", "mode": "engine", "events": n_events, "accounts": n_accounts,
+                      "accepted": ok, "seconds": seconds, "events_per_s": n_events / seconds}), flush=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(("date", "account", "amount"))
+            writer.writerows(events)
+        del events
+        ledger = open_all(accounts)
+        sink = Sink()
+        with open(path, newline="") as src:
+            t = time.perf_counter()
+            n = write_outcomes(sink, ledger.process(read_events(src, "csv")))
+            seconds = time.perf_counter() - t
+        print(json.dumps({"bench": "atm_ledger", "mode": "csv->csv", "events": n, "accounts": n_accounts,
+                          "seconds": seconds, "events_per_s": n / seconds, "out_mb": sink.bytes / 1e6}),
+              flush=True)
@@ -0,0 +1,95 @@
+"""
+Stress test: concurrent withdrawals against atm_store.AccountStore.
+
+    python benchmarks/bench_atm_store.py [processes] [threads] [per_worker] [accounts]
+                                          (default 4 4 500 8)
+
+processes x threads workers, each with its own connection, hammer a few
+hot accounts with random withdrawals spread over a week, so most
+requests contend for the write lock and many accounts run down to their
+minimum balance. Afterwards atm_store.verify() checks every balance
+against the withdrawal log, the minimum balance and the daily limits.
+Prints one JSON object and exits non-zero if anything is off.
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from atm_store import AccountStore, verify
+
+DAYS = [f"2026-03-{d:02d}" for d in range(2, 9)]  # Monday to Sunday
+
+
+def worker(path, seed, count, accounts, out):
+    rng = random.Random(seed)
+    store = AccountStore(path)
+    statuses = {}
+    try:
+        for _ in range(count):
+            status, _, _ = store.withdraw(rng.choice(accounts), rng.randint(100, 9_000), rng.choice(DAYS))
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        store.close()
+    out.append((statuses, store.retried))
+
+
+def process_main(path, seed, threads, count, accounts, queue):
+    out = []
+    pool = [threading.Thread(target=worker, args=(path, seed * 1000 + t, count, accounts, out))
+            for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    queue.put(out)
+
+
+if __name__ == "__main__":
+    processes, threads, per_worker, n_accounts = (
+        [int(a) for a in sys.argv[1:5]] + [4, 4, 500, 8][len(sys.argv[1:5]):])
+    accounts = [f"HOT{i}" for i in range(n_accounts)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "atm.db")
+        setup = AccountStore(path)
+        for i, a in enumerate(accounts):
+            setup.open_account(a, "saving" if i % 2 else "current", 150_000)
+        setup.close()
+
+        queue = multiprocessing.Queue()
+        t = time.perf_counter()
+        procs = [multiprocessing.Process(target=process_main,
+                                         args=(path, p, threads, per_worker, accounts, queue))
+                 for p in range(processes)]
+        for p in procs:
+            p.start()
+        results = [r for _ in procs for r in queue.get()]
+        for p in procs:
+            p.join()
+        seconds = time.perf_counter() - t
+
+        statuses, retried = {}, 0
+        for s, r in results:
+            retried += r
+            for k, v in s.items():
+                statuses[k] = statuses.get(k, 0) + v
+        total = sum(statuses.values())
+        conn = sqlite3.connect(path)
+        problems = verify(conn)
+        logged = conn.execute("SELECT COUNT(*) FROM withdrawals").fetchone()[0]
+        conn.close()
+
+    print(json.dumps({"bench": "atm_store", "processes": processes, "threads": threads,
+                      "accounts": n_accounts, "transactions": total, "logged": logged,
+                      "seconds": seconds, "tx_per_s": total / seconds, "lock_retries": retried,
+                      "statuses": statuses, "problems": problems[:10]}))
+    sys.exit(1 if problems or logged != total else 0)
@@ -0,0 +1,65 @@
+"""
+Benchmark: serial vs. decrypt_batch() across worker counts.
+
+    python benchmarks/bench_batch_decrypt.py [rows]      (default 100000)
+
+Decrypts every row of a synthetic Fernet vault and of the same vault
+migrated to AES-GCM, first on the main thread and then with thread and
+process pools of 1, 2, 4, ... up to the CPU count. One JSON object per line.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vault_crypto import VaultCipher, decrypt_batch, migrate_rows
+from vault_gen import generate
+
+
+def worker_counts():
+    n, counts = os.cpu_count() or 1, []
+    w = 1
+    while w < n:
+        counts.append(w)
+        w *= 2
+    return counts + [n]
+
+
+def bench(conn, cipher, fmt, rows):
+    items = conn.execute("SELECT id, password FROM vault ORDER BY id").fetchall()
+    t = time.perf_counter()
+    for _, token in items:
+        cipher.decrypt(token)
+    serial = time.perf_counter() - t
+    print(json.dumps({"bench": "batch_decrypt", "format": fmt, "rows": rows, "mode": "serial",
+                      "workers": 1, "seconds": serial, "rows_per_s": rows / serial}), flush=True)
+    for processes in (False, True):
+        for workers in worker_counts():
+            t = time.perf_counter()
+            for _ in decrypt_batch(cipher, items, workers, processes=processes):
+                pass
+            seconds = time.perf_counter() - t
+            print(json.dumps({"bench": "batch_decrypt", "format": fmt, "rows": rows,
+                              "mode": "processes" if processes else "threads", "workers": workers,
+                              "seconds": seconds, "rows_per_s": rows / seconds,
+                              "speedup": serial / seconds}), flush=True)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vault.db")
+        key = generate(rows, path)
+        conn = sqlite3.connect(path)
+        bench(conn, VaultCipher(key, "fernet"), "fernet", rows)
+        cipher = VaultCipher(key, "aesgcm")
+        for _ in migrate_rows(conn, cipher):
+            pass
+        bench(conn, cipher, "aesgcm", rows)
+        conn.close()
@@ -0,0 +1,69 @@
+"""
+Benchmark: cibil_client.BureauClient against the local MockBureau.
+
+    python benchmarks/bench_cibil_client.py [lookups] [applicants] [latency]
+                                             (default 5000 500 0.02)
+
+Looks up `lookups` ids drawn from `applicants` distinct applicants (so
+most are repeats) three ways: one at a time over a fresh connection per
+request, the way a loop around urllib would; through a cold BureauClient;
+and again through the same, now warm, client. One JSON object per line.
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cibil_client import BureauClient, ConnectionPool, MockBureau, mock_score
+
+
+async def naive(port, ids):
+    scores = []
+    for a in ids:
+        pool = ConnectionPool("127.0.0.1", port, size=1)
+        _, body = await pool.request(f"/score/{a}")
+        await pool.close()
+        scores.append(json.loads(body)["score"])
+    return scores
+
+
+async def run(lookups, applicants, latency):
+    rng = random.Random(5)
+    ids = [f"A{rng.randrange(applicants):06d}" for _ in range(lookups)]
+    expected = [mock_score(a) for a in ids]
+    async with MockBureau(latency=latency) as bureau:
+        # the sequential loop pays full latency per lookup, so time a slice of it
+        sample = ids[:min(lookups, 200)]
+        t = time.perf_counter()
+        scores = await naive(bureau.port, sample)
+        seconds = time.perf_counter() - t
+        print(json.dumps({"bench": "cibil_client", "mode": "sequential", "lookups": len(sample),
+                          "seconds": seconds, "lookups_per_s": len(sample) / seconds,
+                          "server_requests": bureau.requests,
+                          "mismatches": sum(s != e for s, e in zip(scores, expected))}), flush=True)
+
+        mismatches = 0
+        async with BureauClient(port=bureau.port) as client:
+            for mode in ("cold", "warm"):
+                served = bureau.requests
+                t = time.perf_counter()
+                scores = await client.scores(ids)
+                seconds = time.perf_counter() - t
+                mismatches += sum(s != e for s, e in zip(scores, expected))
+                print(json.dumps({"bench": "cibil_client", "mode": mode, "lookups": lookups,
+                                  "seconds": seconds, "lookups_per_s": lookups / seconds,
+                                  "server_requests": bureau.requests - served,
+                                  "connections": client.pool.opened, "stats": dict(client.stats),
+                                  "mismatches": mismatches}), flush=True)
+    return mismatches
+
+
+if __name__ == "__main__":
+    lookups, applicants = ([int(a) for a in sys.argv[1:3]] + [5000, 500][len(sys.argv[1:3]):])
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+    sys.exit(1 if asyncio.run(run(lookups, applicants, latency)) else 0)
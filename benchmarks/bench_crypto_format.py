@@ -0,0 +1,67 @@
+"""
+Benchmark: Fernet tokens vs. the compact AEAD row format.
+
+    python benchmarks/bench_crypto_format.py [rows]      (default 100000)
+
+Generates a Fernet vault with vault_gen.py, records file size and the
+time to decrypt every row, migrates it in place with migrate_rows() to
+AES-GCM and then ChaCha20-Poly1305, and records the same numbers again.
+One JSON object per line.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vault_crypto import VaultCipher, migrate_rows
+from vault_gen import generate
+
+
+def db_size(conn, path):
+    conn.execute("VACUUM")
+    return os.path.getsize(path)
+
+
+def decrypt_all(conn, cipher):
+    tokens = [r[0] for r in conn.execute("SELECT password FROM vault")]
+    t = time.perf_counter()
+    for token in tokens:
+        cipher.decrypt(token)
+    seconds = time.perf_counter() - t
+    return seconds, sum(len(tok) for tok in tokens) / len(tokens)
+
+
+def report(conn, path, rows, fmt, cipher, migrate_s=None):
+    seconds, avg = decrypt_all(conn, cipher)
+    print(json.dumps({
+        "bench": "crypto_format",
+        "format": fmt,
+        "rows": rows,
+        "db_bytes": db_size(conn, path),
+        "avg_token_bytes": avg,
+        "decrypt_all_s": seconds,
+        "decrypts_per_s": rows / seconds,
+        "migrate_s": migrate_s,
+    }), flush=True)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vault.db")
+        key = generate(rows, path)
+        conn = sqlite3.connect(path)
+        report(conn, path, rows, "fernet", VaultCipher(key, "fernet"))
+        for fmt in ("aesgcm", "chacha20"):
+            cipher = VaultCipher(key, fmt)
+            t = time.perf_counter()
+            for _ in migrate_rows(conn, cipher):
+                pass
+            report(conn, path, rows, fmt, cipher, time.perf_counter() - t)
+        conn.close()
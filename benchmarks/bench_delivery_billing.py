@@ -0,0 +1,72 @@
+"""
+Benchmark: delivery_billing throughput and distance cache hit ratio.
+
+    python benchmarks/bench_delivery_billing.py [orders] [chunk]      (default 1000000 100000)
+
+Synthetic city: 2000 restaurants and 100000 customer addresses in a
+30 x 30 km box, with a few popular restaurants and regular customers
+taking most of the orders. Bills every order in chunks with exact
+haversine distances and again through a DistanceCache, checks the
+exact bills against food_bill() and reports how often the cached
+(cell-centre) distance lands on a different whole km. One JSON object
+per line.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from delivery_billing import DistanceCache, bill_orders
+from Online_Food_Delivery import food_bill
+
+
+def orders(n, seed=8):
+    rng = np.random.default_rng(seed)
+    restaurants = np.column_stack([12.85 + rng.uniform(0, 0.27, 2000), 77.45 + rng.uniform(0, 0.28, 2000)])
+    homes = np.column_stack([12.85 + rng.uniform(0, 0.27, 100_000), 77.45 + rng.uniform(0, 0.28, 100_000)])
+    r = restaurants[(rng.zipf(1.3, n) - 1) % len(restaurants)]
+    h = homes[(rng.zipf(1.2, n) - 1) % len(homes)]
+    return {"restaurant_lat": r[:, 0], "restaurant_lon": r[:, 1],
+            "customer_lat": h[:, 0], "customer_lon": h[:, 1],
+            "order_amount": np.round(rng.uniform(80, 1600, n), 2),
+            "user_type": rng.choice(np.array(["normal", "gold", "platinum"]), n)}
+
+
+def run(columns, chunk, cache=None):
+    n = len(columns["order_amount"])
+    km = np.empty(n)
+    final = np.empty(n)
+    t = time.perf_counter()
+    for start in range(0, n, chunk):
+        b = bill_orders({k: v[start:start + chunk] for k, v in columns.items()}, cache)
+        km[start:start + chunk] = b["km"]
+        final[start:start + chunk] = b["final_bill"]
+    return time.perf_counter() - t, km, final
+
+
+if __name__ == "__main__":
+    n, chunk = [int(a) for a in sys.argv[1:3]] + [1_000_000, 100_000][len(sys.argv[1:3]):]
+    columns = orders(n)
+
+    seconds, km, final = run(columns, chunk)
+    m = min(n, 1_000_000)
+    expected = [food_bill(int(k), a, u)["final_bill"] for k, a, u in
+                zip(km[:m].tolist(), columns["order_amount"][:m].tolist(), columns["user_type"][:m].tolist())]
+    mismatches = int(np.count_nonzero(final[:m] != np.array(expected)))
+    print(json.dumps({"bench": "delivery_billing", "mode": "haversine", "orders": n, "chunk": chunk,
+                      "seconds": seconds, "orders_per_s": n / seconds, "checked": m,
+                      "mismatches": mismatches}), flush=True)
+
+    cache = DistanceCache()
+    cached_seconds, cached_km, _ = run(columns, chunk, cache)
+    print(json.dumps({"bench": "delivery_billing", "mode": "cached", "orders": n, "chunk": chunk,
+                      "seconds": cached_seconds, "orders_per_s": n / cached_seconds,
+                      "lookups": cache.lookups, "computed": cache.computed, "hit_ratio": cache.hit_ratio,
+                      "cached_pairs": len(cache.data),
+                      "km_differs": float(np.count_nonzero(cached_km != km) / n)}), flush=True)
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,56 @@
+"""
+Benchmark: loan_vector.evaluate() vs. a per-row loop over loan_eligibility().
+
+    python benchmarks/bench_loan_vector.py [rows]      (default 5000000)
+
+Draws random applicants (with values on and around every threshold), runs
+the vectorized evaluator over all of them and the scalar rule over the
+first million, and checks that every decision matches. One JSON object
+per line.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Loan_Eligibilty import loan_eligibility
+from loan_vector import evaluate, reasons, summary
+
+
+def applicants(n, seed=3):
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 66, n)
+    income = rng.integers(10_000, 120_000, n).astype(np.float64)
+    income[::17] = 25_000  # exactly on the income threshold
+    existing_loan = np.round(income * rng.uniform(0, 1, n), 2)
+    existing_loan[::13] = income[::13] * 0.5  # exactly half the income
+    cibil = rng.integers(550, 850, n)
+    return age, income, existing_loan, cibil
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    cols = applicants(rows)
+
+    evaluate(*(c[:1000] for c in cols))  # warm up
+    t = time.perf_counter()
+    codes = evaluate(*cols)
+    vec = time.perf_counter() - t
+    print(json.dumps({"bench": "loan_vector", "mode": "numpy", "rows": rows, "seconds": vec,
+                      "rows_per_s": rows / vec, "summary": summary(codes)}), flush=True)
+
+    m = min(rows, 1_000_000)
+    scalar_args = list(zip(*(c[:m].tolist() for c in cols)))
+    t = time.perf_counter()
+    expected = [loan_eligibility(*a)["decision"] for a in scalar_args]
+    loop = time.perf_counter() - t
+    mismatches = int(np.count_nonzero(reasons(codes[:m]) != np.asarray(expected, dtype=object)))
+    print(json.dumps({"bench": "loan_vector", "mode": "python_loop", "rows": m, "seconds": loop,
+                      "rows_per_s": m / loop, "speedup": (rows / vec) / (m / loop),
+                      "mismatches": mismatches}), flush=True)
+    sys.exit(1 if mismatches else 0)
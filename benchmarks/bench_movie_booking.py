@@ -0,0 +1,109 @@
+"""
+Load test: many concurrent users booking seats for one show.
+
+    python benchmarks/bench_movie_booking.py [users] [seconds] [rows] [seats]
+                                              (default 300 5 20 30)
+
+Each user is a thread that, until time is up, holds seats (mostly "n
+together", sometimes specific seats picked at random, which collide
+often), then confirms, releases or abandons the hold to expire (holds
+last 50 ms). A user keeps one booking at a time and cancels the old one
+after booking again, so seats keep changing hands; after a failed hold
+it waits a millisecond before trying again. Afterwards the seat bitsets
+are checked against every live booking and hold: no seat booked twice,
+nothing both booked and held, nothing marked that no one owns. Prints
+one JSON object and exits non-zero if anything is off.
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from movie_booking import BookingError, Show
+
+
+def user(show, seed, seconds, start, counts):
+    rng = random.Random(seed)
+    mine = []
+    c = dict.fromkeys(("holds", "conflicts", "bookings", "released", "abandoned", "cancelled",
+                       "expired_before_confirm"), 0)
+    start.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        n = rng.randint(1, 4)
+        try:
+            if rng.random() < 0.7:
+                hold_id, _ = show.hold_together(n, user=seed)
+            else:
+                row, col = rng.randrange(show.rows), rng.randrange(show.seats - n + 1)
+                hold_id = show.hold([(row, col + i) for i in range(n)], user=seed)
+        except BookingError:
+            c["conflicts"] += 1
+            time.sleep(0.001)
+            continue
+        c["holds"] += 1
+        action = rng.random()
+        if action < 0.75:
+            try:
+                mine.append(show.confirm(hold_id, [rng.randint(5, 80) for _ in range(n)])["booking_id"])
+                c["bookings"] += 1
+            except BookingError:
+                c["expired_before_confirm"] += 1
+        elif action < 0.9:
+            show.release(hold_id)
+            c["released"] += 1
+        else:
+            c["abandoned"] += 1
+        if len(mine) > 1:
+            show.cancel(mine.pop(0))
+            c["cancelled"] += 1
+    counts.append(c)
+
+
+def check(show):
+    problems = []
+    booked = bytearray(len(show.booked))
+    held = bytearray(len(show.held))
+    for owners, target in (((b for b, _ in show.bookings.values()), booked),
+                           ((h[0] for h in show.holds.values()), held)):
+        for bits in owners:
+            for i, mask in bits:
+                if booked[i] & mask or held[i] & mask:
+                    problems.append(f"seat byte {i} mask {mask} owned twice")
+                target[i] |= mask
+    if booked != show.booked:
+        problems.append("booked bitset does not match the bookings")
+    if held != show.held:
+        problems.append("held bitset does not match the holds")
+    return problems
+
+
+if __name__ == "__main__":
+    users, seconds, rows, seats = ([float(a) for a in sys.argv[1:5]] + [300, 5, 20, 30][len(sys.argv[1:5]):])
+    users, rows, seats = int(users), int(rows), int(seats)
+    show = Show("bench", rows, seats, "3d", "weekend", hold_seconds=0.05)
+    start = threading.Barrier(users + 1)
+    counts = []
+    threads = [threading.Thread(target=user, args=(show, u, seconds, start, counts)) for u in range(users)]
+    for t in threads:
+        t.start()
+    start.wait()
+    began = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    totals = {k: sum(c[k] for c in counts) for k in counts[0]}
+    with show.lock:
+        problems = check(show)
+    print(json.dumps({"bench": "movie_booking", "users": users, "seats": len(show), "seconds": elapsed,
+                      "bookings_per_s": totals["bookings"] / elapsed,
+                      "holds_per_s": totals["holds"] / elapsed, **totals,
+                      "live_bookings": len(show.bookings), "available": show.available(),
+                      "problems": problems[:10]}))
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,81 @@
+"""
+Benchmark: keyset pages vs. fetchall / OFFSET on the vault table.
+
+    python benchmarks/bench_pagination.py 10000 100000 1000000
+
+For each size a throwaway vault.db is filled with random rows and we time
+the first page, a page deep into the table (keyset vs. OFFSET) and the
+old full fetchall(). Results are printed as one JSON object per line.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vault_query import PAGE_SIZE, fetch_page
+
+
+def make_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE vault (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        service TEXT NOT NULL,
+        username TEXT NOT NULL,
+        password BLOB NOT NULL)""")
+    rnd = random.Random(rows)
+    letters = string.ascii_lowercase
+
+    def gen():
+        for _ in range(rows):
+            yield ("".join(rnd.choices(letters, k=8)) + ".com",
+                   "".join(rnd.choices(letters, k=6)),
+                   os.urandom(100))
+
+    conn.executemany("INSERT INTO vault (service, username, password) VALUES (?, ?, ?)", gen())
+    conn.commit()
+    return conn
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def bench(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(os.path.join(tmp, "vault.db"), rows)
+        deep = rows - PAGE_SIZE
+        last_id = conn.execute("SELECT id FROM vault ORDER BY id LIMIT 1 OFFSET ?", (deep,)).fetchone()[0]
+
+        result = {
+            "bench": "pagination",
+            "rows": rows,
+            "page_size": PAGE_SIZE,
+            "first_page_s": timed(lambda: fetch_page(conn)),
+            "deep_page_keyset_s": timed(lambda: fetch_page(conn, after=(last_id, last_id))),
+            "deep_page_offset_s": timed(lambda: conn.execute(
+                "SELECT id, service, username, password FROM vault ORDER BY id LIMIT ? OFFSET ?",
+                (PAGE_SIZE, deep)).fetchall()),
+            "fetchall_s": timed(lambda: conn.execute(
+                "SELECT id, service, username, password FROM vault").fetchall(), repeat=1),
+        }
+        conn.close()
+    return result
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for n in sizes:
+        print(json.dumps(bench(n)), flush=True)
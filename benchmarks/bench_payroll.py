@@ -0,0 +1,72 @@
+"""
+Benchmark: payroll.py over a large employee file.
+
+    python benchmarks/bench_payroll.py [employees] [chunk]      (default 1000000 100000)
+
+Writes a random employee CSV to a temp directory, then runs payroll.py on
+it in a child process, once for CSV output and once for slip text, and
+reports employees/s and the child's peak RSS. Also checks compute()
+against salary_slip() for every basic salary in the file. One JSON
+object per line.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from Employee_Salary import CATEGORIES, salary_slip
+from payroll import compute
+
+
+def write_employees(path, n, seed=4, chunk=100_000):
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as f:
+        f.write("employee_id,name,basic\n")
+        for start in range(0, n, chunk):
+            basic = np.round(rng.lognormal(10.6, 0.5, min(chunk, n - start)), 2)
+            f.write("".join(f"E{start + i:07d},Employee {start + i},{b}\n" for i, b in enumerate(basic.tolist())))
+
+
+def check(path):
+    basic = np.loadtxt(path, delimiter=",", skiprows=1, usecols=2)
+    slip = compute(basic)
+    mismatches = 0
+    for i, b in enumerate(basic.tolist()):
+        expected = salary_slip(b)
+        if expected["net"] != slip["net"][i] or expected["category"] != CATEGORIES[slip["category"][i]]:
+            mismatches += 1
+    return len(basic), mismatches
+
+
+if __name__ == "__main__":
+    n, chunk = [int(a) for a in sys.argv[1:3]] + [1_000_000, 100_000][len(sys.argv[1:3]):]
+    problems = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "employees.csv")
+        write_employees(src, n)
+        for mode, flags in (("csv", []), ("slips", ["--slips"])):
+            out = os.path.join(tmp, f"out.{mode}")
+            t = time.perf_counter()
+            subprocess.run([sys.executable, str(ROOT / "payroll.py"), src, "--out", out,
+                            "--chunk", str(chunk)] + flags, check=True, stderr=subprocess.DEVNULL)
+            seconds = time.perf_counter() - t
+            # ru_maxrss is the largest child so far, so the slips run only shows if it peaks higher
+            peak_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+            print(json.dumps({"bench": "payroll", "mode": mode, "employees": n, "chunk": chunk,
+                              "seconds": seconds, "employees_per_s": n / seconds,
+                              "output_mb": os.path.getsize(out) / 2**20, "peak_rss_mb": peak_mb}),
+                  flush=True)
+        checked, mismatches = check(src)
+    problems += mismatches
+    print(json.dumps({"bench": "payroll", "mode": "check", "checked": checked, "mismatches": mismatches}))
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,81 @@
+"""
+Benchmark: pricing_engine.PricingEngine vs. a loop over discounted_price().
+
+    python benchmarks/bench_pricing.py [catalog_size]      (default 1000000)
+
+Prices a random catalog (with prices on every tier threshold) for every
+user type x payment mode with matrix(), then a random order stream of the
+same length with quote(), and checks a million quotes of each against the
+scalar rule from E-commerce_discount.py. One JSON object per line.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pricing_engine import PricingEngine
+from rules_batch import load_rule
+
+discounted_price, _ = load_rule("discount")
+
+
+def catalog(n, seed=11):
+    rng = np.random.default_rng(seed)
+    prices = np.round(rng.uniform(1, 3000, n), 2)
+    prices[::7] = 500
+    prices[::11] = 1000
+    return prices
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    engine = PricingEngine()
+    prices = catalog(n)
+    users = engine.user_types + ("guest",)
+    payments = engine.payments + ("cod",)
+
+    # the first run also pays for faulting in the fresh output pages
+    times = []
+    for _ in range(3):
+        t = time.perf_counter()
+        discount, final = engine.matrix(prices)
+        times.append(time.perf_counter() - t)
+    seconds = min(times)
+    quotes = final.size
+
+    m = min(n, 1_000_000 // (len(users) * len(payments)))
+    mismatches = 0
+    t = time.perf_counter()
+    for u, user in enumerate(users):
+        for p, payment in enumerate(payments):
+            expected = [discounted_price(x, user, payment)["final_price"] for x in prices[:m].tolist()]
+            mismatches += int(np.count_nonzero(final[u, p, :m] != np.array(expected)))
+    loop = time.perf_counter() - t
+    checked = m * len(users) * len(payments)
+    print(json.dumps({"bench": "pricing", "mode": "matrix", "catalog": n, "quotes": quotes,
+                      "seconds": seconds, "first_run_seconds": times[0],
+                      "quotes_per_s": quotes / seconds, "python_loop_quotes_per_s": checked / loop,
+                      "checked": checked, "mismatches": mismatches}), flush=True)
+
+    rng = np.random.default_rng(12)
+    order_users = rng.choice(np.array(users), n)
+    order_payments = rng.choice(np.array(payments), n)
+    times = []
+    for _ in range(3):
+        t = time.perf_counter()
+        _, final = engine.quote(prices, order_users, order_payments)
+        times.append(time.perf_counter() - t)
+    seconds = min(times)
+    k = min(n, 1_000_000)
+    expected = [discounted_price(x, u, p)["final_price"] for x, u, p in
+                zip(prices[:k].tolist(), order_users[:k].tolist(), order_payments[:k].tolist())]
+    bad = int(np.count_nonzero(final[:k] != np.array(expected)))
+    mismatches += bad
+    print(json.dumps({"bench": "pricing", "mode": "quote", "orders": n, "seconds": seconds,
+                      "quotes_per_s": n / seconds, "checked": k, "mismatches": bad}), flush=True)
+    sys.exit(1 if mismatches else 0)
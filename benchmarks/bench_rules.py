@@ -0,0 +1,93 @@
+"""
+Benchmark: rules_batch throughput per rule.
+
+    python benchmarks/bench_rules.py [records]      (default 1000000)
+
+For every rule, writes `records` random CSV and JSONL records to a temp
+file, then streams them through rules_batch.process() into a sink that
+only counts bytes. Also times the bare rule function over pre-converted
+arguments, which is the ceiling for the parsing/formatting overhead.
+One JSON object per line.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rules_batch import RULES, load_rule, process
+
+SAMPLES = {
+    "atm": lambda r: [r.randint(0, 100_000), r.randint(100, 60_000),
+                      r.choice(["saving", "current"]), r.choice(["weekday", "weekend"])],
+    "loan": lambda r: [r.randint(18, 70), r.randint(5_000, 200_000), r.randint(0, 150_000),
+                       r.randint(300, 900)],
+    "discount": lambda r: [r.randint(50, 5_000), r.choice(["regular", "premium", "vip"]),
+                           r.choice(["online", "offline"])],
+    "food": lambda r: [r.randint(0, 25), r.randint(50, 3_000), r.choice(["normal", "gold", "platinum"])],
+    "traffic": lambda r: [r.randint(20, 140), r.choice(["car", "bike", "truck"]),
+                          r.choice(["yes", "no"]), r.choice(["yes", "no"])],
+    "movie": lambda r: [r.randint(3, 90), r.choice(["2d", "3d"]), r.choice(["weekday", "weekend"])],
+    "salary": lambda r: [r.randint(10_000, 150_000)],
+    "exam": lambda r: [r.randint(0, 50), r.randint(0, 50), r.randint(0, 20)],
+    "admission": lambda r: [r.randint(30, 100), r.randint(30, 100), r.randint(30, 100)],
+}
+
+
+class Sink:
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, s):
+        self.bytes += len(s)
+
+
+def write_inputs(name, records, tmp):
+    names = [f for f, _ in load_rule(name)[1]]
+    rng = random.Random(42)
+    csv_path, jsonl_path = os.path.join(tmp, f"{name}.csv"), os.path.join(tmp, f"{name}.jsonl")
+    rows = []
+    with open(csv_path, "w") as c, open(jsonl_path, "w") as j:
+        c.write(",".join(names) + "\n")
+        for _ in range(records):
+            values = SAMPLES[name](rng)
+            c.write(",".join(map(str, values)) + "\n")
+            j.write(json.dumps(dict(zip(names, values))) + "\n")
+            if len(rows) < 100_000:
+                rows.append(values)
+    return csv_path, jsonl_path, rows
+
+
+def bench(name, records, tmp):
+    csv_path, jsonl_path, rows = write_inputs(name, records, tmp)
+    rule, fields = load_rule(name)
+    args = [[conv(str(v)) for (_, conv), v in zip(fields, row)] for row in rows]
+    t = time.perf_counter()
+    for a in args:
+        rule(*a)
+    bare = len(args) / (time.perf_counter() - t)
+    print(json.dumps({"bench": "rules", "rule": name, "mode": "function", "records": len(args),
+                      "records_per_s": bare}), flush=True)
+    for fmt, path in (("csv", csv_path), ("jsonl", jsonl_path)):
+        for out_format in ("jsonl", "csv"):
+            sink = Sink()
+            with open(path, newline="") as src:
+                t = time.perf_counter()
+                n = process(name, src, sink, fmt, out_format)
+                seconds = time.perf_counter() - t
+            print(json.dumps({"bench": "rules", "rule": name, "mode": f"{fmt}->{out_format}",
+                              "records": n, "seconds": seconds, "records_per_s": n / seconds,
+                              "out_mb": sink.bytes / 1e6}), flush=True)
+
+
+if __name__ == "__main__":
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    names = sys.argv[2:] or sorted(RULES)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            bench(name, records, tmp)
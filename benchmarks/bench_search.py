@@ -0,0 +1,49 @@
+"""
+Benchmark: trigram fuzzy search vs. SQL LIKE.
+
+    python benchmarks/bench_search.py [rows]      (default 100000)
+
+Builds a TrigramIndex over a synthetic vault, then times a handful of
+exact and misspelled queries against the index and against the LIKE
+query the UIs used before. One JSON object per line.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pagination import timed
+from vault_gen import generate
+from vault_query import fetch_page
+from vault_search import TrigramIndex
+
+QUERIES = ["github", "gihtub", "netflx", "amzon", "linkedin", "sl"]
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vault.db")
+        generate(rows, path)
+        t = time.perf_counter()
+        index = TrigramIndex.from_db(path)
+        print(json.dumps({"bench": "search", "rows": rows, "op": "build_index",
+                          "seconds": time.perf_counter() - t, "grams": len(index.postings)}), flush=True)
+        conn = sqlite3.connect(path)
+        for q in QUERIES:
+            print(json.dumps({
+                "bench": "search",
+                "rows": rows,
+                "query": q,
+                "fuzzy_s": timed(lambda: index.search(q)),
+                "fuzzy_hits": len(index.search(q)),
+                "like_s": timed(lambda: fetch_page(conn, search=q)),
+                "like_hits": len(fetch_page(conn, search=q)[0]),
+            }), flush=True)
+        conn.close()
@@ -0,0 +1,51 @@
+"""
+Benchmark: sorted vault pages with and without the NOCASE indexes.
+
+    python benchmarks/bench_sort.py [rows]      (default 100000)
+
+Times the first and a deep page sorted by service and by username, once
+on a bare table (SQLite has to sort everything) and once after
+ensure_indexes() (index scan). One JSON object per line.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pagination import make_db, timed
+from vault_query import PAGE_SIZE, ensure_indexes, fetch_page
+
+
+def run(conn, rows, indexed):
+    for sort in ("service", "username"):
+        for desc in (False, True):
+            # cursor halfway through the table for the deep page
+            order = "DESC" if desc else "ASC"
+            mid = conn.execute(
+                f"SELECT {sort}, id FROM vault ORDER BY {sort} COLLATE NOCASE {order}, id {order} "
+                f"LIMIT 1 OFFSET ?", (rows // 2,)).fetchone()
+            print(json.dumps({
+                "bench": "sort",
+                "rows": rows,
+                "indexed": indexed,
+                "sort": sort,
+                "descending": desc,
+                "page_size": PAGE_SIZE,
+                "first_page_s": timed(lambda: fetch_page(conn, sort, desc)),
+                "deep_page_s": timed(lambda: fetch_page(conn, sort, desc, after=mid)),
+            }), flush=True)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(os.path.join(tmp, "vault.db"), rows)
+        run(conn, rows, False)
+        ensure_indexes(conn)
+        conn.execute("ANALYZE")
+        run(conn, rows, True)
+        conn.close()
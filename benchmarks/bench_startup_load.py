@@ -0,0 +1,98 @@
+"""
+Benchmark: blocking PageLoader vs. AsyncPageLoader on the UI thread.
+
+    python benchmarks/bench_startup_load.py [rows]      (default 100000)
+
+There is no display here, so a small after() loop stands in for Tk. For
+each loader it reports time to the first rows (first paint of entries),
+time until the first page is complete (interactive) and the longest
+single stretch the UI thread was blocked. Widget inserts are not
+included; decryption is Fernet and AES-GCM. One JSON object per line.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vault_crypto import VaultCipher, migrate_rows
+from vault_gen import generate
+from vault_query import AsyncPageLoader, PageLoader
+
+
+class FakeRoot:
+    """after()/mainloop() with just enough of Tk's timing behaviour."""
+
+    def __init__(self):
+        self.queue = []
+        self.seq = itertools.count()
+        self.longest = 0.0
+
+    def after(self, ms, fn, *args):
+        heapq.heappush(self.queue, (time.perf_counter() + ms / 1000, next(self.seq), fn, args))
+
+    def run(self, until):
+        while self.queue and not until():
+            due, _, fn, args = heapq.heappop(self.queue)
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            t = time.perf_counter()
+            fn(*args)
+            self.longest = max(self.longest, time.perf_counter() - t)
+
+
+def bench(path, cipher, fmt, rows):
+    def decode(row):
+        try:
+            return row[0], row[1], row[2], cipher.decrypt(row[3]).decode()
+        except Exception:
+            return row[0], row[1], row[2], None
+
+    # blocking: fetch, decrypt and insert inside the call that builds the screen
+    got = []
+    t = time.perf_counter()
+    PageLoader(path, lambda page: got.extend(decode(r) for r in page)).reset()
+    blocked = time.perf_counter() - t
+    print(json.dumps({"bench": "startup_load", "format": fmt, "rows": rows, "loader": "blocking",
+                      "first_rows_ms": blocked * 1000, "interactive_ms": blocked * 1000,
+                      "longest_block_ms": blocked * 1000}), flush=True)
+
+    root, got, marks = FakeRoot(), [], {}
+
+    def progress(shown, total, busy):
+        now = time.perf_counter() - t
+        if shown and "first" not in marks:
+            marks["first"] = now
+        if not busy:
+            marks["done"] = now
+
+    t = time.perf_counter()
+    loader = AsyncPageLoader(root, path, got.extend, decode=decode, on_progress=progress)
+    loader.reset()
+    call = time.perf_counter() - t
+    root.run(lambda: "done" in marks)
+    print(json.dumps({"bench": "startup_load", "format": fmt, "rows": rows, "loader": "async",
+                      "first_rows_ms": marks["first"] * 1000, "interactive_ms": marks["done"] * 1000,
+                      "longest_block_ms": max(call, root.longest) * 1000}), flush=True)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vault.db")
+        key = generate(rows, path)
+        bench(path, VaultCipher(key, "fernet"), "fernet", rows)
+        cipher = VaultCipher(key, "aesgcm")
+        conn = sqlite3.connect(path)
+        for _ in migrate_rows(conn, cipher):
+            pass
+        conn.close()
+        bench(path, cipher, "aesgcm", rows)
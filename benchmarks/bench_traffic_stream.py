@@ -0,0 +1,104 @@
+"""
+Benchmark: traffic_stream throughput from a file and from socket clients.
+
+    python benchmarks/bench_traffic_stream.py [events] [clients]      (default 1000000 8)
+
+Writes `events` random sensor events to a temp file and runs them through
+run_file(). Then `clients` TCP clients send the same events to a local
+server as fast as they can, while the queue depth is sampled to show
+that backpressure keeps it at or under its bound. Fine totals are checked
+against a plain loop over traffic_fine(). One JSON object per line.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Smart_Traffic import traffic_fine
+from traffic_stream import FineProcessor, consume, generate, read_socket, run_file
+
+QUEUE_SIZE = 64
+
+
+def expected_fines(lines):
+    total = 0
+    for line in lines:
+        e = json.loads(line)
+        total += traffic_fine(e["speed"], e["vehicle_type"], e["seat_belt"], e["helmet"])["fine"]
+    return total
+
+
+def fines(processor):
+    return sum(v["fines"] for v in processor.window.snapshot().values())
+
+
+async def socket_run(lines, clients):
+    processor = FineProcessor(window=1e9)  # keep every event in the window so totals can be checked
+    queue = asyncio.Queue(QUEUE_SIZE)
+    consumer = asyncio.create_task(consume(queue, processor))
+    server = await asyncio.start_server(lambda r, w: read_socket(r, queue), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    peak = 0
+
+    async def client(part):
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        data = ("\n".join(part) + "\n").encode()
+        for i in range(0, len(data), 1 << 16):
+            writer.write(data[i:i + (1 << 16)])
+            await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    async def sample():
+        nonlocal peak
+        while True:
+            peak = max(peak, queue.qsize())
+            await asyncio.sleep(0.001)
+
+    sampler = asyncio.create_task(sample())
+    t = time.perf_counter()
+    await asyncio.gather(*(client(lines[i::clients]) for i in range(clients)))
+    while processor.events < len(lines):
+        await asyncio.sleep(0.001)
+    seconds = time.perf_counter() - t
+    for task in (sampler, consumer):
+        task.cancel()
+    server.close()
+    await server.wait_closed()
+    return processor, seconds, peak
+
+
+if __name__ == "__main__":
+    n, clients = [int(a) for a in sys.argv[1:3]] + [1_000_000, 8][len(sys.argv[1:3]):]
+    lines = list(generate(n, start=0))
+    expected = expected_fines(lines)
+    problems = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        processor = FineProcessor(window=1e9)
+        t = time.perf_counter()
+        with open(path) as f:
+            asyncio.run(run_file(f, processor))
+        seconds = time.perf_counter() - t
+    problems += processor.events != n or fines(processor) != expected
+    print(json.dumps({"bench": "traffic_stream", "mode": "file", "events": processor.events,
+                      "seconds": seconds, "events_per_s": n / seconds, "fined": processor.fined,
+                      "fines": fines(processor), "expected_fines": expected}), flush=True)
+
+    processor, seconds, peak = asyncio.run(socket_run(lines, clients))
+    problems += processor.events != n or fines(processor) != expected or peak > QUEUE_SIZE
+    print(json.dumps({"bench": "traffic_stream", "mode": "socket", "clients": clients,
+                      "events": processor.events, "seconds": seconds, "events_per_s": n / seconds,
+                      "peak_queue": peak, "queue_size": QUEUE_SIZE, "fines": fines(processor),
+                      "expected_fines": expected, "tracked_plates": len(processor.plates.totals)}),
+          flush=True)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,218 @@
+"""
+End-to-end vault benchmark suite.
+
+    python benchmarks/bench_vault.py [--sizes 1000 10000 100000 1000000] [--out results.jsonl]
+                                     [--data-dir DIR] [--only unlock,search]
+
+For every size a synthetic vault is generated with vault_gen.py (kept in
+--data-dir so reruns skip generation) and these operations are measured:
+
+    unlock       read key, build the cipher, fetch and decrypt the first page
+    full_load    decrypt every row, like the old load_data()/_load_entries()
+    search       one keyset page per keystroke while typing a service name
+    insert       encrypt + INSERT + commit of a single entry
+    delete       DELETE + commit of a single entry
+    export       decrypt everything and write a CSV
+
+Every operation runs twice: once timed, once under tracemalloc for peak
+memory, so the tracing overhead doesn't end up in the wall time. delete
+only removes rows it inserted itself beforehand (untimed), and those and
+the insert rows are cleaned out afterwards, so the cached vaults keep
+their generated contents. Each result is one JSON object per line, so two
+runs can be diffed or loaded into pandas.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cryptography.fernet import Fernet
+
+from vault_gen import generate
+from vault_query import fetch_page, iter_pages
+
+OPS = ["unlock", "full_load", "search", "insert", "delete", "export"]
+
+
+def measure(fn, setup=lambda: None):
+    """Time fn(setup()), then trace peak memory over a second run; setup() is never measured."""
+    arg = setup()
+    t = time.perf_counter()
+    extra = fn(arg) or {}
+    seconds = time.perf_counter() - t
+    arg = setup()
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dict(seconds=seconds, peak_bytes=peak, **extra)
+
+
+# ----------------------------- OPERATIONS -----------------------------
+
+
+def op_unlock(db, key_path):
+    cipher = Fernet(Path(key_path).read_bytes())
+    conn = sqlite3.connect(db)
+    rows, _ = fetch_page(conn, "id", True)
+    for row in rows:
+        cipher.decrypt(row[3])
+    conn.close()
+
+
+def op_full_load(db, cipher):
+    conn = sqlite3.connect(db)
+    n = 0
+    for page in iter_pages(conn, page_size=1000):
+        for row in page:
+            cipher.decrypt(row[3])
+            n += 1
+    conn.close()
+    return {"items": n}
+
+
+def op_search(db, cipher):
+    conn = sqlite3.connect(db)
+    term = "github"
+    per_key = []
+    for i in range(1, len(term) + 1):
+        t = time.perf_counter()
+        rows, _ = fetch_page(conn, search=term[:i])
+        for row in rows:
+            cipher.decrypt(row[3])
+        per_key.append(time.perf_counter() - t)
+    conn.close()
+    return {"items": len(per_key), "max_keystroke_s": max(per_key)}
+
+
+def op_insert(db, cipher, n=200):
+    conn = sqlite3.connect(db)
+    for i in range(n):
+        conn.execute("INSERT INTO vault (service, username, password) VALUES (?, ?, ?)",
+                     (f"bench{i}.com", f"bench{i}", cipher.encrypt(b"bench-password")))
+        conn.commit()
+    conn.close()
+    return {"items": n}
+
+
+def bench_rows(db, cipher, n=200):
+    """Insert n throwaway rows in one transaction; returns their ids."""
+    conn = sqlite3.connect(db)
+    with conn:
+        ids = [conn.execute("INSERT INTO vault (service, username, password) VALUES (?, ?, ?)",
+                            (f"bench{i}.com", f"bench{i}", cipher.encrypt(b"bench-password"))).lastrowid
+               for i in range(n)]
+    conn.close()
+    return ids
+
+
+def op_delete(db, ids):
+    conn = sqlite3.connect(db)
+    for rid in ids:
+        conn.execute("DELETE FROM vault WHERE id = ?", (rid,))
+        conn.commit()
+    conn.close()
+    return {"items": len(ids)}
+
+
+def remove_bench_rows(db):
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("DELETE FROM vault WHERE username LIKE 'bench%' AND service LIKE 'bench%.com'")
+    conn.close()
+
+
+def op_export(db, cipher):
+    conn = sqlite3.connect(db)
+    with tempfile.NamedTemporaryFile("w", newline="", suffix=".csv", delete=False) as f:
+        out = f.name
+        writer = csv.writer(f)
+        writer.writerow(["service", "username", "password"])
+        for page in iter_pages(conn, page_size=1000):
+            for _, service, username, token in page:
+                writer.writerow([service, username, cipher.decrypt(token).decode()])
+    conn.close()
+    size = os.path.getsize(out)
+    os.unlink(out)
+    return {"bytes_written": size}
+
+
+# ----------------------------- DRIVER -----------------------------
+
+
+def run_size(rows, data_dir, only):
+    db = Path(data_dir) / f"vault_{rows}.db"
+    key_path = db.with_suffix(".key")
+    if not db.exists() or not key_path.exists() or not has_folders(db):
+        t = time.perf_counter()
+        generate(rows, db)
+        print(f"generated {rows} rows in {time.perf_counter() - t:.1f}s", file=sys.stderr)
+    cipher = Fernet(key_path.read_bytes())
+
+    jobs = {
+        "unlock": (lambda _: op_unlock(db, key_path),),
+        "full_load": (lambda _: op_full_load(db, cipher),),
+        "search": (lambda _: op_search(db, cipher),),
+        "insert": (lambda _: op_insert(db, cipher),),
+        "delete": (lambda ids: op_delete(db, ids), lambda: bench_rows(db, cipher)),
+        "export": (lambda _: op_export(db, cipher),),
+    }
+    remove_bench_rows(db)  # left over if an earlier run was interrupted
+    try:
+        for op in OPS:
+            if only and op not in only:
+                continue
+            result = {"bench": "vault", "op": op, "rows": rows}
+            result.update(measure(*jobs[op]))
+            yield result
+    finally:
+        remove_bench_rows(db)
+
+
+def has_folders(db):
+    """False for vaults cached before vault_gen created the app's folder tables."""
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'folders'").fetchone() is not None
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vault benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--data-dir", default=str(Path(tempfile.gettempdir()) / "vault_bench"))
+    parser.add_argument("--out", help="also append results to this JSONL file")
+    parser.add_argument("--only", default="", help="comma separated subset of: " + ",".join(OPS))
+    args = parser.parse_args(argv)
+
+    Path(args.data_dir).mkdir(parents=True, exist_ok=True)
+    only = {o for o in args.only.split(",") if o}
+    meta = {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    out = open(args.out, "a") if args.out else None
+    try:
+        for rows in args.sizes:
+            for result in run_size(rows, args.data_dir, only):
+                result.update(meta)
+                line = json.dumps(result)
+                print(line, flush=True)
+                if out:
+                    out.write(line + "\n")
+    finally:
+        if out:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
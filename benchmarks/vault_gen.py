@@ -0,0 +1,99 @@
+"""
+Synthetic vault.db generator for benchmarks.
+
+    python benchmarks/vault_gen.py 100000 /tmp/vault.db [--schema website]
+
+Builds a vault with the same table layout as passvault.py/project.py
+(`service` column) or password_vault.py (`website` column) and encrypts
+every password with Fernet, exactly as the apps do. The sort indexes and
+folder tables are created with the apps' own ensure_indexes() and
+ensure_folder_tables(), and most entries are filed in a folder per
+domain. The key is written next to the database as <name>.key.
+"""
+
+import argparse
+import random
+import sqlite3
+import string
+import sys
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vault_folders import ensure_folder_tables
+from vault_query import ensure_indexes
+
+DOMAINS = ["github", "gitlab", "google", "amazon", "netflix", "slack", "atlassian",
+           "microsoft", "dropbox", "spotify", "paypal", "reddit", "linkedin", "twitter"]
+TLDS = [".com", ".io", ".net", ".org", ".dev"]
+
+
+def fake_rows(n, seed=0):
+    rnd = random.Random(seed)
+    letters = string.ascii_lowercase
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    for i in range(n):
+        service = rnd.choice(DOMAINS) + "".join(rnd.choices(letters, k=3)) + rnd.choice(TLDS)
+        username = "".join(rnd.choices(letters, k=rnd.randint(5, 10))) + str(i)
+        password = "".join(rnd.choices(alphabet, k=rnd.randint(10, 24)))
+        yield service, username, password
+
+
+def generate(rows, db_path, schema="service", seed=0, batch=10_000):
+    """Create db_path with `rows` encrypted entries; returns the Fernet key."""
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+    key = Fernet.generate_key()
+    db_path.with_suffix(".key").write_bytes(key)
+    cipher = Fernet(key)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"""CREATE TABLE vault (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     {schema} TEXT NOT NULL,
+                     username TEXT NOT NULL,
+                     password BLOB NOT NULL
+                     )""")
+    sql = f"INSERT INTO vault ({schema}, username, password) VALUES (?, ?, ?)"
+    chunk = []
+    for service, username, password in fake_rows(rows, seed):
+        chunk.append((service, username, cipher.encrypt(password.encode())))
+        if len(chunk) >= batch:
+            conn.executemany(sql, chunk)
+            chunk.clear()
+    if chunk:
+        conn.executemany(sql, chunk)
+    ensure_folder_tables(conn)
+    file_in_folders(conn, schema, seed)
+    ensure_indexes(conn)
+    conn.commit()
+    conn.close()
+    return key
+
+
+def file_in_folders(conn, schema="service", seed=0, filed=0.8):
+    """Put about `filed` of the entries in a "Sites/<domain>" folder, the rest stay unfiled."""
+    rnd = random.Random(seed)
+    parent = conn.execute("INSERT INTO folders (parent_id, name) VALUES (NULL, 'Sites')").lastrowid
+    folders = {d: conn.execute("INSERT INTO folders (parent_id, name) VALUES (?, ?)",
+                               (parent, d)).lastrowid for d in DOMAINS}
+    links = []
+    for rid, name in conn.execute(f"SELECT id, {schema} FROM vault"):
+        if rnd.random() < filed:
+            domain = next(d for d in DOMAINS if name.startswith(d))
+            links.append((rid, folders[domain]))
+    conn.executemany("INSERT INTO vault_folder (entry_id, folder_id) VALUES (?, ?)", links)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic vault.db")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("db", help="output database path")
+    parser.add_argument("--schema", choices=["service", "website"], default="service")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate(args.rows, args.db, args.schema, args.seed)
+    print(f"wrote {args.rows} rows to {args.db}", file=sys.stderr)
@@ -0,0 +1,380 @@
+"""
+Async CIBIL score lookups with pooling, caching and request coalescing.
+
+Loan_Eligibilty.py asks for the CIBIL score with input(). In a batch run
+the score comes from a credit bureau, and the round trip dominates. The
+BureauClient here keeps that cost down:
+
+    - keep-alive HTTP/1.1 connections from a fixed-size pool
+    - at most `max_concurrency` requests in flight
+    - a TTL cache with LRU eviction, so repeat applicants cost nothing
+    - request coalescing: concurrent lookups of the same applicant share
+      one request instead of each sending their own
+
+Everything is standard library asyncio. MockBureau is a local stand-in
+for the bureau with configurable latency, for tests and benchmarks:
+
+    python cibil_client.py serve --port 8765 --latency 0.05
+    python cibil_client.py check applicants.csv --port 8765
+
+applicants.csv has applicant_id, age, income, existing_loan columns; the
+scores are looked up and loan_vector decides eligibility. An applicant
+whose lookup failed gets "Score unavailable" unless an earlier rule
+already rejects them.
+
+The bureau API is GET /score/<applicant_id>, answering
+{"applicant_id": ..., "score": 300-900} or 404 for unknown applicants.
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+
+_MISS = object()
+
+
+class BureauError(Exception):
+    """The bureau answered with an error or could not be reached."""
+
+
+def _retrieved(task):
+    # a lookup whose callers were all cancelled still finishes; don't warn about its error
+    if not task.cancelled():
+        task.exception()
+
+
+# ----------------------------- CACHE -----------------------------
+
+
+class TTLCache:
+    """Dict with a size bound (least recently used goes first) and per-entry expiry."""
+
+    def __init__(self, maxsize=100_000, ttl=3600.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.data = OrderedDict()
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        item = self.data.get(key, _MISS)
+        if item is _MISS:
+            return default
+        value, expires = item
+        if expires <= self.clock():
+            del self.data[key]
+            return default
+        self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.data[key] = (value, self.clock() + self.ttl)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+# ----------------------------- HTTP -----------------------------
+
+
+class ConnectionPool:
+    """Up to `size` keep-alive connections to one host, reused last-in first-out."""
+
+    def __init__(self, host, port, size=10, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.idle = []
+        self.opened = 0
+        self._slots = asyncio.Semaphore(size)
+
+    async def request(self, path):
+        """GET `path`; returns (status, body bytes). Retries once on a stale idle connection."""
+        async with self._slots:
+            for attempt in (0, 1):
+                reused = bool(self.idle)
+                if reused:
+                    reader, writer = self.idle.pop()
+                else:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.timeout)
+                    self.opened += 1
+                try:
+                    status, body, keep = await asyncio.wait_for(
+                        self._roundtrip(reader, writer, path), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue  # the server closed an idle connection; try a fresh one
+                    raise BureauError(f"bureau connection failed: {e}") from e
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep:
+                    self.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, body
+
+    async def _roundtrip(self, reader, writer, path):
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                     f"Connection: keep-alive\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        length, keep = 0, True
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection" and value.strip().lower() == "close":
+                keep = False
+        body = await reader.readexactly(length)
+        return status, body, keep
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
+
+
+# ----------------------------- CLIENT -----------------------------
+
+
+class BureauClient:
+    """Cached, coalescing CIBIL score lookups. Use from a single event loop."""
+
+    def __init__(self, host="127.0.0.1", port=8765, pool_size=10, max_concurrency=20,
+                 cache_size=100_000, ttl=3600.0, timeout=5.0):
+        self.pool = ConnectionPool(host, port, pool_size, timeout)
+        self.cache = TTLCache(cache_size, ttl)
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.inflight = {}
+        self.stats = {"hits": 0, "coalesced": 0, "requests": 0, "errors": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for task in list(self.inflight.values()):
+            task.cancel()
+        await asyncio.gather(*self.inflight.values(), return_exceptions=True)
+        await self.pool.close()
+
+    async def score(self, applicant_id):
+        score = self.cache.get(applicant_id, _MISS)
+        if score is not _MISS:
+            self.stats["hits"] += 1
+            return score
+        pending = self.inflight.get(applicant_id)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+        else:
+            # a task of its own, so cancelling whichever caller started it doesn't cancel the others
+            pending = self.inflight[applicant_id] = asyncio.create_task(self._lookup(applicant_id))
+            pending.add_done_callback(_retrieved)
+        return await asyncio.shield(pending)
+
+    async def _lookup(self, applicant_id):
+        try:
+            score = await self._fetch(applicant_id)
+        except Exception:
+            # failures are not cached; everyone waiting on this lookup gets the error
+            self.stats["errors"] += 1
+            raise
+        else:
+            self.cache.put(applicant_id, score)
+            return score
+        finally:
+            del self.inflight[applicant_id]
+
+    async def _fetch(self, applicant_id):
+        async with self.limit:
+            self.stats["requests"] += 1
+            status, body = await self.pool.request(f"/score/{quote(str(applicant_id), safe='')}")
+        if status == 404:
+            raise KeyError(applicant_id)
+        if status != 200:
+            raise BureauError(f"bureau answered {status} for {applicant_id}")
+        return int(json.loads(body)["score"])
+
+    async def scores(self, applicant_ids):
+        """Scores in input order; an applicant whose lookup failed gets None."""
+        results = await asyncio.gather(*(self.score(a) for a in applicant_ids), return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+
+# ----------------------------- MOCK BUREAU -----------------------------
+
+
+def mock_score(applicant_id):
+    """Stable pseudo-random score in 300..900 for an applicant id."""
+    digest = hashlib.blake2b(str(applicant_id).encode(), digest_size=4).digest()
+    return 300 + int.from_bytes(digest, "big") % 601
+
+
+class MockBureau:
+    """Local HTTP server answering GET /score/<id> after `latency` seconds.
+
+    Ids starting with "unknown" get 404. `requests` counts lookups served.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.requests = 0
+        self.server = None
+        self._handlers = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        # end idle keep-alive connections too, not just the listening socket
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                path = request.split(b" ", 2)[1].decode()
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                applicant_id = path.rsplit("/", 1)[-1]
+                if not path.startswith("/score/") or applicant_id.startswith("unknown"):
+                    status, body = "404 Not Found", b'{"error": "unknown applicant"}'
+                else:
+                    status = "200 OK"
+                    body = json.dumps({"applicant_id": applicant_id,
+                                       "score": mock_score(applicant_id)}).encode()
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+
+# ----------------------------- BATCH ELIGIBILITY -----------------------------
+
+
+SCORE_UNAVAILABLE = "Score unavailable"
+
+
+async def eligibility(client, rows):
+    """Decide (applicant_id, age, income, existing_loan) rows; returns a list of (applicant_id, score, decision).
+
+    Applicants whose score couldn't be looked up are still rejected by
+    the rules checked before CIBIL; otherwise their decision is
+    SCORE_UNAVAILABLE instead of a rejection for a score nobody saw. A
+    row whose fields don't parse gets score None and an "Invalid row"
+    decision, and isn't looked up.
+    """
+    import numpy as np
+
+    from Loan_Eligibilty import MIN_CIBIL
+    from loan_vector import ELIGIBLE, evaluate, reasons
+
+    results = [None] * len(rows)
+    good, parsed = [], []
+    for i, r in enumerate(rows):
+        try:
+            parsed.append((int(r[1]), float(r[2]), float(r[3])))
+        except (TypeError, ValueError) as e:
+            results[i] = (r[0], None, f"Invalid row: {e}")
+        else:
+            good.append(i)
+    if not good:
+        return results
+    ids = [rows[i][0] for i in good]
+    scores = await client.scores(ids)
+    missing = np.array([s is None for s in scores], dtype=bool)
+    age, income, existing_loan = (np.array(c) for c in zip(*parsed))
+    # MIN_CIBIL passes the CIBIL rule, so a missing score can only come out ELIGIBLE or rejected earlier
+    codes = evaluate(age, income, existing_loan, np.array([MIN_CIBIL if s is None else s for s in scores]))
+    decisions = reasons(codes)
+    decisions[missing & (codes == ELIGIBLE)] = SCORE_UNAVAILABLE
+    for i, applicant_id, score, decision in zip(good, ids, scores, decisions):
+        results[i] = (applicant_id, score, decision)
+    return results
+
+
+async def check_file(path, port, batch=5000):
+    async with BureauClient(port=port) as client:
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            writer = csv.writer(sys.stdout, lineterminator="\n")
+            writer.writerow(("applicant_id", "cibil", "decision"))
+            rows = []
+            for rec in reader:
+                rows.append((rec["applicant_id"], rec["age"], rec["income"], rec["existing_loan"]))
+                if len(rows) == batch:
+                    writer.writerows(await eligibility(client, rows))
+                    rows = []
+            if rows:
+                writer.writerows(await eligibility(client, rows))
+        print(json.dumps(client.stats), file=sys.stderr)
+
+
+async def serve(port, latency):
+    bureau = await MockBureau(port=port, latency=latency).start()
+    print(f"mock bureau on {bureau.host}:{bureau.port}, latency {latency}s", file=sys.stderr)
+    async with bureau.server:
+        await bureau.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CIBIL lookups against a bureau or the local mock")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("serve", help="run the mock bureau")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--latency", type=float, default=0.05, help="seconds per lookup")
+    p = sub.add_parser("check", help="look up scores for a CSV of applicants and decide eligibility")
+    p.add_argument("applicants")
+    p.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.port, args.latency))
+        else:
+            asyncio.run(check_file(args.applicants, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Chunked, column-wise CSV reading for the vectorized batch jobs.
+
+delivery_billing.py and payroll.py read large CSV files `size` rows at a
+time and hand each chunk to NumPy as columns. column_chunks() does the
+reading for both: blank rows are ignored, and rows that are too short or
+have a non-number in a numeric column are left out and noted in a
+Skipped, which keeps a count and the first few line numbers, so a file
+full of bad rows doesn't grow memory any more than a good one.
+"""
+
+import csv
+
+import numpy as np
+
+
+class Skipped:
+    """Count of rows left out, plus (line number, reason) for the first `keep` of them."""
+
+    def __init__(self, keep=20):
+        self.keep = keep
+        self.count = 0
+        self.first = []
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.first)
+
+    def add(self, line, reason):
+        self.count += 1
+        if len(self.first) < self.keep:
+            self.first.append((line, reason))
+
+    def report(self, out):
+        if self.count:
+            print(f"skipped {self.count} bad rows", file=out)
+            for line, reason in self.first:
+                print(f"  line {line}: {reason}", file=out)
+            if self.count > len(self.first):
+                print(f"  ... and {self.count - len(self.first)} more", file=out)
+
+
+def column_chunks(stream, size, required, optional=(), numeric=(), skipped=None):
+    """Yield {column: values} for up to `size` good rows of a CSV stream with a header.
+
+    Every name in `required` must be in the header; `optional` ones are
+    included when present. `numeric` columns come back as float64 arrays,
+    the rest as tuples of strings. Bad rows go to `skipped` when given.
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [h.strip() for h in header]
+    picks = {c: header.index(c) for c in required}
+    picks.update((c, header.index(c)) for c in optional if c in header)
+    width = max(picks.values()) + 1
+    numbers = [picks[c] for c in numeric]
+    while True:
+        rows, lines = [], []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                if skipped is not None:
+                    skipped.add(reader.line_num, f"{len(row)} fields, expected {width}")
+                continue
+            rows.append(row)
+            lines.append(reader.line_num)
+            if len(rows) == size:
+                break
+        if not rows:
+            return
+        try:
+            chunk = _columns(rows, picks, numeric)
+        except ValueError:  # rare, so only then look for the bad rows one by one
+            rows = _numeric(rows, lines, numbers, skipped)
+            if not rows:
+                continue
+            chunk = _columns(rows, picks, numeric)
+        yield chunk
+
+
+def _columns(rows, picks, numeric):
+    cols = list(zip(*rows))
+    out = {c: cols[i] for c, i in picks.items()}
+    for c in numeric:
+        out[c] = np.array(out[c], dtype=np.float64)
+    return out
+
+
+def _numeric(rows, lines, numbers, skipped):
+    """Drop the rows where a field at one of the `numbers` positions isn't a number."""
+    keep = []
+    for row, line in zip(rows, lines):
+        try:
+            for i in numbers:
+                float(row[i])
+        except ValueError as e:
+            if skipped is not None:
+                skipped.add(line, str(e))
+            continue
+        keep.append(row)
+    return keep
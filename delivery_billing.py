@@ -0,0 +1,216 @@
+"""
+Batch food-delivery billing from restaurant and customer coordinates.
+
+Online_Food_Delivery.py bills one order from a typed distance in km. Here
+the distance comes from coordinates: haversine_km() works on whole arrays,
+and bill() applies the script's rules to columns of orders. Distances are
+billed in whole km, rounded up, so the charges match food_bill() for the
+same km exactly.
+
+DistanceCache keys distances by the pair of geohash cells the restaurant
+and customer fall in (precision 7, cells of about 150 x 150 m), keeping
+the most recently used pairs. Each distinct pair in a batch is looked up
+once, and all misses are computed in one vectorized call between cell
+centres. Plain haversine is cheap enough that the lookups cost more than
+they save; the cache is there for a `distance` function that isn't,
+e.g. road distance from a routing service, where repeat restaurant/
+neighbourhood pairs are the common case.
+
+    python delivery_billing.py orders.csv [--out bills.csv] [--cache] [--chunk 100000]
+
+orders.csv has restaurant_lat, restaurant_lon, customer_lat, customer_lon,
+order_amount and user_type columns; an order_id column is copied through.
+"""
+
+import argparse
+import csv
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from csv_chunks import Skipped, column_chunks
+from Online_Food_Delivery import BASE_DELIVERY, FREE_DELIVERY_FROM, FREE_KM, MEMBER_DISCOUNT, PER_KM
+
+EARTH_RADIUS_KM = 6371.0088
+COLUMNS = ("restaurant_lat", "restaurant_lon", "customer_lat", "customer_lon", "order_amount", "user_type")
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between arrays of points in degrees."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+# ----------------------------- GEOHASH -----------------------------
+
+
+def _split_bits(precision):
+    bits = 5 * precision
+    return (bits + 1) // 2, bits // 2  # longitude gets the extra bit, as in geohash
+
+
+def geohash_cells(lat, lon, precision=7):
+    """Geohash of each point as an integer (the 5 * precision bits before base32 encoding)."""
+    lon_bits, lat_bits = _split_bits(precision)
+    x = np.floor((np.asarray(lon, dtype=np.float64) + 180) / 360 * (1 << lon_bits)).astype(np.int64)
+    y = np.floor((np.asarray(lat, dtype=np.float64) + 90) / 180 * (1 << lat_bits)).astype(np.int64)
+    np.clip(x, 0, (1 << lon_bits) - 1, out=x)
+    np.clip(y, 0, (1 << lat_bits) - 1, out=y)
+    cells = np.zeros(x.shape, dtype=np.int64)
+    for i in range(lon_bits):  # interleave from the top: lon, lat, lon, lat, ...
+        cells |= ((x >> (lon_bits - 1 - i)) & 1) << (5 * precision - 1 - 2 * i)
+        if i < lat_bits:
+            cells |= ((y >> (lat_bits - 1 - i)) & 1) << (5 * precision - 2 - 2 * i)
+    return cells
+
+
+def cell_centres(cells, precision=7):
+    """(lat, lon) of the centre of each geohash cell."""
+    lon_bits, lat_bits = _split_bits(precision)
+    cells = np.asarray(cells, dtype=np.int64)
+    x = np.zeros(cells.shape, dtype=np.int64)
+    y = np.zeros(cells.shape, dtype=np.int64)
+    for i in range(lon_bits):
+        x |= ((cells >> (5 * precision - 1 - 2 * i)) & 1) << (lon_bits - 1 - i)
+        if i < lat_bits:
+            y |= ((cells >> (5 * precision - 2 - 2 * i)) & 1) << (lat_bits - 1 - i)
+    lat = (y + 0.5) * (180 / (1 << lat_bits)) - 90
+    lon = (x + 0.5) * (360 / (1 << lon_bits)) - 180
+    return lat, lon
+
+
+class DistanceCache:
+    """Distances between geohash cells, least recently used pairs evicted first."""
+
+    def __init__(self, maxsize=1_000_000, precision=7, distance=haversine_km):
+        self.maxsize = maxsize
+        self.precision = precision
+        self.distance = distance
+        self.data = OrderedDict()
+        self.lookups = 0
+        self.computed = 0
+
+    @property
+    def hit_ratio(self):
+        return 1 - self.computed / self.lookups if self.lookups else 0.0
+
+    def distances(self, lat1, lon1, lat2, lon2):
+        a = geohash_cells(lat1, lon1, self.precision)
+        b = geohash_cells(lat2, lon2, self.precision)
+        # number the distinct pairs in this batch without packing two cells into one int64
+        ua, ia = np.unique(a, return_inverse=True)
+        ub, ib = np.unique(b, return_inverse=True)
+        pairs, inverse = np.unique(ia * len(ub) + ib, return_inverse=True)
+        pa, pb = ua[pairs // len(ub)].tolist(), ub[pairs % len(ub)].tolist()
+
+        data = self.data
+        values = np.empty(len(pairs))
+        missing = []
+        for i, key in enumerate(zip(pa, pb)):
+            d = data.get(key)
+            if d is None:
+                missing.append(i)
+            else:
+                data.move_to_end(key)
+                values[i] = d
+        if missing:
+            missing = np.array(missing)
+            lat_a, lon_a = cell_centres(ua[pairs[missing] // len(ub)], self.precision)
+            lat_b, lon_b = cell_centres(ub[pairs[missing] % len(ub)], self.precision)
+            values[missing] = self.distance(lat_a, lon_a, lat_b, lon_b)
+            for i, d in zip(missing.tolist(), values[missing].tolist()):
+                data[pa[i], pb[i]] = d
+            while len(data) > self.maxsize:
+                data.popitem(last=False)
+        self.lookups += len(a)
+        self.computed += len(missing)
+        return values[inverse]
+
+
+# ----------------------------- BILLING -----------------------------
+
+
+def member_discounts(user_types):
+    """Discount rate per order for an array of user type names."""
+    user_types = np.asarray(user_types)
+    discount = np.zeros(user_types.shape)
+    for name, rate in MEMBER_DISCOUNT.items():
+        discount[user_types == name] = rate
+    return discount
+
+
+def bill(distance_km, order_amount, user_type):
+    """food_bill() over arrays: dict of km, delivery, discount and final_bill columns."""
+    km = np.ceil(np.asarray(distance_km, dtype=np.float64))
+    amount = np.asarray(order_amount, dtype=np.float64)
+    delivery = BASE_DELIVERY + np.maximum(km - FREE_KM, 0) * PER_KM
+    delivery[amount >= FREE_DELIVERY_FROM] = 0
+    discount = member_discounts(user_type)
+    return {"km": km, "delivery": delivery, "discount": discount,
+            "final_bill": amount - amount * discount + delivery}
+
+
+def bill_orders(columns, cache=None):
+    """Bill a dict of COLUMNS arrays; distances go through `cache` when given."""
+    coords = [columns[c] for c in COLUMNS[:4]]
+    distance = cache.distances(*coords) if cache is not None else haversine_km(*coords)
+    return bill(distance, columns["order_amount"], columns["user_type"])
+
+
+def read_chunks(stream, size=100_000, skipped=None):
+    """Yield (order_ids, columns) for `size` CSV rows at a time.
+
+    Blank rows are ignored; short rows and rows with a coordinate or
+    amount that isn't a number are left out and noted in `skipped` (a
+    csv_chunks.Skipped) when given.
+    """
+    start = 0
+    for cols in column_chunks(stream, size, COLUMNS, ("order_id",), COLUMNS[:5], skipped):
+        columns = {c: cols[c] for c in COLUMNS[:5]}
+        columns["user_type"] = np.char.lower(np.array(cols["user_type"]))
+        n = len(columns["order_amount"])
+        ids = list(cols["order_id"]) if "order_id" in cols else range(start + 1, start + n + 1)
+        start += n
+        yield ids, columns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bill a CSV of food delivery orders")
+    parser.add_argument("orders", help="CSV with restaurant/customer coordinates, order_amount, user_type")
+    parser.add_argument("--out", help="write one bill per order to this CSV file")
+    parser.add_argument("--cache", action="store_true", help="cache distances by geohash cell pair")
+    parser.add_argument("--precision", type=int, default=7, help="geohash precision for --cache")
+    parser.add_argument("--chunk", type=int, default=100_000, help="orders per batch")
+    args = parser.parse_args(argv)
+
+    cache = DistanceCache(precision=args.precision) if args.cache else None
+    out = open(args.out, "w", newline="") if args.out else None
+    orders = total = 0
+    skipped = Skipped()
+    try:
+        writer = csv.writer(out, lineterminator="\n") if out else None
+        if writer:
+            writer.writerow(("order_id", "km", "delivery", "discount", "final_bill"))
+        with open(args.orders, newline="") as f:
+            for ids, columns in read_chunks(f, args.chunk, skipped):
+                b = bill_orders(columns, cache)
+                orders += len(ids)
+                total += float(b["final_bill"].sum())
+                if writer:
+                    writer.writerows(zip(ids, b["km"].astype(np.int64).tolist(), b["delivery"].tolist(),
+                                         b["discount"].tolist(), np.round(b["final_bill"], 2).tolist()))
+    finally:
+        if out:
+            out.close()
+    print(f"{orders} orders, total billed {total:.2f}")
+    skipped.report(sys.stderr)
+    if cache:
+        print(f"distance cache: {cache.lookups} lookups, {cache.computed} computed, "
+              f"hit ratio {cache.hit_ratio:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
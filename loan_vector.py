@@ -0,0 +1,97 @@
+"""
+Vectorized loan eligibility over columns of applicants.
+
+evaluate() applies the Loan_Eligibilty.py rules to NumPy arrays and
+returns one uint8 reason code per applicant, an index into REASONS:
+
+    0  Eligible for Loan
+    1  Rejected due to age criteria
+    2  Rejected due to low income
+    3  Rejected due to high existing loan
+    4  Rejected due to low CIBIL score
+
+As in the script's if/elif chain, the first failing rule wins: the masks
+are applied from the last rule to the first, so an earlier rule
+overwrites a later one. The work is done in blocks of BLOCK rows so the
+temporaries stay in cache, which is several times faster than whole-array
+masks on millions of rows. Comparisons are done in float64 on the same
+values the script would see, so codes match loan_eligibility() exactly.
+
+    python loan_vector.py applicants.csv [--out decisions.csv]
+
+reads columns age, income, existing_loan, cibil and prints a count per reason.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from Loan_Eligibilty import MAX_AGE, MAX_LOAN_RATIO, MIN_AGE, MIN_CIBIL, MIN_INCOME, REASONS
+
+ELIGIBLE, AGE, INCOME, EXISTING_LOAN, CIBIL = range(5)
+BLOCK = 1 << 16
+COLUMNS = ("age", "income", "existing_loan", "cibil")
+
+
+def evaluate(age, income, existing_loan, cibil, block=BLOCK):
+    """Reason code per applicant for equal-length 1-d arrays."""
+    age = np.asarray(age)
+    income = np.asarray(income, dtype=np.float64)
+    existing_loan = np.asarray(existing_loan, dtype=np.float64)
+    cibil = np.asarray(cibil)
+    n = len(age)
+    if not (len(income) == len(existing_loan) == len(cibil) == n):
+        raise ValueError("applicant columns must have the same length")
+
+    codes = np.empty(n, dtype=np.uint8)
+    for start in range(0, n, block):
+        end = start + block
+        a, inc, loan, score = age[start:end], income[start:end], existing_loan[start:end], cibil[start:end]
+        out = codes[start:end]
+        out.fill(ELIGIBLE)
+        np.putmask(out, score < MIN_CIBIL, CIBIL)
+        np.putmask(out, loan > MAX_LOAN_RATIO * inc, EXISTING_LOAN)
+        np.putmask(out, inc < MIN_INCOME, INCOME)
+        np.putmask(out, (a < MIN_AGE) | (a > MAX_AGE), AGE)
+    return codes
+
+
+def reasons(codes):
+    """Decision strings for reason codes, as the script prints them."""
+    return np.asarray(REASONS, dtype=object)[codes]
+
+
+def summary(codes):
+    counts = np.bincount(codes, minlength=len(REASONS))
+    return {REASONS[i]: int(c) for i, c in enumerate(counts)}
+
+
+def load_csv(path):
+    """Columns age, income, existing_loan, cibil from a CSV file with a header."""
+    with open(path, newline="") as f:
+        header = [h.strip() for h in f.readline().split(",")]
+        cols = [header.index(c) for c in COLUMNS]
+        data = np.loadtxt(f, delimiter=",", usecols=cols, ndmin=2)
+    return data[:, 0], data[:, 1], data[:, 2], data[:, 3]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Loan eligibility for a CSV of applicants")
+    parser.add_argument("applicants", help="CSV with age, income, existing_loan, cibil columns")
+    parser.add_argument("--out", help="write one decision per applicant to this file")
+    args = parser.parse_args(argv)
+
+    codes = evaluate(*load_csv(args.applicants))
+    for reason, count in summary(codes).items():
+        print(f"{count:>10}  {reason}")
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write("decision\n")
+            for start in range(0, len(codes), BLOCK):
+                f.write("\n".join(reasons(codes[start:start + BLOCK])) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
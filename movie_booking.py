@@ -0,0 +1,241 @@
+"""
+Seat booking for movie shows, safe to use from many threads.
+
+Movie_ticket.py prices one ticket. A Show here also keeps the seat map:
+two bitsets (booked and held), one bit per seat, with every row starting
+on a byte boundary so a row can be read as one integer. Holding,
+releasing, confirming and cancelling a seat are each a byte read and
+write.
+
+A booking goes through two steps:
+
+    hold_id = show.hold(["C5", "C6"])     # or show.hold_together(2)
+    booking = show.confirm(hold_id, ages=[34, 9])
+
+A hold expires after `hold_seconds` unless it is confirmed or released
+first. Expired holds are swept lazily from a heap on the next call, so
+nothing runs in the background. Confirm prices every seat with
+ticket_price() for the show's movie type and day. Every call takes the
+show's lock, so two users can't end up with the same seat. A call that
+can't go through raises BookingError and leaves the map unchanged.
+
+Seats are named row letter + seat number ("A1" is the first seat of the
+front row); rows past Z continue as AA, AB, ...
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from Movie_ticket import ticket_price
+
+
+class BookingError(Exception):
+    """Seats taken, hold expired or unknown booking."""
+
+
+def row_name(row):
+    name = ""
+    row += 1
+    while row:
+        row, r = divmod(row - 1, 26)
+        name = chr(65 + r) + name
+    return name
+
+
+def parse_seat(label):
+    """(row, col), both from 0, for a label like "C12"."""
+    letters = label.rstrip("0123456789")
+    if not letters or not letters.isalpha() or len(letters) == len(label):
+        raise BookingError(f"bad seat {label!r}")
+    row = 0
+    for ch in letters.upper():
+        row = row * 26 + ord(ch) - 64
+    return row - 1, int(label[len(letters):]) - 1
+
+
+def seat_label(row, col):
+    return f"{row_name(row)}{col + 1}"
+
+
+class Show:
+    def __init__(self, show_id, rows, seats, movie_type="2d", day="weekday",
+                 hold_seconds=300.0, clock=time.monotonic):
+        self.show_id = show_id
+        self.rows = rows
+        self.seats = seats
+        self.movie_type = movie_type.lower()
+        self.day = day.lower()
+        self.hold_seconds = hold_seconds
+        self.clock = clock
+        self.stride = (seats + 7) // 8  # bytes per row
+        self.booked = bytearray(rows * self.stride)
+        self.held = bytearray(rows * self.stride)
+        self.holds = {}  # hold_id -> (seats, expires, user)
+        self.expiry = []  # (expires, hold_id); released holds are skipped when popped
+        self.bookings = {}  # booking_id -> (seat bits, booking dict)
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return self.rows * self.seats
+
+    # ----- bit helpers, called with the lock held -----
+
+    def _bit(self, seat):
+        row, col = parse_seat(seat) if isinstance(seat, str) else seat
+        if not (0 <= row < self.rows and 0 <= col < self.seats):
+            raise BookingError(f"no seat {seat_label(row, col)} in show {self.show_id}")
+        return row * self.stride + (col >> 3), 1 << (col & 7)
+
+    def _expire(self, now):
+        expiry = self.expiry
+        while expiry and expiry[0][0] <= now:
+            _, hold_id = heapq.heappop(expiry)
+            hold = self.holds.pop(hold_id, None)
+            if hold is not None:
+                self._clear(self.held, hold[0])
+
+    @staticmethod
+    def _clear(bits, seats):
+        for i, mask in seats:
+            bits[i] &= ~mask
+
+    def _row(self, row):
+        start, end = row * self.stride, (row + 1) * self.stride
+        booked = int.from_bytes(self.booked[start:end], "little")
+        return booked | int.from_bytes(self.held[start:end], "little")
+
+    def _new_hold(self, bits, user, now):
+        for i, mask in bits:
+            self.held[i] |= mask
+        hold_id = next(self._ids)
+        expires = now + self.hold_seconds
+        self.holds[hold_id] = (bits, expires, user)
+        heapq.heappush(self.expiry, (expires, hold_id))
+        return hold_id
+
+    def _labels(self, bits):
+        out = []
+        for i, mask in bits:
+            row, byte = divmod(i, self.stride)
+            out.append(seat_label(row, byte * 8 + mask.bit_length() - 1))
+        return out
+
+    # ----- public API -----
+
+    def hold(self, seats, user=None):
+        """Hold the given seats (labels or (row, col) pairs), all or none; returns a hold id."""
+        with self.lock:
+            now = self.clock()
+            self._expire(now)
+            bits = [self._bit(s) for s in seats]
+            if not bits or len(set(bits)) != len(bits):
+                raise BookingError("hold needs distinct seats")
+            taken = [b for b in bits if (self.booked[b[0]] | self.held[b[0]]) & b[1]]
+            if taken:
+                raise BookingError(f"seats not available: {', '.join(self._labels(taken))}")
+            return self._new_hold(bits, user, now)
+
+    def hold_together(self, n, user=None):
+        """Hold the first n adjacent free seats, front row first; returns (hold_id, seat labels)."""
+        if not 0 < n <= self.seats:
+            raise BookingError(f"can't seat {n} together in rows of {self.seats}")
+        full = (1 << self.seats) - 1
+        with self.lock:
+            now = self.clock()
+            self._expire(now)
+            for row in range(self.rows):
+                runs = ~self._row(row) & full
+                for _ in range(n - 1):  # bit c stays set only if seats c .. c+n-1 are all free
+                    runs &= runs >> 1
+                if runs:
+                    col = (runs & -runs).bit_length() - 1
+                    bits = [self._bit((row, c)) for c in range(col, col + n)]
+                    return self._new_hold(bits, user, now), self._labels(bits)
+        raise BookingError(f"no {n} seats together left in show {self.show_id}")
+
+    def release(self, hold_id):
+        """Give held seats back; False if the hold was already gone."""
+        with self.lock:
+            hold = self.holds.pop(hold_id, None)
+            if hold is None:
+                return False
+            self._clear(self.held, hold[0])
+            return True
+
+    def confirm(self, hold_id, ages):
+        """Book a hold, one age per seat; returns the booking with a ticket_price() per seat."""
+        with self.lock:
+            self._expire(self.clock())
+            hold = self.holds.get(hold_id)
+            if hold is None:
+                raise BookingError(f"hold {hold_id} expired or was released")
+            bits, _, user = hold
+            if len(ages) != len(bits):
+                raise BookingError(f"hold {hold_id} is for {len(bits)} seats, got {len(ages)} ages")
+            # price first: a bad age must fail before any seat changes state
+            try:
+                prices = [ticket_price(age, self.movie_type, self.day)["price"] for age in ages]
+            except (TypeError, ValueError) as e:
+                raise BookingError(f"can't price hold {hold_id}: {e}") from e
+            del self.holds[hold_id]
+            for i, mask in bits:
+                self.held[i] &= ~mask
+                self.booked[i] |= mask
+            booking = {"booking_id": hold_id, "show_id": self.show_id, "user": user,
+                       "seats": self._labels(bits), "prices": prices, "total": sum(prices)}
+            self.bookings[hold_id] = (bits, booking)
+            return booking
+
+    def cancel(self, booking_id):
+        """Cancel a confirmed booking and free its seats."""
+        with self.lock:
+            entry = self.bookings.pop(booking_id, None)
+            if entry is None:
+                raise BookingError(f"no booking {booking_id} for show {self.show_id}")
+            self._clear(self.booked, entry[0])
+            return entry[1]
+
+    def available(self):
+        """Seats neither booked nor held."""
+        with self.lock:
+            self._expire(self.clock())
+            taken = sum(self._row(r).bit_count() for r in range(self.rows))
+            return len(self) - taken
+
+    def seat_map(self):
+        """One line per row: '.' free, 'H' held, 'X' booked."""
+        with self.lock:
+            self._expire(self.clock())
+            lines = []
+            for row in range(self.rows):
+                base = row * self.stride
+                marks = []
+                for col in range(self.seats):
+                    i, mask = base + (col >> 3), 1 << (col & 7)
+                    marks.append("X" if self.booked[i] & mask else "H" if self.held[i] & mask else ".")
+                lines.append(f"{row_name(row):>2} {''.join(marks)}")
+            return "\n".join(lines)
+
+
+class BoxOffice:
+    """Shows by id. Each show has its own lock, so shows don't contend."""
+
+    def __init__(self):
+        self.shows = {}
+        self.lock = threading.Lock()
+
+    def add_show(self, show_id, rows, seats, movie_type="2d", day="weekday", **kwargs):
+        with self.lock:
+            if show_id in self.shows:
+                raise BookingError(f"show {show_id} already exists")
+            show = self.shows[show_id] = Show(show_id, rows, seats, movie_type, day, **kwargs)
+            return show
+
+    def show(self, show_id):
+        try:
+            return self.shows[show_id]
+        except KeyError:
+            raise BookingError(f"no show {show_id}") from None
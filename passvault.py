@@ -25,6 +25,16 @@ import sys
 import traceback
 from cryptography.fernet import Fernet
 from PIL import Image, ImageTk
+from vault_crypto import VaultCipher, start_background_migration
+from vault_metrics import StartupClock, timed, timer
+from vault_timers import TimerWheel, IdleLock, ExpiringCache, clear_clipboard_later
+from vault_query import AsyncPageLoader, ensure_indexes
+from vault_search import BackgroundIndex
+from vault_autocomplete import Autocomplete, service_index, username_index
+from vault_maintenance import MaintenanceScheduler
+from vault_integrity import ensure_integrity_tables, seal_rows, forget_rows, verify_in_background, describe
+from vault_attachments import AttachmentsWindow, ensure_attachment_tables
+from vault_folders import FolderTree, ensure_folder_tables, folder_for_path, all_folder_paths, move_entry
 
 # ----------------------------- FILE PATHS -----------------------------
 HOME_PATH = Path.home() / "password_vault"
@@ -42,17 +52,23 @@ def load_or_create_key():
         KEY_PATH.write_bytes(key)
         return key
 
+# new rows use the compact AEAD format; old Fernet rows are still readable
+STORAGE_FORMAT = "aesgcm"
+
 FERNET_KEY = load_or_create_key()
-CIPHER = Fernet(FERNET_KEY)
+CIPHER = VaultCipher(FERNET_KEY, STORAGE_FORMAT)
 
+@timed("encrypt", "crypto")
 def encrypt(text: str) -> bytes:
     return CIPHER.encrypt(text.encode())
 
+@timed("decrypt", "crypto")
 def decrypt(token: bytes) -> str:
     return CIPHER.decrypt(token).decode()
 
 # ----------------------------- DATABASE SETUP -----------------------------
 
+@timed("init_db", "db")
 def init_db():
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
@@ -64,6 +80,10 @@ def init_db():
             password BLOB NOT NULL
         )
     """)
+    ensure_indexes(conn)
+    ensure_folder_tables(conn)
+    ensure_integrity_tables(conn)
+    ensure_attachment_tables(conn)
     conn.commit()
     conn.close()
 
@@ -84,6 +104,14 @@ PALETTE = {
 FONT = ("Segoe UI", 11)
 HEADER_FONT = ("Segoe UI Semibold", 14)
 
+# ----------------------------- HOUSEKEEPING -----------------------------
+
+CLIPBOARD_CLEAR_SECONDS = 30   # wipe copied passwords after this long
+IDLE_LOCK_SECONDS = 300        # forget decrypted values after this much idle time
+CACHE_TTL_SECONDS = 120        # how long a decrypted row stays cached
+
+SORT_KEYS = {"Service": "service", "Username": "username"}
+
 # ----------------------------- UTILITIES -----------------------------
 
 def generate_password(length=16, use_symbols=True):
@@ -111,8 +139,10 @@ def password_strength(pw: str) -> (int, str):
 # ----------------------------- APP CLASS -----------------------------
 
 class HighTechVault(tk.Tk):
-    def __init__(self):
+    def __init__(self, clock=None):
         super().__init__()
+        self.clock = clock or StartupClock()
+        self.clock.watch(self)
         self.title("Password Vault — HighTech UI")
         self.geometry("980x600")
         self.minsize(900, 540)
@@ -120,9 +150,27 @@ class HighTechVault(tk.Tk):
 
         self.dark_mode = False
 
+        # one after() tick drives clipboard clearing, idle lock and cache expiry
+        self.timers = TimerWheel(self)
+        self.plain_cache = ExpiringCache(self.timers, CACHE_TTL_SECONDS)
+        # newest first, one page at a time, fetched and decrypted off the UI thread
+        self.pages = AsyncPageLoader(self, DB_PATH, self._insert_plain, decode=self._decode_row,
+                                     sort='id', descending=True, on_progress=self._on_load_progress)
+
+        # fuzzy search index over service/username, built off the UI thread
+        self.search_index = BackgroundIndex(DB_PATH)
+        # autocomplete sources, read from the db on first keystroke
+        self.service_suggest = service_index(DB_PATH)
+        self.username_suggest = username_index(DB_PATH)
+
         self._setup_styles()
         self._build_ui()
         self._load_entries()
+        self.idle_lock = IdleLock(self.timers, self, IDLE_LOCK_SECONDS, self._lock)
+        # rehash only the buckets that changed since the last run
+        verify_in_background(self, DB_PATH, CIPHER, self._on_integrity_report)
+        # vacuum/optimize/checkpoint in small steps while the user is idle
+        self.maintenance = MaintenanceScheduler(self, self.timers, DB_PATH)
 
     # ----------------------------- STYLES -----------------------------
     def _setup_styles(self):
@@ -155,7 +203,7 @@ class HighTechVault(tk.Tk):
         self.theme_btn.pack(side='right')
 
         # main content area - left card (form) and right card (list)
-        left_card = self._card_frame(self.canvas, width=360, height=420)
+        left_card = self._card_frame(self.canvas, width=360, height=480)
         self.left_window = self.canvas.create_window(30, 70, anchor='nw', window=left_card)
 
         right_card = self._card_frame(self.canvas, width=560, height=480)
@@ -172,6 +220,13 @@ class HighTechVault(tk.Tk):
         tk.Label(left_card, text='Username', bg=left_card['bg'], font=FONT).pack(anchor='w', padx=20)
         self.username_entry = ttk.Entry(left_card)
         self.username_entry.pack(fill='x', padx=20, pady=6)
+        Autocomplete(self.service_entry, self.service_suggest)
+        Autocomplete(self.username_entry, self.username_suggest)
+
+        # folder path like "Team/Infra"; missing folders are created on save
+        tk.Label(left_card, text='Folder', bg=left_card['bg'], font=FONT).pack(anchor='w', padx=20)
+        self.folder_entry = ttk.Combobox(left_card, postcommand=self._refresh_folder_choices)
+        self.folder_entry.pack(fill='x', padx=20, pady=6)
 
         tk.Label(left_card, text='Password', bg=left_card['bg'], font=FONT).pack(anchor='w', padx=20)
         pw_frame = tk.Frame(left_card, bg=left_card['bg'])
@@ -200,21 +255,39 @@ class HighTechVault(tk.Tk):
         search_entry.pack(side='left', fill='x', expand=True)
         self.search_var.trace_add('write', lambda *a: self._load_entries())
         ttk.Button(search_frame, text='Clear', command=self._clear_search).pack(side='right', padx=6)
+        self.group_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text='Folders', variable=self.group_var,
+                        command=self._load_entries).pack(side='right')
+
+        # loading state, shown while a page is on its way
+        status_frame = tk.Frame(right_card, bg=right_card['bg'])
+        status_frame.pack(fill='x', padx=12, pady=(0, 6))
+        self.load_label = tk.Label(status_frame, text='Loading…', bg=right_card['bg'], font=FONT)
+        self.load_label.pack(side='left')
+        self.load_bar = ttk.Progressbar(status_frame, length=160)
 
         # treeview
         cols = ("Service", "Username", "Password")
-        self.tree = ttk.Treeview(right_card, columns=cols, show='headings', selectmode='browse')
+        self.tree = ttk.Treeview(right_card, columns=cols, show='tree headings', selectmode='browse')
+        self.tree.heading('#0', text='Folder')
+        self.tree.column('#0', width=120)
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, width=150, anchor='center')
+        # sorting is done by SQLite over the NOCASE indexes, not in Python
+        for c in SORT_KEYS:
+            self.tree.heading(c, command=lambda c=c: self._sort_by(c))
+        self.tree.configure(yscrollcommand=self.pages.on_scroll)
         self.tree.pack(fill='both', expand=True, padx=12, pady=(0, 12))
         self.tree.bind('<Double-1>', self._on_row_double)
+        self.folders = FolderTree(self.tree, DB_PATH, self._insert_plain, decode=self._decode_row)
 
         # row actions
         action_frame = tk.Frame(right_card, bg=right_card['bg'])
         action_frame.pack(fill='x', padx=12, pady=(0, 12))
         ttk.Button(action_frame, text='Copy Password', command=self._copy_selected_pw).pack(side='left')
         ttk.Button(action_frame, text='Delete', command=self._delete_selected).pack(side='left', padx=6)
+        ttk.Button(action_frame, text='Attachments', command=self._open_attachments).pack(side='left')
 
     # ----------------------------- SMALL HELPERS -----------------------------
     def _card_frame(self, parent, width=300, height=300):
@@ -278,6 +351,17 @@ class HighTechVault(tk.Tk):
     def _clear_search(self):
         self.search_var.set('')
 
+    def _refresh_folder_choices(self):
+        conn = sqlite3.connect(DB_PATH)
+        self.folder_entry['values'] = all_folder_paths(conn)
+        conn.close()
+
+    def _sort_by(self, col):
+        self.pages.toggle_sort(SORT_KEYS[col])
+        for c, key in SORT_KEYS.items():
+            self.tree.heading(c, text=self.pages.heading(c, key))
+        self._load_entries()
+
     # ----------------------------- DATABASE ACTIONS -----------------------------
     def _save_entry(self):
         s = self.service_entry.get().strip()
@@ -287,11 +371,17 @@ class HighTechVault(tk.Tk):
             messagebox.showerror('Error', 'All fields are required.')
             return
         enc = encrypt(p)
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('INSERT INTO vault (service, username, password) VALUES (?, ?, ?)', (s, u, enc))
-        conn.commit()
-        conn.close()
+        with timer("save", "db"):
+            conn = sqlite3.connect(DB_PATH)
+            c = conn.cursor()
+            c.execute('INSERT INTO vault (service, username, password) VALUES (?, ?, ?)', (s, u, enc))
+            move_entry(conn, c.lastrowid, folder_for_path(conn, self.folder_entry.get()))
+            seal_rows(conn, CIPHER, [c.lastrowid])
+            conn.commit()
+            conn.close()
+        self.search_index.add(c.lastrowid, s, u)
+        self.service_suggest.add(s)
+        self.username_suggest.add(u)
         self._load_entries()
         self.service_entry.delete(0, tk.END)
         self.username_entry.delete(0, tk.END)
@@ -300,21 +390,50 @@ class HighTechVault(tk.Tk):
     def _load_entries(self):
         self.tree.delete(*self.tree.get_children())
         q = self.search_var.get().strip().lower()
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT id, service, username, password FROM vault ORDER BY id DESC')
-        rows = c.fetchall()
-        conn.close()
-        for rid, s, u, p in rows:
-            if q and q not in s.lower() and q not in u.lower():
-                continue
+        if self.group_var.get() and not q:
+            # folder view: only top-level folders now, children on expand
+            self.pages.stop()
+            self.folders.load_roots()
+            return
+        ids = self.search_index.search(q) if q else None
+        # ranked fuzzy matches once the index is built, LIKE paging until then;
+        # further pages are pulled in by self.pages.on_scroll
+        self.pages.reset(q, ids)
+
+    def _decode_row(self, row):
+        # runs on the page loader's worker thread as well as the UI thread
+        rid, s, u, p = row
+        d = self.plain_cache.get(rid)
+        if d is None:
             try:
                 d = decrypt(p)
             except Exception:
                 d = 'Invalid'
+        return rid, s, u, d
+
+    def _insert_plain(self, rows, parent=''):
+        for rid, s, u, d in rows:
+            if self.plain_cache.get(rid) is None:
+                self.plain_cache.put(rid, d)
             # show masked password
             masked = '•' * min(12, len(d)) + (d[-2:] if len(d) > 2 else '')
-            self.tree.insert('', 'end', iid=str(rid), values=(s, u, masked))
+            self.tree.insert(parent, 'end', iid=str(rid), values=(s, u, masked))
+
+    def _on_load_progress(self, shown, total, busy):
+        if busy:
+            if total:
+                self.load_bar.stop()
+                self.load_bar.configure(mode='determinate', maximum=total, value=shown)
+            elif not self.load_bar.winfo_ismapped():
+                self.load_bar.configure(mode='indeterminate')
+                self.load_bar.start(15)
+            self.load_bar.pack(side='right')
+            self.load_label.configure(text=f'Loading… {shown} of {total}' if total else 'Loading…')
+            return
+        self.load_bar.stop()
+        self.load_bar.pack_forget()
+        self.load_label.configure(text=f'{shown} of {total} entries' if total else '')
+        self.clock.interactive()
 
     def _on_row_double(self, event):
         item = self.tree.selection()
@@ -360,7 +479,8 @@ class HighTechVault(tk.Tk):
         try:
             self.clipboard_clear()
             self.clipboard_append(text)
-            messagebox.showinfo('Copied', 'Password copied to clipboard.')
+            clear_clipboard_later(self.timers, self, text, CLIPBOARD_CLEAR_SECONDS)
+            messagebox.showinfo('Copied', f'Password copied to clipboard. It will be cleared in {CLIPBOARD_CLEAR_SECONDS}s.')
         except Exception:
             messagebox.showerror('Error', 'Could not copy to clipboard.')
 
@@ -384,27 +504,60 @@ class HighTechVault(tk.Tk):
             return
         self._clipboard_copy(pw)
 
+    def _open_attachments(self):
+        sel = self.tree.selection()
+        if not sel or FolderTree.is_folder(sel[0]):
+            messagebox.showwarning('Select', 'Select an entry first.')
+            return
+        service = self.tree.set(sel[0], 'Service')
+        AttachmentsWindow(self, DB_PATH, CIPHER, int(sel[0]), service)
+
     def _delete_selected(self):
         sel = self.tree.selection()
         if not sel:
             messagebox.showwarning('Select', 'Select a row first.')
             return
         iid = sel[0]
+        if FolderTree.is_folder(iid):
+            messagebox.showwarning('Select', 'Select an entry, not a folder.')
+            return
         if not messagebox.askyesno('Confirm', 'Delete this entry?'):
             return
         conn = sqlite3.connect(DB_PATH)
         c = conn.cursor()
         c.execute('DELETE FROM vault WHERE id=?', (iid,))
+        forget_rows(conn, [int(iid)])
         conn.commit()
         conn.close()
+        self.plain_cache.pop(int(iid))
+        self.search_index.remove(int(iid))
         self._load_entries()
 
+    def _on_integrity_report(self, report, error=None):
+        if error:
+            messagebox.showerror('Integrity', f'The integrity check could not run: {error}')
+            return
+        msg = describe(report)
+        if msg:
+            messagebox.showwarning('Integrity', msg)
+
+    def _lock(self):
+        # idle for too long: drop decrypted values and close any open detail windows
+        self.plain_cache.clear()
+        self.password_entry.delete(0, tk.END)
+        for w in self.winfo_children():
+            if isinstance(w, tk.Toplevel):
+                w.destroy()
+        self.idle_lock.arm()
+
 # ----------------------------- RUN APP -----------------------------
 
 if __name__ == '__main__':
     try:
+        clock = StartupClock()
         init_db()
-        app = HighTechVault()
+        start_background_migration(DB_PATH, CIPHER)
+        app = HighTechVault(clock)
         app.mainloop()
     except Exception:
         traceback.print_exc()
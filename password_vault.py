@@ -14,6 +14,26 @@ import string
 
 import hashlib
 
+from vault_timers import TimerWheel, IdleLock, clear_clipboard_later
+
+from vault_query import AsyncPageLoader, ensure_indexes
+
+from vault_metrics import StartupClock, timed, timer
+
+from vault_crypto import VaultCipher, start_background_migration
+
+from vault_search import BackgroundIndex
+
+from vault_autocomplete import Autocomplete, service_index, username_index
+
+from vault_maintenance import MaintenanceScheduler
+
+from vault_attachments import AttachmentsWindow, ensure_attachment_tables
+
+from vault_history import ensure_history_table, format_time, load_history, record_change
+
+from vault_integrity import ensure_integrity_tables, seal_rows, forget_rows, verify_in_background, describe
+
 
 
 HOME_PATH = Path.home() / "password_vault"
@@ -48,11 +68,19 @@ def load_key():
 
 
 
-fernet = Fernet(load_key())
+# compact AEAD rows for new writes; existing Fernet tokens still decrypt
+
+fernet = VaultCipher(load_key(), "aesgcm")
+
+
+CLIPBOARD_CLEAR_SECONDS = 30
 
+IDLE_LOCK_SECONDS = 300
 
 
 
+
+@timed("init_db", "db")
 def init_db():
 
     conn = sqlite3.connect(DB_PATH)
@@ -79,6 +107,14 @@ def init_db():
 
                 )""")
 
+    ensure_indexes(conn)
+
+    ensure_integrity_tables(conn)
+
+    ensure_attachment_tables(conn)
+
+    ensure_history_table(conn)
+
     conn.commit()
 
     conn.close()
@@ -89,6 +125,8 @@ def init_db():
 
 init_db()
 
+start_background_migration(DB_PATH, fernet)
+
 
 
 
@@ -129,6 +167,13 @@ class PasswordVault:
 
         self.window.resizable(True, True)
 
+        self.timers = TimerWheel(self.window)
+
+        self.idle_lock = IdleLock(self.timers, self.window, IDLE_LOCK_SECONDS,
+                                  self.master_password_screen, armed=False)
+
+        self.maintenance = MaintenanceScheduler(self.window, self.timers, DB_PATH)
+
         
 
         if get_master_password_hash() is None:
@@ -143,6 +188,8 @@ class PasswordVault:
 
     def master_password_screen(self):
 
+        self.idle_lock.disarm()
+
         self.clear_window()
 
 
@@ -183,8 +230,23 @@ class PasswordVault:
 
         if stored_hash and hash_password(entered_password) == stored_hash:
 
+            # time from unlock to the vault screen painting and its first page showing
+            self.clock = StartupClock()
+
+            self.search_index = BackgroundIndex(DB_PATH)
+
+            self.website_suggest = service_index(DB_PATH)
+
+            self.username_suggest = username_index(DB_PATH)
+
             self.vault_screen()
 
+            self.clock.watch(self.window)
+
+            self.idle_lock.arm()
+
+            verify_in_background(self.window, DB_PATH, fernet, self.show_integrity_report)
+
         else:
 
             messagebox.showerror("Error", "Incorrect Master Password!")
@@ -240,6 +302,18 @@ class PasswordVault:
 
         self.search_entry.bind("<KeyRelease>", self.filter_data)
 
+
+
+        status_frame = tk.Frame(self.window)
+
+        status_frame.pack(fill=tk.X, padx=10)
+
+        self.load_label = tk.Label(status_frame, text="Loading...", font=("Arial", 9))
+
+        self.load_label.pack(side=tk.LEFT, padx=5)
+
+        self.load_bar = ttk.Progressbar(status_frame, length=150)
+
         
 
         tree_frame = tk.Frame(self.window)
@@ -258,6 +332,10 @@ class PasswordVault:
 
         self.tree.heading("password", text="Password")
 
+        self.tree.heading("website", command=lambda: self.sort_by("website"))
+
+        self.tree.heading("username", command=lambda: self.sort_by("username"))
+
         self.tree.column("website", width=200)
 
         self.tree.column("username", width=200)
@@ -268,17 +346,23 @@ class PasswordVault:
 
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
 
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # pages are fetched and decrypted on a worker thread and shown in batches
+        self.pages = AsyncPageLoader(self.window, DB_PATH, self.insert_plain,
+                                     decode=self.decode_row, on_progress=self.show_load_progress)
 
-        
+        self.failed = []
 
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            self.pages.on_scroll(first, last)
 
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=on_scroll)
 
         
 
-        self.load_data()
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
 
 
@@ -305,11 +389,20 @@ class PasswordVault:
 
                   font=("Arial", 10), width=12).pack(side=tk.LEFT, padx=5)
 
+        tk.Button(button_frame, text="Attachments", command=self.open_attachments,
+
+                  font=("Arial", 10), width=12).pack(side=tk.LEFT, padx=5)
+
 
         self.tree.bind("<Double-1>", self.copy_password)
 
 
 
+        # the screen is complete before any rows are read
+        self.load_data()
+
+
+
 
     def load_data(self, filter_text=""):
 
@@ -320,48 +413,132 @@ class PasswordVault:
 
         
 
-        conn = sqlite3.connect(DB_PATH)
+        ids = self.search_index.search(filter_text) if filter_text else None
 
-        c = conn.cursor()
 
 
+        # fuzzy matches best first, or LIKE paging while the index is still building;
 
-        if filter_text:
+        # first page only, insert_rows is called again as the tree is scrolled
 
-            c.execute("""SELECT id, website, username, password FROM vault 
+        self.pages.reset(filter_text, ids)
 
-                        WHERE website LIKE ? OR username LIKE ?""",
 
-                     (f"%{filter_text}%", f"%{filter_text}%"))
 
-        else:
+    def decode_row(self, row):
 
-            c.execute("SELECT id, website, username, password FROM vault")
+        try:
 
-        rows = c.fetchall()
+            with timer("decrypt", "crypto"):
 
+                decrypted_pw = fernet.decrypt(row[3]).decode()
 
+        except Exception:
 
-        for row in rows:
+            decrypted_pw = None
 
-            try:
+        return row[0], row[1], row[2], decrypted_pw
 
-                decrypted_pw = fernet.decrypt(row[3]).decode()
 
-                self.tree.insert("", "end", iid=row[0],
 
-                                 values=(row[1], row[2], decrypted_pw))
+    def insert_rows(self, rows):
+
+        self.insert_plain([self.decode_row(row) for row in rows])
+
+        self.report_failures()
+
+
+
+    def insert_plain(self, rows):
+
+        for row_id, website, username, decrypted_pw in rows:
+
+            if decrypted_pw is None:
+
+                self.failed.append(website)
+
+                continue
+
+            self.tree.insert("", "end", iid=row_id, values=(website, username, decrypted_pw))
+
+
+
+    def report_failures(self):
+
+        # one message per page instead of one per bad row
+
+        failed, self.failed = self.failed, []
+
+        if failed:
+
+            messagebox.showerror("Error", f"Failed to decrypt {len(failed)} password(s): "
 
-            except Exception as e:
+                                 + ", ".join(failed[:5]) + ("…" if len(failed) > 5 else ""))
 
-                messagebox.showerror("Error", f"Failed to decrypt password: {str(e)}")
 
 
+    def show_load_progress(self, shown, total, busy):
 
-        conn.close()
+        if busy:
+
+            if total:
+
+                self.load_bar.stop()
+
+                self.load_bar.configure(mode="determinate", maximum=total, value=shown)
+
+            elif not self.load_bar.winfo_ismapped():
+
+                self.load_bar.configure(mode="indeterminate")
+
+                self.load_bar.start(15)
+
+            self.load_bar.pack(side=tk.RIGHT, padx=5)
+
+            self.load_label.config(text=f"Loading... {shown} of {total}" if total else "Loading...")
+
+            return
+
+        self.load_bar.stop()
+
+        self.load_bar.pack_forget()
+
+        self.load_label.config(text=f"{shown} of {total} entries" if total else "")
+
+        self.report_failures()
+
+        self.clock.interactive()
+
+
+
+    def show_integrity_report(self, report, error=None):
+
+        if error:
+
+            messagebox.showerror("Integrity", f"The integrity check could not run: {error}")
+
+            return
+
+        msg = describe(report)
+
+        if msg:
+
+            messagebox.showwarning("Integrity", msg)
 
     
 
+    def sort_by(self, column):
+
+        self.pages.toggle_sort(column)
+
+        self.tree.heading("website", text=self.pages.heading("Website", "website"))
+
+        self.tree.heading("username", text=self.pages.heading("Username", "username"))
+
+        self.load_data(self.search_entry.get().lower())
+
+
+
     def filter_data(self, event=None):
 
         filter_text = self.search_entry.get().lower()
@@ -440,6 +617,12 @@ class PasswordVault:
 
 
 
+        Autocomplete(website_entry, self.website_suggest)
+
+        Autocomplete(username_entry, self.username_suggest)
+
+
+
         tk.Label(win, text="Password", font=("Arial", 10)).pack(pady=5)
 
         password_entry = tk.Entry(win, width=35, font=("Arial", 10), show="*")
@@ -512,29 +695,58 @@ class PasswordVault:
 
 
 
-            encrypted_pw = fernet.encrypt(password.encode())
+            with timer("encrypt", "crypto"):
 
+                encrypted_pw = fernet.encrypt(password.encode())
 
 
-            conn = sqlite3.connect(DB_PATH)
 
-            c = conn.cursor()
+            with timer("save", "db"):
 
-            if entry_id:
+                conn = sqlite3.connect(DB_PATH)
 
-                c.execute("UPDATE vault SET website = ?, username = ?, password = ? WHERE id = ?",
+                c = conn.cursor()
 
-                          (website, username, encrypted_pw, entry_id))
+                if entry_id:
 
-            else:
+                    # keep the password this edit replaces
+                    old = c.execute("SELECT password FROM vault WHERE id = ?", (entry_id,)).fetchone()
 
-                c.execute("INSERT INTO vault (website, username, password) VALUES (?, ?, ?)",
+                    try:
 
-                          (website, username, encrypted_pw))
+                        old_pw = fernet.decrypt(old[0]).decode() if old else None
 
-            conn.commit()
+                    except Exception:
 
-            conn.close()
+                        old_pw = None
+
+                    if old_pw is not None and old_pw != password:
+
+                        record_change(conn, fernet, int(entry_id), old_pw)
+
+                    c.execute("UPDATE vault SET website = ?, username = ?, password = ? WHERE id = ?",
+
+                              (website, username, encrypted_pw, entry_id))
+
+                else:
+
+                    c.execute("INSERT INTO vault (website, username, password) VALUES (?, ?, ?)",
+
+                              (website, username, encrypted_pw))
+
+                seal_rows(conn, fernet, [int(entry_id) if entry_id else c.lastrowid])
+
+                conn.commit()
+
+                conn.close()
+
+
+
+            self.search_index.add(int(entry_id) if entry_id else c.lastrowid, website, username)
+
+            self.website_suggest.add(website)
+
+            self.username_suggest.add(username)
 
 
 
@@ -556,6 +768,80 @@ class PasswordVault:
 
                   font=("Arial", 10), width=10).pack(side=tk.LEFT, padx=5)
 
+        if entry_id:
+
+            tk.Button(button_frame, text="History",
+
+                      command=lambda: self.history_window(win, entry_id, password_entry),
+
+                      font=("Arial", 10), width=10).pack(side=tk.LEFT, padx=5)
+
+
+
+    def history_window(self, parent, entry_id, password_entry):
+
+        conn = sqlite3.connect(DB_PATH)
+
+        try:
+
+            versions = load_history(conn, fernet, int(entry_id))
+
+        except Exception:
+
+            messagebox.showerror("Error", "Failed to decrypt password history", parent=parent)
+
+            return
+
+        finally:
+
+            conn.close()
+
+        if not versions:
+
+            messagebox.showinfo("History", "No earlier passwords for this entry.", parent=parent)
+
+            return
+
+
+
+        win = tk.Toplevel(parent)
+
+        win.title("Password History")
+
+        win.geometry("360x260")
+
+        win.transient(parent)
+
+        tk.Label(win, text="Double-click a version to put it back in the form",
+
+                 font=("Arial", 9)).pack(pady=5)
+
+        listbox = tk.Listbox(win, font=("Arial", 10))
+
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        for changed_at, old_pw in versions:
+
+            listbox.insert(tk.END, f"{format_time(changed_at)}    {'*' * len(old_pw)}")
+
+
+
+        def restore(event=None):
+
+            selected = listbox.curselection()
+
+            if selected:
+
+                password_entry.delete(0, tk.END)
+
+                password_entry.insert(0, versions[selected[0]][1])
+
+                win.destroy()
+
+
+
+        listbox.bind("<Double-1>", restore)
+
 
 
     def copy_password(self, event):
@@ -580,9 +866,11 @@ class PasswordVault:
 
             self.window.clipboard_append(password)
 
+            clear_clipboard_later(self.timers, self.window, str(password), CLIPBOARD_CLEAR_SECONDS)
+
 
 
-            messagebox.showinfo("Copied", "Password copied to clipboard!")
+            messagebox.showinfo("Copied", f"Password copied to clipboard! It will be cleared in {CLIPBOARD_CLEAR_SECONDS}s.")
 
         else:
 
@@ -607,6 +895,22 @@ class PasswordVault:
     
 
 
+    def open_attachments(self):
+
+        selected = self.tree.selection()
+
+        if selected:
+
+            website = self.tree.item(selected[0])["values"][0]
+
+            AttachmentsWindow(self.window, DB_PATH, fernet, int(selected[0]), website)
+
+        else:
+
+            messagebox.showwarning("Warning", "Please select an entry first!")
+
+
+
     def delete_entry(self):
 
         selected = self.tree.selection()
@@ -633,10 +937,14 @@ class PasswordVault:
 
                 c.execute("DELETE FROM vault WHERE id = ?", (entry_id,))
 
+                forget_rows(conn, [int(entry_id)])
+
                 conn.commit()
 
                 conn.close()
 
+                self.search_index.remove(int(entry_id))
+
                 
 
                 self.load_data(self.search_entry.get().lower())
@@ -763,6 +1071,14 @@ class PasswordVault:
 
     def clear_window(self):
 
+        if getattr(self, "pages", None) is not None:
+
+            self.pages.on_progress = None
+
+            self.pages.stop()
+
+            self.pages = None
+
         for widget in self.window.winfo_children():
 
             widget.destroy()
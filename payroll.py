@@ -0,0 +1,133 @@
+"""
+Payroll run over large employee files.
+
+Employee_Salary.py prints one salary slip for a typed basic salary. This
+job reads an employee CSV `chunk` rows at a time, computes every
+component with NumPy over the whole chunk, and writes the results
+through one large write buffer:
+
+    python payroll.py employees.csv --out payroll.csv
+    python payroll.py employees.csv --out slips.txt --slips
+
+employees.csv needs employee_id and basic columns; a name column is
+copied through when present. Output is CSV (employee_id, [name,] basic,
+hra, da, pf, gross, net, category) with amounts to two decimals, or with
+--slips, the script's slip text for each employee. compute() uses the
+same float operations as salary_slip(), so the unrounded values match
+it exactly. Only one chunk is in memory at a time, so memory stays flat
+for any number of employees. Throughput and the count per category go
+to stderr at the end.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from csv_chunks import Skipped, column_chunks
+from Employee_Salary import CATEGORIES, DA_RATE, HIGH_NET, HRA_RATE, MID_NET, PF_RATE
+
+CHUNK = 100_000
+AMOUNTS = ("basic", "hra", "da", "pf", "gross", "net")
+
+
+def compute(basic):
+    """salary_slip() over an array: component arrays plus category codes, indexes into CATEGORIES."""
+    basic = np.asarray(basic, dtype=np.float64)
+    hra = HRA_RATE * basic
+    da = DA_RATE * basic
+    pf = PF_RATE * basic
+    gross = basic + hra + da
+    net = gross - pf
+    category = np.full(len(basic), 2, dtype=np.uint8)
+    category[net >= MID_NET] = 1
+    category[net >= HIGH_NET] = 0
+    return {"basic": basic, "hra": hra, "da": da, "pf": pf, "gross": gross, "net": net,
+            "category": category}
+
+
+def read_chunks(stream, size=CHUNK, skipped=None):
+    """Yield (ids, names or None, basic array) for `size` CSV rows at a time.
+
+    Blank rows are ignored; short rows and rows whose basic isn't a number
+    are left out and noted in `skipped` (a csv_chunks.Skipped) when given.
+    """
+    for cols in column_chunks(stream, size, ("employee_id", "basic"), ("name",), ("basic",), skipped):
+        yield cols["employee_id"], cols.get("name"), cols["basic"]
+
+
+def _field(text):
+    if "," in text or '"' in text or "\n" in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def format_csv(ids, names, slip):
+    labels = [CATEGORIES[c] for c in slip["category"].tolist()]
+    amounts = [slip[a].tolist() for a in AMOUNTS]
+    keys = [list(map(_field, ids))] + ([list(map(_field, names))] if names is not None else [])
+    line = ",".join(["%s"] * len(keys) + ["%.2f"] * len(AMOUNTS) + ["%s"])
+    return "\n".join(map(line.__mod__, zip(*keys, *amounts, labels))) + "\n"
+
+
+def format_slips(ids, names, slip):
+    labels = [CATEGORIES[c] for c in slip["category"].tolist()]
+    cols = [slip[a].tolist() for a in AMOUNTS]
+    names = names if names is not None else [""] * len(ids)
+    return "".join(
+        f"Employee: {i} {n}\n"
+        f"Basic: {b}, HRA: {h}, DA: {d}, PF: {p}\n"
+        f"Gross Salary = {g}, Net Salary = {t}\n"
+        f"Category: {c}\n\n"
+        for i, n, b, h, d, p, g, t, c in zip(ids, names, *cols, labels))
+
+
+def run(src, out, chunk=CHUNK, slips=False, skipped=None):
+    """Pay everyone in the text stream `src`; returns (employees, count per category, net total).
+
+    Rows that can't be read are passed over and noted in `skipped`, as read_chunks() does.
+    """
+    employees, net = 0, 0.0
+    counts = np.zeros(len(CATEGORIES), dtype=np.int64)
+    header_done = slips
+    for ids, names, basic in read_chunks(src, chunk, skipped):
+        slip = compute(basic)
+        if not header_done:
+            out.write(",".join(["employee_id"] + (["name"] if names is not None else [])
+                               + list(AMOUNTS) + ["category"]) + "\n")
+            header_done = True
+        out.write((format_slips if slips else format_csv)(ids, names, slip))
+        employees += len(ids)
+        counts += np.bincount(slip["category"], minlength=len(CATEGORIES))
+        net += float(slip["net"].sum())
+    return employees, dict(zip(CATEGORIES, counts.tolist())), net
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute salary slips for a CSV of employees")
+    parser.add_argument("employees", help="CSV with employee_id and basic columns (name optional)")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    parser.add_argument("--slips", action="store_true", help="write slip text instead of CSV")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="employees per chunk")
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    skipped = Skipped()
+    with open(args.employees, newline="") as src:
+        if args.out:
+            with open(args.out, "w", buffering=1 << 20) as out:
+                employees, counts, net = run(src, out, args.chunk, args.slips, skipped)
+        else:
+            employees, counts, net = run(src, sys.stdout, args.chunk, args.slips, skipped)
+    seconds = time.perf_counter() - t
+    print(f"{employees} employees in {seconds:.2f}s ({employees / seconds if seconds else 0:,.0f}/s), "
+          f"net payroll {net:,.2f}", file=sys.stderr)
+    for category, count in counts.items():
+        print(f"{count:>10}  {category}", file=sys.stderr)
+    skipped.report(sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Table-driven pricing for whole catalogs.
+
+E-commerce_discount.py prices one item with nested ifs. Here the discount
+rules are data, a JSON file shaped like DEFAULT_CONFIG:
+
+    {"user_types": {"regular": [[0, 0.05], [500, 0.10]], ...},
+     "payment": {"online": 0.05, "offline": 0.0}}
+
+Each user type has tiers of [from_price, rate], sorted by from_price; a
+price gets the rate of the last tier it reaches, and the first tier also
+covers anything below it. The payment mode adds its rate on top. Unknown
+user types and payment modes add nothing, as in the script.
+
+PricingEngine compiles the tiers into sorted threshold arrays and prices
+with np.searchsorted: matrix() quotes every catalog price for every user
+type and payment mode, quote() prices per-row orders. Discounts and final
+prices are computed with the same float operations as discounted_price(),
+so the results are identical, not just close.
+
+    python pricing_engine.py catalog.csv [--config tiers.json] [--out quotes.csv]
+    python pricing_engine.py --print-config > tiers.json
+
+catalog.csv needs a price column; an sku column is copied to the output.
+"""
+
+import argparse
+import csv
+import importlib
+import json
+import sys
+
+import numpy as np
+
+_script = importlib.import_module("E-commerce_discount")  # not an identifier, so no `from ... import`
+
+# the rules hardcoded in E-commerce_discount.py
+DEFAULT_CONFIG = {
+    "user_types": {
+        "regular": [[0, _script.REGULAR_RATES[0]], [_script.REGULAR_FROM, _script.REGULAR_RATES[1]]],
+        "premium": [[0, _script.PREMIUM_RATES[0]], [_script.PREMIUM_FROM, _script.PREMIUM_RATES[1]]],
+        "vip": [[0, _script.VIP_RATE]],
+    },
+    "payment": {"online": _script.ONLINE_DISCOUNT, "offline": 0.0},
+}
+
+
+def load_config(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class PricingEngine:
+    """Discount tiers compiled for vectorized pricing.
+
+    user_types and payments are the configured names; their positions are
+    the codes quote() takes. Code len(user_types) / len(payments) stands for
+    anything unknown and gets no discount.
+    """
+
+    def __init__(self, config=DEFAULT_CONFIG):
+        self.user_types = tuple(config["user_types"])
+        self.payments = tuple(config.get("payment", {}))
+        self.thresholds = []  # per user type: from_price of every tier after the first
+        self.rates = []
+        for name, tiers in config["user_types"].items():
+            if not tiers:
+                raise ValueError(f"user type {name!r} has no tiers")
+            starts = [float(t[0]) for t in tiers]
+            if starts != sorted(starts):
+                raise ValueError(f"tiers for {name!r} must be sorted by price")
+            self.thresholds.append(np.array(starts[1:]))
+            self.rates.append(np.array([float(t[1]) for t in tiers]))
+        self.extra = np.array([float(r) for r in config.get("payment", {}).values()] + [0.0])
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(load_config(path))
+
+    def codes(self, names, kind="user_type"):
+        """Map an array of names to codes; unknown names get the 'no discount' code."""
+        known = self.user_types if kind == "user_type" else self.payments
+        names = np.asarray(names)
+        codes = np.full(names.shape, len(known), dtype=np.intp)
+        # a few array comparisons beat sorting for a handful of names
+        for i, n in enumerate(known):
+            codes[names == n] = i
+        rest = np.flatnonzero(codes == len(known))
+        if len(rest):
+            lookup = {n: i for i, n in enumerate(known)}
+            uniq, inverse = np.unique(names[rest], return_inverse=True)
+            table = np.array([lookup.get(str(n).lower(), len(known)) for n in uniq], dtype=np.intp)
+            codes[rest] = table[inverse]
+        return codes
+
+    def tier_rates(self, prices, u):
+        """Tier discount of user type code `u` for every price."""
+        if u == len(self.user_types):
+            return np.zeros(len(prices))
+        return self.rates[u][np.searchsorted(self.thresholds[u], prices, side="right")]
+
+    def matrix(self, prices):
+        """(discount, final_price), each shaped (user type, payment mode, price).
+
+        The last user type and payment rows are the "unknown" ones, kept so
+        the shape matches the codes.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        shape = (len(self.user_types) + 1, len(self.extra), len(prices))
+        discount = np.empty(shape)
+        final = np.empty(shape)
+        for u in range(shape[0]):
+            rate = self.tier_rates(prices, u)
+            for m, extra in enumerate(self.extra):
+                d, f = discount[u, m], final[u, m]
+                if extra:
+                    np.add(rate, extra, out=d)
+                else:
+                    d[:] = rate
+                np.subtract(1.0, d, out=f)
+                np.multiply(prices, f, out=f)
+        return discount, final
+
+    def quote(self, prices, user_types, payments):
+        """(discount, final_price) per order; user_types / payments are codes or names."""
+        prices = np.asarray(prices, dtype=np.float64)
+        user_types = np.asarray(user_types)
+        payments = np.asarray(payments)
+        if user_types.dtype.kind not in "iu":
+            user_types = self.codes(user_types, "user_type")
+        if payments.dtype.kind not in "iu":
+            payments = self.codes(payments, "payment")
+        discount = np.empty(len(prices))
+        for u in range(len(self.user_types) + 1):
+            sel = np.flatnonzero(user_types == u)
+            if len(sel):
+                discount[sel] = self.tier_rates(prices[sel], u)
+        extra = self.extra[payments]
+        np.add(discount, extra, out=discount, where=extra != 0)
+        return discount, prices * (1.0 - discount)
+
+
+def load_catalog(path):
+    """(skus, prices) from a CSV with a price column and optionally an sku column."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        p = header.index("price")
+        s = header.index("sku") if "sku" in header else None
+        skus, prices = [], []
+        for row in reader:
+            if row:
+                prices.append(float(row[p]))
+                skus.append(row[s] if s is not None else str(len(skus) + 1))
+    return skus, np.array(prices)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price a catalog for every user type and payment mode")
+    parser.add_argument("catalog", nargs="?", help="CSV with a price column (and optionally sku)")
+    parser.add_argument("--config", help="JSON discount tiers (default: the E-commerce_discount.py rules)")
+    parser.add_argument("--out", help="write every quote to this CSV file")
+    parser.add_argument("--print-config", action="store_true", help="print the default config and exit")
+    args = parser.parse_args(argv)
+    if args.print_config:
+        json.dump(DEFAULT_CONFIG, sys.stdout, indent=2)
+        print()
+        return 0
+    if not args.catalog:
+        parser.error("a catalog is required")
+
+    engine = PricingEngine.from_file(args.config) if args.config else PricingEngine()
+    skus, prices = load_catalog(args.catalog)
+    discount, final = engine.matrix(prices)
+    for u, user_type in enumerate(engine.user_types):
+        for m, payment in enumerate(engine.payments):
+            print(f"{user_type:>10} {payment:>8}  mean final price {final[u, m].mean():12.2f}")
+    if args.out:
+        with open(args.out, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(("sku", "user_type", "payment", "discount", "final_price"))
+            for u, user_type in enumerate(engine.user_types):
+                for m, payment in enumerate(engine.payments):
+                    writer.writerows(zip(skus, [user_type] * len(skus), [payment] * len(skus),
+                                         discount[u, m].tolist(), final[u, m].tolist()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,12 @@ from pathlib import Path
 from cryptography.fernet import Fernet
 from PIL import Image, ImageTk
 import traceback
+from vault_crypto import VaultCipher, start_background_migration
+from vault_metrics import timed
+from vault_query import PageLoader, ensure_indexes
+from vault_timers import TimerWheel
+from vault_maintenance import MaintenanceScheduler
+from vault_integrity import ensure_integrity_tables, seal_rows, verify_in_background, describe
 
 # ----------------------------- FILE PATHS -----------------------------
 
@@ -26,18 +32,23 @@ def load_or_create_key():
         return key
 
 
+STORAGE_FORMAT = "aesgcm"
+
 FERNET_KEY = load_or_create_key()
-CIPHER = Fernet(FERNET_KEY)
+CIPHER = VaultCipher(FERNET_KEY, STORAGE_FORMAT)
 
+@timed("encrypt", "crypto")
 def encrypt(text):
     return CIPHER.encrypt(text.encode())
 
+@timed("decrypt", "crypto")
 def decrypt(token):
     return CIPHER.decrypt(token).decode()
 
 
 # ----------------------------- DATABASE SETUP -----------------------------
 
+@timed("init_db", "db")
 def init_db():
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
@@ -49,6 +60,8 @@ def init_db():
             password BLOB NOT NULL
         )
     """)
+    ensure_indexes(conn)
+    ensure_integrity_tables(conn)
     conn.commit()
     conn.close()
 
@@ -62,6 +75,8 @@ TEXT_DARK = "#1C1B1F"
 OUTLINE = "#D0CBE5"
 FONT = ("Segoe UI", 11)
 
+SORT_KEYS = {"Service": "service", "Username": "username"}
+
 # ----------------------------- APP CLASS -----------------------------
 
 class PasswordVault:
@@ -71,10 +86,16 @@ class PasswordVault:
         self.window.geometry("900x550")
         self.window.configure(bg=LIGHT_BG)
 
+        self.pages = PageLoader(DB_PATH, self._insert_rows)
+        self.timers = TimerWheel(self.window)
+        self.maintenance = MaintenanceScheduler(self.window, self.timers, DB_PATH)
+
         self._style_widgets()
         self._build_gui()
         self._load_entries()
 
+        verify_in_background(self.window, DB_PATH, CIPHER, self._on_integrity_report)
+
     # ----------------------------- STYLES -----------------------------
 
     def _style_widgets(self):
@@ -172,8 +193,22 @@ class PasswordVault:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=150)
 
+        for col in SORT_KEYS:
+            self.tree.heading(col, command=lambda col=col: self._sort_by(col))
+
+        self.tree.configure(yscrollcommand=self.pages.on_scroll)
         self.tree.pack(fill="both", expand=True, padx=10, pady=10)
 
+    # ----------------------------- SORTING -----------------------------
+
+    def _sort_by(self, col):
+        self.pages.toggle_sort(SORT_KEYS[col])
+
+        for c, key in SORT_KEYS.items():
+            self.tree.heading(c, text=self.pages.heading(c, key))
+
+        self._load_entries()
+
     # ----------------------------- SAVE ENTRY -----------------------------
 
     def _save_entry(self):
@@ -191,6 +226,7 @@ class PasswordVault:
         c = conn.cursor()
         c.execute("INSERT INTO vault (service, username, password) VALUES (?, ?, ?)",
                   (s, u, enc))
+        seal_rows(conn, CIPHER, [c.lastrowid])
         conn.commit()
         conn.close()
 
@@ -200,25 +236,31 @@ class PasswordVault:
         self.username_entry.delete(0, tk.END)
         self.password_entry.delete(0, tk.END)
 
+    def _on_integrity_report(self, report, error=None):
+        if error:
+            messagebox.showerror("Integrity", f"The integrity check could not run: {error}")
+            return
+        msg = describe(report)
+        if msg:
+            messagebox.showwarning("Integrity", msg)
+
     # ----------------------------- LOAD ENTRIES -----------------------------
 
     def _load_entries(self):
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT service, username, password FROM vault")
-        rows = c.fetchall()
-        conn.close()
-
         for i in self.tree.get_children():
             self.tree.delete(i)
 
-        for s, u, p in rows:
+        # first page only; the rest is fetched as the table is scrolled
+        self.pages.reset()
+
+    def _insert_rows(self, rows):
+        for rid, s, u, p in rows:
             try:
                 d = decrypt(p)
             except:
                 d = "Invalid"
 
-            self.tree.insert("", tk.END, values=(s, u, d))
+            self.tree.insert("", tk.END, iid=str(rid), values=(s, u, d))
 
 
 # ----------------------------- RUN APP -----------------------------
@@ -226,6 +268,7 @@ class PasswordVault:
 if __name__ == "__main__":
     try:
         init_db()
+        start_background_migration(DB_PATH, CIPHER)
         root = tk.Tk()
         app = PasswordVault(root)
         root.mainloop()
@@ -0,0 +1,238 @@
+"""
+Batch runner for the rule scripts (ATM_transaction.py, Loan_Eligibilty.py, ...).
+
+Each script keeps its interactive input() mode when run directly and also
+exposes its rule as a pure function plus two constants:
+
+    FIELDS   (name, converter) pairs, in the order the function takes its
+             arguments; the converter turns a CSV string or JSON value
+             into the argument
+    RESULTS  the keys of the dict the function returns; CSV output has
+             these columns after the input fields
+
+This runner streams records through a rule:
+
+    python rules_batch.py loan applicants.csv > decisions.jsonl
+    python rules_batch.py atm - --format csv --output csv < atm.csv
+    python rules_batch.py --list
+
+Input is CSV with a header row or JSON Lines, read from a file or stdin
+(-); the format follows the file extension or --format, and for stdin it
+is sniffed from the first byte. Every output record holds the input
+fields followed by the rule's results, one per line as JSONL (default) or
+CSV, written as soon as it is computed, so memory stays flat for any
+input size. A record that can't be parsed gets an "error" field instead
+of results and the run continues.
+"""
+
+import argparse
+import csv
+import importlib.util
+import io
+import json
+import sys
+from itertools import chain
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# rule name -> (script, function)
+RULES = {
+    "atm": ("ATM_transaction.py", "atm_transaction"),
+    "loan": ("Loan_Eligibilty.py", "loan_eligibility"),
+    "discount": ("E-commerce_discount.py", "discounted_price"),
+    "food": ("Online_Food_Delivery.py", "food_bill"),
+    "traffic": ("Smart_Traffic.py", "traffic_fine"),
+    "movie": ("Movie_ticket.py", "ticket_price"),
+    "salary": ("Employee_Salary.py", "salary_slip"),
+    "exam": ("Online_Examination_Result.py", "exam_result"),
+    "admission": ("University_Admission.py", "admission"),
+}
+
+_modules = {}
+
+JSON_TYPES = {list: "array", str: "string", int: "number", float: "number", bool: "boolean",
+              type(None): "null"}
+
+
+def _module(name):
+    """The rule's script, imported by path since some names aren't identifiers."""
+    script, _ = RULES[name]
+    module = _modules.get(script)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(f"rule_{name}", ROOT / script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[script] = module
+    return module
+
+
+def load_rule(name):
+    """Return (function, FIELDS) for a rule."""
+    module = _module(name)
+    return getattr(module, RULES[name][1]), module.FIELDS
+
+
+def output_columns(name):
+    """Input fields, then the rule's result keys, then error: every column a CSV output can have."""
+    module = _module(name)
+    names = [f for f, _ in module.FIELDS]
+    return names + [r for r in module.RESULTS if r not in names] + ["error"]
+
+
+# ----------------------------- READING -----------------------------
+
+
+def iter_records(stream, fmt, names):
+    """Yield (raw, values, error) with values ordered like `names`.
+
+    raw is the record as read (a dict) so it can be echoed to the output.
+    values is None for a record that can't be used, and error says why.
+    """
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [h.strip() for h in header]
+        index = {h: i for i, h in enumerate(header)}
+        picks = [index.get(n) for n in names]
+        for row in reader:
+            if not row:
+                continue
+            raw = dict(zip(header, row))
+            if None in picks or len(row) < len(header):
+                yield raw, None, _missing(raw, names)
+            else:
+                yield raw, [row[i] for i in picks], None
+    else:
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                yield {"line": line.rstrip("\n")}, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(raw, dict):
+                got = JSON_TYPES.get(type(raw), type(raw).__name__)
+                yield {"line": line.rstrip("\n")}, None, f"expected a JSON object, got {got}"
+            elif all(n in raw for n in names):
+                yield raw, [raw[n] for n in names], None
+            else:
+                yield raw, None, _missing(raw, names)
+
+
+def _missing(raw, names):
+    return "missing field(s): " + ", ".join(n for n in names if n not in raw)
+
+
+def sniff(stream):
+    """Guess csv/jsonl from the first non-blank character; returns (format, stream)."""
+    first = stream.readline()
+    while first and not first.strip():
+        first = stream.readline()
+    fmt = "jsonl" if first.lstrip().startswith("{") else "csv"
+    return fmt, chain([first], stream)
+
+
+# ----------------------------- RUNNING -----------------------------
+
+
+def _int(value):
+    """int() that refuses to truncate, so JSON 21.5 fails like the CSV string "21.5"."""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"expected an integer, got {value!r}")
+    return int(value)
+
+
+def run(rule, records, converters):
+    """Apply `rule` to (raw, values, error) records, yielding output dicts."""
+    for raw, values, error in records:
+        if values is None:
+            raw["error"] = error
+            yield raw
+            continue
+        try:
+            args = [conv(v) for conv, v in zip(converters, values)]
+        except (TypeError, ValueError) as e:
+            raw["error"] = str(e)
+            yield raw
+            continue
+        raw.update(rule(*args))
+        yield raw
+
+
+def write_jsonl(out, results):
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    n = 0
+    for rec in results:
+        out.write(dumps(rec))
+        out.write("\n")
+        n += 1
+    return n
+
+
+def write_csv(out, results, columns):
+    writer = csv.DictWriter(out, columns, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    n = 0
+    for rec in results:
+        writer.writerow(rec)
+        n += 1
+    return n
+
+
+def process(name, src, out, in_format=None, out_format="jsonl"):
+    """Stream records from the text stream `src` through rule `name` into `out`; returns the count."""
+    rule, fields = load_rule(name)
+    names = [f for f, _ in fields]
+    converters = [conv for _, conv in fields]
+    if in_format is None:
+        in_format, src = sniff(src)
+    if in_format == "jsonl":
+        converters = [_int if conv is int else conv for conv in converters]
+    results = run(rule, iter_records(src, in_format, names), converters)
+    if out_format == "csv":
+        return write_csv(out, results, output_columns(name))
+    return write_jsonl(out, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a rule script over CSV/JSONL records")
+    parser.add_argument("rule", nargs="?", choices=sorted(RULES))
+    parser.add_argument("input", nargs="?", default="-", help="CSV or JSONL file, - for stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: guess)")
+    parser.add_argument("--output", choices=["jsonl", "csv"], default="jsonl", help="output format")
+    parser.add_argument("--list", action="store_true", help="list rules and the fields they need")
+    args = parser.parse_args(argv)
+
+    if args.list or not args.rule:
+        for name in sorted(RULES):
+            print(f"{name:<10} {', '.join(f for f, _ in load_rule(name)[1])}")
+        return 0
+
+    out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="",
+                           write_through=False) if hasattr(sys.stdout, "buffer") else sys.stdout
+    fmt = args.format
+    if args.input == "-":
+        src = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    else:
+        src = open(args.input, encoding="utf-8", newline="")
+        if fmt is None:
+            fmt = "jsonl" if Path(args.input).suffix.lower() in (".jsonl", ".json", ".ndjson") else "csv"
+    try:
+        process(args.rule, src, out, fmt, args.output)
+    except BrokenPipeError:
+        pass
+    finally:
+        src.close()
+        try:
+            out.flush()
+        except BrokenPipeError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import io
+
+from atm_ledger import OK, Ledger, read_events
+
+ACCOUNTS = "account,account_type,balance\nA1,saving,30000\n"
+
+
+def ledger(accounts=ACCOUNTS):
+    ledger = Ledger()
+    ledger.load_accounts(io.StringIO(accounts))
+    return ledger
+
+
+def test_empty_events_stream():
+    for fmt in ("csv", "jsonl"):
+        assert list(ledger().process(read_events(io.StringIO(""), fmt))) == []
+
+
+def test_empty_accounts_file():
+    assert len(ledger("")) == 0
+
+
+def test_timestamps_share_one_cached_date():
+    l = ledger()
+    events = [("2024-01-06T10:00:%02d" % i, "A1", "100") for i in range(50)]
+    statuses = {status for _, _, _, status, _, _ in l.process(events)}
+    assert statuses == {OK}
+    assert len(l._dates) == 1
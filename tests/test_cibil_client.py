@@ -0,0 +1,23 @@
+import asyncio
+
+from cibil_client import eligibility
+
+
+class Scores:
+    def __init__(self, scores):
+        self.scores_by_id = scores
+        self.asked = []
+
+    async def scores(self, ids):
+        self.asked.extend(ids)
+        return [self.scores_by_id.get(i) for i in ids]
+
+
+def test_bad_row_is_an_error_not_an_abort():
+    client = Scores({"a": 800, "b": 800, "c": 800})
+    rows = [("a", "30", "50000", "0"), ("b", "30.0", "50000", "0"), ("c", "30", None, "0")]
+    results = asyncio.run(eligibility(client, rows))
+    assert client.asked == ["a"]
+    assert results[0] == ("a", 800, "Eligible for Loan")
+    assert [r[:2] for r in results[1:]] == [("b", None), ("c", None)]
+    assert all(r[2].startswith("Invalid row: ") for r in results[1:])
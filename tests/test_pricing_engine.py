@@ -0,0 +1,13 @@
+import itertools
+
+from pricing_engine import PricingEngine
+from rules_batch import load_rule
+
+
+def test_default_config_matches_the_script():
+    discounted_price, _ = load_rule("discount")
+    prices = [0.0, 499.99, 500.0, 999.99, 1000.0, 2500.0]
+    orders = list(itertools.product(prices, ("regular", "premium", "vip", "guest"), ("online", "offline", "cod")))
+    discount, final = PricingEngine().quote(*zip(*orders))
+    for (price, user_type, payment), d, f in zip(orders, discount.tolist(), final.tolist()):
+        assert discounted_price(price, user_type, payment) == {"discount": d, "final_price": f}
@@ -0,0 +1,40 @@
+import io
+import json
+
+from rules_batch import process
+
+GOOD = {"age": 30, "income": 50000, "existing_loan": 0, "cibil": 800}
+
+
+def run_jsonl(lines, out_format="jsonl"):
+    out = io.StringIO()
+    n = process("loan", io.StringIO("".join(line + "\n" for line in lines)), out, "jsonl", out_format)
+    return n, out.getvalue()
+
+
+def test_non_object_lines_become_error_records():
+    n, text = run_jsonl([json.dumps(GOOD), "[1,2]", "null", '"abc"', json.dumps(GOOD)])
+    records = [json.loads(line) for line in text.splitlines()]
+    assert n == 5
+    assert records[0]["decision"] == records[4]["decision"] == "Eligible for Loan"
+    assert [r["line"] for r in records[1:4]] == ["[1,2]", "null", '"abc"']
+    assert [r["error"] for r in records[1:4]] == ["expected a JSON object, got array",
+                                                  "expected a JSON object, got null",
+                                                  "expected a JSON object, got string"]
+
+
+def test_non_object_lines_in_csv_output():
+    n, text = run_jsonl(["[1,2]", json.dumps(GOOD)], out_format="csv")
+    rows = text.splitlines()
+    assert n == 2
+    assert rows[0] == "age,income,existing_loan,cibil,decision,error"
+    assert rows[1].endswith('"expected a JSON object, got array"')
+    assert rows[2] == "30,50000,0,800,Eligible for Loan,"
+
+
+def test_fractional_json_number_is_rejected_like_csv():
+    n, text = run_jsonl([json.dumps(dict(GOOD, age=21.5)), json.dumps(dict(GOOD, age=21.0))])
+    bad, good = [json.loads(line) for line in text.splitlines()]
+    assert n == 2
+    assert bad["error"] == "expected an integer, got 21.5" and "decision" not in bad
+    assert good["decision"] == "Eligible for Loan"
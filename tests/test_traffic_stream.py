@@ -0,0 +1,26 @@
+from traffic_stream import FineProcessor
+
+
+def event(ts, speed, extra=""):
+    return '{"ts": %s, "plate": "KA01", "vehicle_type": "car", "speed": %s}%s' % (ts, speed, extra)
+
+
+def test_fractional_speed_over_limit_is_fined():
+    p = FineProcessor()
+    p.process([event(100, 80.9), event(101, 80)], now=200)
+    assert p.fined == 1
+
+
+def test_far_future_ts_does_not_expire_the_window():
+    p = FineProcessor()
+    p.process([event(100, 90), event(1e15, 90), event(101, 90)], now=200)
+    report = p.report()
+    assert report["bad"] == 1
+    assert report["late"] == 0
+    assert report["window"]["car"]["events"] == 2
+
+
+def test_trailing_data_is_bad():
+    p = FineProcessor()
+    p.process([event(100, 90, " junk"), event(101, 90, " ")], now=200)
+    assert p.bad == 1
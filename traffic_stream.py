@@ -0,0 +1,347 @@
+"""
+Streaming traffic fines for camera/sensor event feeds.
+
+Smart_Traffic.py fines one vehicle from typed answers. This pipeline reads
+a stream of events, one JSON object per line:
+
+    {"ts": 1767225600.5, "plate": "KA01AB1234", "vehicle_type": "car",
+     "speed": 92, "seat_belt": "no", "helmet": "no"}
+
+and applies traffic_fine() to each. ts is the event time in epoch
+seconds; without it the arrival time is used. An event stamped more than
+`max_skew` seconds after its arrival is counted as bad rather than let
+one broken clock push the window past every later event. Lines come from a file or
+stdin, or from any number of clients connected to a local TCP socket,
+which stands in for the camera network.
+
+Readers hand batches of lines to the processor through a bounded
+asyncio.Queue. When the processor falls behind, put() blocks, so the
+file is read no further and socket reads stop, and TCP flow control
+slows the senders down. Memory stays bounded at any input rate.
+
+FineProcessor keeps two things in bounded memory:
+
+    - WindowTotals: events, fined events and fines per vehicle type over
+      the last `window` seconds of event time, in `bucket`-second buckets
+    - PlateTotals: running fine totals for the worst `capacity` plates
+      (Space-Saving: any plate with more than total / capacity in fines
+      is kept, and its total is overestimated by at most its `error`)
+
+    python traffic_stream.py events.jsonl [--fines fined.jsonl]
+    python traffic_stream.py --listen 9900 --report 5
+    python traffic_stream.py --generate 1000000 > events.jsonl
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import math
+import random
+import sys
+import time
+from collections import deque
+
+from Smart_Traffic import traffic_fine
+
+VEHICLE_TYPES = ("car", "bike", "truck")
+
+_decode = json.JSONDecoder().raw_decode  # json.loads minus its type checks and whitespace regex
+
+
+class WindowTotals:
+    """[events, fined, fines] per vehicle type over a sliding event-time window."""
+
+    def __init__(self, window=60.0, bucket=1.0):
+        self.bucket = bucket
+        self.span = max(1, round(window / bucket))  # buckets in the window
+        self.buckets = deque()  # [bucket number, {vehicle_type: [events, fined, fines]}]
+        self.totals = {}
+        self.late = 0
+
+    def add(self, ts, vehicle_type, fine):
+        b = int(ts // self.bucket)
+        buckets = self.buckets
+        if buckets and b == buckets[-1][0]:
+            counts = buckets[-1][1]
+        elif not buckets or b > buckets[-1][0]:
+            buckets.append([b, {}])
+            while buckets[0][0] <= b - self.span:
+                self._expire(buckets.popleft()[1])
+            counts = buckets[-1][1]
+        elif b <= buckets[-1][0] - self.span:
+            self.late += 1  # older than the window; nothing to add it to
+            return
+        else:
+            i = len(buckets) - 1
+            while i >= 0 and buckets[i][0] > b:
+                i -= 1
+            if i >= 0 and buckets[i][0] == b:
+                counts = buckets[i][1]
+            else:  # late event for a bucket that saw no events yet
+                counts = {}
+                buckets.insert(i + 1, [b, counts])
+        for c in (counts.setdefault(vehicle_type, [0, 0, 0]),
+                  self.totals.setdefault(vehicle_type, [0, 0, 0])):
+            c[0] += 1
+            if fine:
+                c[1] += 1
+                c[2] += fine
+
+    def _expire(self, counts):
+        for vehicle_type, (events, fined, fines) in counts.items():
+            t = self.totals[vehicle_type]
+            t[0] -= events
+            t[1] -= fined
+            t[2] -= fines
+
+    def snapshot(self):
+        return {v: {"events": e, "fined": f, "fines": s} for v, (e, f, s) in self.totals.items() if e}
+
+
+class PlateTotals:
+    """Approximate top plates by total fines in at most `capacity` entries."""
+
+    def __init__(self, capacity=10_000):
+        self.capacity = capacity
+        self.totals = {}  # plate -> [total, error]
+        self.heap = []  # (total, plate), possibly stale; rebuilt when it grows too big
+
+    def add(self, plate, fine):
+        entry = self.totals.get(plate)
+        if entry is None:
+            if len(self.totals) >= self.capacity:
+                floor = self._evict_min()
+                entry = self.totals[plate] = [floor, floor]
+            else:
+                entry = self.totals[plate] = [0, 0]
+        entry[0] += fine
+        heapq.heappush(self.heap, (entry[0], plate))
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(t, p) for p, (t, _) in self.totals.items()]
+            heapq.heapify(self.heap)
+
+    def _evict_min(self):
+        while True:
+            total, plate = heapq.heappop(self.heap)
+            entry = self.totals.get(plate)
+            if entry is not None and entry[0] == total:
+                del self.totals[plate]
+                return total
+
+    def top(self, n=10):
+        best = heapq.nlargest(n, self.totals.items(), key=lambda kv: kv[1][0])
+        return [{"plate": p, "total": t, "error": e} for p, (t, e) in best]
+
+
+class FineProcessor:
+    def __init__(self, window=60.0, bucket=1.0, plates=10_000, out=None, max_skew=300.0):
+        self.window = WindowTotals(window, bucket)
+        self.max_skew = max_skew
+        self.plates = PlateTotals(plates)
+        self.out = out
+        self.events = 0
+        self.fined = 0
+        self.bad = 0
+
+    def process(self, lines, now=None):
+        """Apply the fine rules to a batch of JSON lines."""
+        window, plates, out = self.window, self.plates, self.out
+        now = time.time() if now is None else now
+        latest = now + self.max_skew
+        fined = []
+        count = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            self.events += 1
+            try:
+                e, end = _decode(line)
+                if end != len(line):
+                    raise ValueError("trailing data after the event")
+                vehicle_type = str(e["vehicle_type"]).lower()
+                speed = float(e["speed"])  # unrounded: 80.9 is over an 80 limit
+                if not math.isfinite(speed):
+                    raise ValueError(f"bad speed {speed}")
+                fine = traffic_fine(speed, vehicle_type, str(e.get("seat_belt", "")).lower(),
+                                    str(e.get("helmet", "")).lower())["fine"]
+                ts = float(e.get("ts", now))
+                if not math.isfinite(ts) or ts > latest:
+                    raise ValueError(f"bad ts {ts}")
+                plate = e.get("plate", "?")
+                if not isinstance(plate, str):
+                    raise TypeError(f"bad plate {plate!r}")
+            except (ValueError, KeyError, TypeError, AttributeError, OverflowError):
+                self.bad += 1
+                continue
+            window.add(ts, vehicle_type, fine)
+            if fine:
+                count += 1
+                plates.add(plate, fine)
+                if out is not None:
+                    e["fine"] = fine
+                    fined.append(json.dumps(e))
+        self.fined += count
+        if fined:
+            out.write("\n".join(fined) + "\n")
+
+    def report(self):
+        return {"events": self.events, "fined": self.fined, "bad": self.bad, "late": self.window.late,
+                "window": self.window.snapshot(), "top_plates": self.plates.top(5)}
+
+
+# ----------------------------- PIPELINE -----------------------------
+
+
+async def read_file(stream, queue, batch=1000):
+    """Feed a text stream to the queue in batches; reads happen off the event loop."""
+    while True:
+        lines = await asyncio.to_thread(stream.readlines, 1 << 20)  # about a MiB at a time
+        if not lines:
+            return
+        for i in range(0, len(lines), batch):
+            await queue.put(lines[i:i + batch])
+
+
+async def read_socket(reader, queue, chunk=1 << 16):
+    """Feed one client connection to the queue; stops reading while the queue is full."""
+    partial = b""
+    while True:
+        data = await reader.read(chunk)
+        if not data:
+            break
+        complete, _, partial = (partial + data).rpartition(b"\n")
+        if complete:
+            await queue.put(complete.decode().split("\n"))
+    if partial.strip():
+        await queue.put([partial.decode()])
+
+
+async def consume(queue, processor):
+    while True:
+        lines = await queue.get()
+        if lines is None:
+            return
+        processor.process(lines, now=time.time())
+        await asyncio.sleep(0)  # let readers and reporters run between batches
+
+
+async def _until_consumer_dies(consumer, work):
+    """Await `work`; if the consumer stops first, cancel the work and raise.
+
+    Without this a dead consumer leaves the readers blocked on a full queue forever.
+    """
+    work = asyncio.ensure_future(work)
+    await asyncio.wait({work, consumer}, return_when=asyncio.FIRST_COMPLETED)
+    if not work.done():
+        work.cancel()
+        await asyncio.gather(work, return_exceptions=True)
+        consumer.result()  # re-raises whatever killed it
+        raise RuntimeError("event consumer stopped early")
+    return work.result()
+
+
+async def run_file(stream, processor, queue_size=64, batch=1000):
+    queue = asyncio.Queue(queue_size)
+    consumer = asyncio.create_task(consume(queue, processor))
+    try:
+        await _until_consumer_dies(consumer, read_file(stream, queue, batch))
+        await queue.put(None)
+        await consumer
+    finally:
+        consumer.cancel()
+
+
+async def serve(port, processor, queue_size=64, host="127.0.0.1", ready=None):
+    """Accept event streams on host:port until cancelled."""
+    queue = asyncio.Queue(queue_size)
+    consumer = asyncio.create_task(consume(queue, processor))
+    handlers = set()
+
+    async def handle(reader, writer):
+        handlers.add(asyncio.current_task())
+        try:
+            await read_socket(reader, queue)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            handlers.discard(asyncio.current_task())
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    if ready is not None:
+        ready.set_result(server.sockets[0].getsockname()[1])
+    try:
+        async with server:
+            await _until_consumer_dies(consumer, server.serve_forever())
+    finally:
+        consumer.cancel()
+        for task in list(handlers):  # unblock readers waiting on the full queue
+            task.cancel()
+
+
+async def report_every(seconds, processor):
+    while True:
+        await asyncio.sleep(seconds)
+        print(json.dumps(processor.report()), file=sys.stderr, flush=True)
+
+
+def generate(n, seed=1, start=None, rate=10_000, plates=50_000):
+    """n random events, `rate` per second of event time, ending now by default."""
+    rng = random.Random(seed)
+    start = time.time() - n / rate if start is None else start
+    for i in range(n):
+        vehicle_type = rng.choice(VEHICLE_TYPES)
+        yield json.dumps({"ts": round(start + i / rate, 3), "plate": f"KA{rng.randrange(plates):06d}",
+                          "vehicle_type": vehicle_type, "speed": rng.randint(30, 120),
+                          "seat_belt": rng.choice(("yes", "yes", "yes", "no")),
+                          "helmet": rng.choice(("yes", "yes", "yes", "no"))})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply traffic fine rules to a stream of sensor events")
+    parser.add_argument("events", nargs="?", default="-", help="JSON Lines file, or - for stdin")
+    parser.add_argument("--listen", type=int, metavar="PORT", help="read events from TCP clients instead")
+    parser.add_argument("--fines", help="write every fined event to this JSON Lines file")
+    parser.add_argument("--window", type=float, default=60.0, help="aggregate window in seconds")
+    parser.add_argument("--plates", type=int, default=10_000, help="plates to keep running totals for")
+    parser.add_argument("--report", type=float, help="print aggregates to stderr every N seconds")
+    parser.add_argument("--generate", type=int, metavar="N", help="print N random events and exit")
+    args = parser.parse_args(argv)
+
+    if args.generate is not None:
+        for line in generate(args.generate):
+            sys.stdout.write(line + "\n")
+        return 0
+
+    out = open(args.fines, "w") if args.fines else None
+    processor = FineProcessor(args.window, plates=args.plates, out=out)
+
+    async def run():
+        reporter = asyncio.create_task(report_every(args.report, processor)) if args.report else None
+        try:
+            if args.listen is not None:
+                await serve(args.listen, processor)
+            elif args.events == "-":
+                await run_file(sys.stdin, processor)
+            else:
+                with open(args.events) as f:
+                    await run_file(f, processor)
+        finally:
+            if reporter:
+                reporter.cancel()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out:
+            out.close()
+    print(json.dumps(processor.report(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
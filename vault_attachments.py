@@ -0,0 +1,437 @@
+"""
+File attachments and secure notes for vault entries.
+
+Files (SSH keys, certificates, recovery codes, ...) are split into
+CHUNK_SIZE pieces, each sealed on its own with AES-GCM and stored as one
+row of `attachment_chunks`:
+
+    12 byte nonce | ciphertext + 16 byte tag
+
+The associated data binds every chunk to its attachment id, position and
+whether it is the last one, so chunks can't be swapped, reordered or cut
+off without decryption failing. The chunk key is derived from the vault's
+Fernet key with HKDF; file names are encrypted with the row cipher.
+
+Chunks are written and read through SQLite incremental blob I/O
+(Connection.blobopen, Python 3.11+), one chunk at a time, so attaching or
+exporting a file of any size holds at most two chunks in memory. Older
+Pythons fall back to plain INSERT/SELECT of the same rows.
+
+A secure note is an attachment of kind "note" holding UTF-8 text.
+"""
+
+import io
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import tkinter as tk
+from functools import lru_cache
+from pathlib import Path
+from tkinter import filedialog, messagebox, ttk
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+CHUNK_SIZE = 64 * 1024
+NONCE_SIZE = 12
+HAVE_BLOBOPEN = hasattr(sqlite3.Connection, "blobopen")
+
+# ----------------------------- SCHEMA -----------------------------
+
+
+def ensure_attachment_tables(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS attachments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entry_id INTEGER NOT NULL,
+                    kind TEXT NOT NULL DEFAULT 'file',
+                    name BLOB NOT NULL,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    chunks INTEGER NOT NULL DEFAULT 0,
+                    created TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attachments_entry ON attachments(entry_id, id)")
+    # rowid table on purpose: incremental blob I/O addresses rows by rowid
+    conn.execute("""CREATE TABLE IF NOT EXISTS attachment_chunks (
+                    id INTEGER PRIMARY KEY,
+                    attachment_id INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                    )""")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_attachment_chunks_seq "
+                 "ON attachment_chunks(attachment_id, seq)")
+    # deleting an entry drops its attachments, which drops their chunks
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS attachments_entry_cleanup
+                    AFTER DELETE ON vault BEGIN
+                        DELETE FROM attachments WHERE entry_id = old.id;
+                    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS attachment_chunks_cleanup
+                    AFTER DELETE ON attachments BEGIN
+                        DELETE FROM attachment_chunks WHERE attachment_id = old.id;
+                    END""")
+    conn.commit()
+
+
+# ----------------------------- CHUNKS -----------------------------
+
+
+@lru_cache(maxsize=4)
+def _chunk_aead(fernet_key):
+    return AESGCM(HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                       info=b"password-vault attachments v1").derive(fernet_key))
+
+
+def _aad(attachment_id, seq, final):
+    return struct.pack(">qq?", attachment_id, seq, final)
+
+
+def _read_full(src, size):
+    """Read exactly `size` bytes unless the stream ends first (pipes return short reads)."""
+    parts, left = [], size
+    while left:
+        part = src.read(left)
+        if not part:
+            break
+        parts.append(part)
+        left -= len(part)
+    return b"".join(parts)
+
+
+def _write_chunk(conn, attachment_id, seq, sealed):
+    if not HAVE_BLOBOPEN:
+        conn.execute("INSERT INTO attachment_chunks (attachment_id, seq, data) VALUES (?, ?, ?)",
+                     (attachment_id, seq, sealed))
+        return
+    rowid = conn.execute("INSERT INTO attachment_chunks (attachment_id, seq, data) "
+                         "VALUES (?, ?, zeroblob(?))", (attachment_id, seq, len(sealed))).lastrowid
+    with conn.blobopen("attachment_chunks", "data", rowid) as blob:
+        blob.write(sealed)
+
+
+def _read_chunk(conn, attachment_id, seq):
+    row = conn.execute("SELECT id FROM attachment_chunks WHERE attachment_id = ? AND seq = ?",
+                       (attachment_id, seq)).fetchone()
+    if row is None:
+        raise ValueError(f"attachment {attachment_id} is missing chunk {seq}")
+    if not HAVE_BLOBOPEN:
+        return conn.execute("SELECT data FROM attachment_chunks WHERE id = ?", row).fetchone()[0]
+    with conn.blobopen("attachment_chunks", "data", row[0], readonly=True) as blob:
+        return blob.read()
+
+
+# ----------------------------- ATTACHMENTS -----------------------------
+
+
+def add_attachment(conn, cipher, entry_id, src, name, kind="file", chunk_size=CHUNK_SIZE,
+                   progress=None):
+    """Stream the binary file object `src` into a new attachment and return its id.
+
+    Everything is written in one transaction, so a failed or interrupted
+    attach leaves nothing behind. progress(bytes_done) is called after
+    each chunk.
+    """
+    aead = _chunk_aead(cipher.key)
+    try:
+        aid = conn.execute("INSERT INTO attachments (entry_id, kind, name) VALUES (?, ?, ?)",
+                           (entry_id, kind, cipher.encrypt(name.encode()))).lastrowid
+        size = seq = 0
+        chunk = _read_full(src, chunk_size)
+        while True:
+            # read one chunk ahead so the last one can be marked final
+            following = _read_full(src, chunk_size) if len(chunk) == chunk_size else b""
+            final = not following
+            nonce = os.urandom(NONCE_SIZE)
+            _write_chunk(conn, aid, seq, nonce + aead.encrypt(nonce, chunk, _aad(aid, seq, final)))
+            size += len(chunk)
+            seq += 1
+            if progress:
+                progress(size)
+            if final:
+                break
+            chunk = following
+        conn.execute("UPDATE attachments SET size = ?, chunks = ? WHERE id = ?", (size, seq, aid))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return aid
+
+
+def attach_file(conn, cipher, entry_id, path, progress=None):
+    path = Path(path)
+    with open(path, "rb") as src:
+        return add_attachment(conn, cipher, entry_id, src, path.name, progress=progress)
+
+
+def iter_chunks(conn, cipher, attachment_id):
+    """Yield the plaintext of an attachment chunk by chunk.
+
+    Raises ValueError if the attachment doesn't exist or a chunk is
+    missing, and cryptography's InvalidTag if one was altered.
+    """
+    row = conn.execute("SELECT chunks FROM attachments WHERE id = ?", (attachment_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"no attachment {attachment_id}")
+    aead = _chunk_aead(cipher.key)
+    chunks = row[0]
+    for seq in range(chunks):
+        sealed = _read_chunk(conn, attachment_id, seq)
+        yield aead.decrypt(sealed[:NONCE_SIZE], sealed[NONCE_SIZE:],
+                           _aad(attachment_id, seq, seq == chunks - 1))
+
+
+def export_attachment(conn, cipher, attachment_id, dst, progress=None):
+    """Write an attachment to the binary file object `dst`; returns the bytes written."""
+    done = 0
+    for chunk in iter_chunks(conn, cipher, attachment_id):
+        dst.write(chunk)
+        done += len(chunk)
+        if progress:
+            progress(done)
+    return done
+
+
+def export_to_path(conn, cipher, attachment_id, path, progress=None):
+    """export_attachment() into a file that only appears at `path` once every chunk verified.
+
+    Writes to a temporary file next to `path` and renames it over `path`
+    at the end; on any error (InvalidTag, a missing chunk, a full disk)
+    the temporary file is removed and `path` is left as it was.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".part", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            done = export_attachment(conn, cipher, attachment_id, dst, progress)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return done
+
+
+def list_attachments(conn, cipher, entry_id):
+    """[(id, kind, name, size, created)] for an entry, oldest first."""
+    out = []
+    for aid, kind, name, size, created in conn.execute(
+            "SELECT id, kind, name, size, created FROM attachments WHERE entry_id = ? ORDER BY id",
+            (entry_id,)):
+        try:
+            name = cipher.decrypt(name).decode()
+        except Exception:
+            name = "(unreadable name)"
+        out.append((aid, kind, name, size, created))
+    return out
+
+
+def delete_attachment(conn, attachment_id):
+    conn.execute("DELETE FROM attachments WHERE id = ?", (attachment_id,))
+    conn.commit()
+
+
+def save_note(conn, cipher, entry_id, title, text):
+    return add_attachment(conn, cipher, entry_id, io.BytesIO(text.encode()), title, kind="note")
+
+
+def read_note(conn, cipher, attachment_id):
+    return b"".join(iter_chunks(conn, cipher, attachment_id)).decode()
+
+
+def in_background(root, db_path, work, on_done):
+    """Run work(conn) on a worker thread; on_done(result, error) runs on the Tk thread."""
+    result = {}
+
+    def run():
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            result["value"] = work(conn)
+        except Exception as e:
+            result["error"] = e
+        finally:
+            conn.close()
+
+    thread = threading.Thread(target=run, name="vault-attachment", daemon=True)
+    thread.start()
+
+    def poll():
+        if thread.is_alive():
+            root.after(100, poll)
+        else:
+            on_done(result.get("value"), result.get("error"))
+
+    root.after(100, poll)
+
+
+# ----------------------------- WINDOW -----------------------------
+
+
+def _human(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class AttachmentsWindow:
+    """Toplevel listing one entry's files and notes, with attach/save/delete.
+
+    Files are streamed in and out on a worker thread; the window shows
+    progress and stays usable meanwhile.
+    """
+
+    def __init__(self, parent, db_path, cipher, entry_id, title):
+        self.db_path = db_path
+        self.cipher = cipher
+        self.entry_id = entry_id
+        self.busy = False
+        self.done_bytes = 0
+
+        self.top = tk.Toplevel(parent)
+        self.top.title(f"Attachments — {title}")
+        self.top.geometry("520x340")
+
+        self.tree = ttk.Treeview(self.top, columns=("Name", "Type", "Size", "Added"),
+                                 show="headings", selectmode="browse")
+        for col, width in (("Name", 200), ("Type", 60), ("Size", 80), ("Added", 140)):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width)
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+
+        buttons = tk.Frame(self.top)
+        buttons.pack(fill="x", padx=10, pady=5)
+        ttk.Button(buttons, text="Attach File…", command=self.attach).pack(side="left")
+        ttk.Button(buttons, text="New Note…", command=self.new_note).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Open / Save As…", command=self.open_selected).pack(side="left")
+        ttk.Button(buttons, text="Delete", command=self.delete_selected).pack(side="left", padx=5)
+
+        self.status = tk.Label(self.top, text="", anchor="w")
+        self.status.pack(fill="x", padx=10, pady=(0, 8))
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = list_attachments(conn, self.cipher, self.entry_id)
+        finally:
+            conn.close()
+        for aid, kind, name, size, created in rows:
+            self.tree.insert("", "end", iid=str(aid), values=(name, kind, _human(size), created))
+
+    def _selected(self):
+        sel = self.tree.selection()
+        if not sel:
+            messagebox.showinfo("Attachments", "Select an attachment first.", parent=self.top)
+            return None
+        return int(sel[0]), self.tree.set(sel[0], "Name"), self.tree.set(sel[0], "Type")
+
+    def _run(self, label, work, done):
+        if self.busy:
+            messagebox.showinfo("Attachments", "Please wait for the current transfer.", parent=self.top)
+            return
+        self.busy = True
+        self.done_bytes = 0
+
+        def progress(n):
+            self.done_bytes = n  # read by tick() on the Tk thread
+
+        def tick():
+            if self.busy and self.top.winfo_exists():
+                self.status.configure(text=f"{label}… {_human(self.done_bytes)}")
+                self.top.after(200, tick)
+
+        def finished(result, error):
+            self.busy = False
+            if not self.top.winfo_exists():
+                return
+            if error is not None:
+                self.status.configure(text="")
+                # InvalidTag, the tamper case, has an empty message
+                reason = str(error) or type(error).__name__
+                messagebox.showerror("Attachments", f"{label} failed: {reason}", parent=self.top)
+                return
+            self.status.configure(text=f"{label} done ({_human(self.done_bytes)})")
+            done(result)
+
+        tick()
+        in_background(self.top, self.db_path, lambda conn: work(conn, progress), finished)
+
+    def attach(self):
+        path = filedialog.askopenfilename(parent=self.top, title="Attach file")
+        if not path:
+            return
+        self._run("Attaching", lambda conn, progress: attach_file(
+            conn, self.cipher, self.entry_id, path, progress), lambda aid: self.refresh())
+
+    def open_selected(self):
+        sel = self._selected()
+        if sel is None:
+            return
+        aid, name, kind = sel
+        if kind == "note":
+            conn = sqlite3.connect(self.db_path)
+            try:
+                text = read_note(conn, self.cipher, aid)
+            except Exception as e:
+                messagebox.showerror("Attachments", f"Cannot read note: {e}", parent=self.top)
+                return
+            finally:
+                conn.close()
+            self._note_window(name, text, readonly=True)
+            return
+        path = filedialog.asksaveasfilename(parent=self.top, initialfile=name, title="Save attachment")
+        if not path:
+            return
+
+        def work(conn, progress):
+            return export_to_path(conn, self.cipher, aid, path, progress)
+
+        self._run("Saving", work, lambda n: None)
+
+    def delete_selected(self):
+        sel = self._selected()
+        if sel is None or not messagebox.askyesno("Delete", f"Delete {sel[1]}?", parent=self.top):
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            delete_attachment(conn, sel[0])
+        finally:
+            conn.close()
+        self.refresh()
+
+    def new_note(self):
+        self._note_window("", "", readonly=False)
+
+    def _note_window(self, title, text, readonly):
+        win = tk.Toplevel(self.top)
+        win.title(title or "New note")
+        win.geometry("420x320")
+        title_entry = ttk.Entry(win)
+        title_entry.insert(0, title)
+        title_entry.pack(fill="x", padx=10, pady=(10, 5))
+        body = tk.Text(win, wrap="word", height=12)
+        body.insert("1.0", text)
+        body.pack(fill="both", expand=True, padx=10, pady=5)
+        if readonly:
+            title_entry.configure(state="readonly")
+            body.configure(state="disabled")
+            return
+
+        def save():
+            name = title_entry.get().strip()
+            if not name:
+                messagebox.showerror("Note", "Give the note a title.", parent=win)
+                return
+            conn = sqlite3.connect(self.db_path)
+            try:
+                save_note(conn, self.cipher, self.entry_id, name, body.get("1.0", "end-1c"))
+            finally:
+                conn.close()
+            win.destroy()
+            self.refresh()
+
+        ttk.Button(win, text="Save", command=save).pack(pady=(0, 10))
@@ -0,0 +1,197 @@
+"""
+Autocomplete for the Service/Website and Username fields.
+
+Suggestions come from services and usernames already in the vault plus a
+short bundled list of common domains. They are kept in a sorted array and
+looked up with bisect, so a keystroke costs O(log n + shown) and nothing
+is read from the database until the user first types into a field. That
+first keystroke starts the read on a worker thread; until it is done the
+field simply shows no suggestions.
+"""
+
+import sqlite3
+import threading
+import tkinter as tk
+from bisect import bisect_left, insort
+
+from vault_query import service_column
+
+COMMON_DOMAINS = (
+    "adobe.com", "airbnb.com", "amazon.com", "apple.com", "atlassian.com", "bitbucket.org",
+    "booking.com", "canva.com", "cloudflare.com", "coursera.org", "digitalocean.com",
+    "discord.com", "docker.com", "dropbox.com", "ebay.com", "facebook.com", "figma.com",
+    "flipkart.com", "github.com", "gitlab.com", "gmail.com", "godaddy.com", "google.com",
+    "heroku.com", "hotstar.com", "icloud.com", "instagram.com", "irctc.co.in", "jira.com",
+    "kaggle.com", "leetcode.com", "linkedin.com", "mailchimp.com", "medium.com",
+    "microsoft.com", "myntra.com", "netflix.com", "notion.so", "npmjs.com", "office.com",
+    "outlook.com", "paypal.com", "paytm.com", "pinterest.com", "primevideo.com", "pypi.org",
+    "quora.com", "reddit.com", "salesforce.com", "shopify.com", "skype.com", "slack.com",
+    "snapchat.com", "spotify.com", "stackoverflow.com", "steampowered.com", "stripe.com",
+    "swiggy.com", "telegram.org", "trello.com", "twitch.tv", "twitter.com", "udemy.com",
+    "whatsapp.com", "wikipedia.org", "wordpress.com", "x.com", "yahoo.com", "youtube.com",
+    "zomato.com", "zoom.us",
+)
+
+
+class PrefixIndex:
+    """Sorted, de-duplicated (lowercase key, display text) pairs searched with bisect.
+
+    The pairs are built from loader() on a worker thread; complete()
+    returns nothing until they are ready, and add() calls made meanwhile
+    are merged in when they are.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.items = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure(self):
+        if self.items is None and self._thread is None:
+            self._thread = threading.Thread(target=self._load, name="vault-autocomplete", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        try:
+            seen = {}
+            for text in self.loader():
+                if text:
+                    seen.setdefault(text.lower(), text)
+        except sqlite3.Error:
+            self._thread = None  # try again on the next keystroke
+            return
+        with self._lock:
+            for text in self._pending:
+                seen.setdefault(text.lower(), text)
+            self._pending = []
+            self.items = sorted(seen.items())
+
+    def add(self, text):
+        with self._lock:
+            if self.items is None:
+                self._pending.append(text)
+                return
+        key = text.lower()
+        i = bisect_left(self.items, (key,))
+        if i == len(self.items) or self.items[i][0] != key:
+            insort(self.items, (key, text))
+
+    def complete(self, prefix, limit=8):
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        self._ensure()
+        items = self.items
+        if items is None:
+            return []
+        out = []
+        i = bisect_left(items, (prefix,))
+        while i < len(items) and len(out) < limit:
+            key, text = items[i]
+            if not key.startswith(prefix):
+                break
+            if key != prefix:
+                out.append(text)
+            i += 1
+        return out
+
+
+def service_index(db_path, with_domains=True):
+    def load():
+        conn = sqlite3.connect(db_path)
+        try:
+            name = service_column(conn)
+            values = [r[0] for r in conn.execute(f"SELECT DISTINCT {name} FROM vault")]
+        finally:
+            conn.close()
+        return values + list(COMMON_DOMAINS) if with_domains else values
+    return PrefixIndex(load)
+
+
+def username_index(db_path):
+    def load():
+        conn = sqlite3.connect(db_path)
+        try:
+            return [r[0] for r in conn.execute("SELECT DISTINCT username FROM vault")]
+        finally:
+            conn.close()
+    return PrefixIndex(load)
+
+
+# ----------------------------- WIDGET -----------------------------
+
+
+class Autocomplete:
+    """Attaches a suggestion dropdown to an existing tk/ttk Entry.
+
+    Up/Down move through suggestions, Return or Tab accepts, Escape closes.
+    """
+
+    def __init__(self, entry, index, limit=8):
+        self.entry = entry
+        self.index = index
+        self.limit = limit
+        self.popup = None
+        self.listbox = None
+        entry.bind("<KeyRelease>", self._on_key, add="+")
+        entry.bind("<Down>", self._move(1), add="+")
+        entry.bind("<Up>", self._move(-1), add="+")
+        entry.bind("<Return>", self._accept, add="+")
+        entry.bind("<Tab>", self._accept, add="+")
+        entry.bind("<Escape>", lambda e: self.close(), add="+")
+        entry.bind("<FocusOut>", lambda e: entry.after(150, self.close), add="+")
+
+    def _on_key(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Tab", "Escape"):
+            return
+        matches = self.index.complete(self.entry.get(), self.limit)
+        if matches:
+            self._show(matches)
+        else:
+            self.close()
+
+    def _show(self, matches):
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.entry)
+            self.popup.wm_overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, activestyle="dotbox", exportselection=False)
+            self.listbox.pack(fill="both", expand=True)
+            self.listbox.bind("<ButtonRelease-1>", self._accept)
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f"{self.entry.winfo_width()}x{min(len(matches), self.limit) * 20 + 4}+{x}+{y}")
+        self.listbox.delete(0, tk.END)
+        for m in matches:
+            self.listbox.insert(tk.END, m)
+
+    def _move(self, step):
+        def handler(event):
+            if self.listbox is None:
+                return None
+            cur = self.listbox.curselection()
+            i = (cur[0] + step) if cur else (0 if step > 0 else self.listbox.size() - 1)
+            i = max(0, min(i, self.listbox.size() - 1))
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(i)
+            self.listbox.see(i)
+            return "break"
+        return handler
+
+    def _accept(self, event=None):
+        if self.listbox is None:
+            return None
+        cur = self.listbox.curselection()
+        if not cur:
+            self.close()
+            return None
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, self.listbox.get(cur[0]))
+        self.close()
+        return "break"
+
+    def close(self):
+        if self.popup is not None:
+            self.popup.destroy()
+            self.popup = self.listbox = None
@@ -0,0 +1,278 @@
+"""
+Command line access to the password vault.
+
+    python vault_cli.py list [--sort service] [--desc] [--page-size 50] [--search git] [--show]
+    python vault_cli.py export out.csv [--workers 4] [--processes]
+    python vault_cli.py verify [--full] [--accept]
+    python vault_cli.py maintain [--step-pages 64] [--convert]
+    python vault_cli.py attach 42 id_ed25519            (- reads stdin)
+    python vault_cli.py attachments 42
+    python vault_cli.py extract 7 out.pem               (- writes stdout)
+    python vault_cli.py history 42 [--show]
+
+Listing walks the table with the same keyset pages the UIs use, so it
+starts printing immediately and memory stays flat for large vaults.
+Export decrypts in parallel with decrypt_batch() and streams rows to CSV.
+Attachments are streamed chunk by chunk in both directions.
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from vault_query import PAGE_SIZE, iter_pages
+
+HOME_PATH = Path.home() / "password_vault"
+DB_PATH = HOME_PATH / "vault.db"
+KEY_PATH = HOME_PATH / "vault.key"
+
+
+def load_cipher(key_path):
+    # imported here so listing without --show works without cryptography
+    from vault_crypto import VaultCipher
+    return VaultCipher(Path(key_path).read_bytes())
+
+
+def page_size(text):
+    n = int(text)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"page size must be at least 1, got {n}")
+    return n
+
+
+# ----------------------------- COMMANDS -----------------------------
+
+
+def cmd_list(args):
+    cipher = load_cipher(args.key) if args.show else None
+    conn = sqlite3.connect(args.db)
+    try:
+        for page in iter_pages(conn, args.sort, args.desc, args.page_size, args.search):
+            for rid, service, username, token in page:
+                if cipher:
+                    try:
+                        pw = cipher.decrypt(token).decode()
+                    except Exception:
+                        pw = "Invalid"
+                else:
+                    pw = "••••••••"
+                print(f"{rid}\t{service}\t{username}\t{pw}")
+    finally:
+        conn.close()
+    return 0
+
+
+def cmd_export(args):
+    from vault_crypto import decrypt_batch
+
+    cipher = load_cipher(args.key)
+    conn = sqlite3.connect(args.db)
+    meta = {}
+
+    def tokens():
+        for page in iter_pages(conn, page_size=1000):
+            for rid, service, username, token in page:
+                meta[rid] = (service, username)
+                yield rid, token
+
+    failed = 0
+    try:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["service", "username", "password"])
+            for rid, pw in decrypt_batch(cipher, tokens(), args.workers, processes=args.processes):
+                service, username = meta.pop(rid)
+                if pw is None:
+                    failed += 1
+                    continue
+                writer.writerow([service, username, pw.decode()])
+    finally:
+        conn.close()
+    if failed:
+        print(f"{failed} entries could not be decrypted and were skipped", file=sys.stderr)
+    return 0
+
+
+def cmd_verify(args):
+    from vault_integrity import describe, ensure_integrity_tables, seal_rows, verify
+
+    cipher = load_cipher(args.key)
+    conn = sqlite3.connect(args.db)
+    try:
+        ensure_integrity_tables(conn)
+        report = verify(conn, cipher, args.full)
+        print(f"checked {report['buckets_checked']} buckets, {report['rows_checked']} rows")
+        msg = describe(report)
+        if not msg:
+            print("OK")
+            return 0
+        print(msg)
+        for rid, kind in report["problems"]:
+            print(f"{rid}\t{kind}")
+        if args.accept:
+            seal_rows(conn, cipher, [rid for rid, kind in report["problems"] if kind != "deleted"])
+            conn.executemany("DELETE FROM integrity_rows WHERE entry_id = ?",
+                             [(rid,) for rid, kind in report["problems"] if kind == "deleted"])
+            conn.commit()
+            verify(conn, cipher)
+            print("current contents accepted")
+            return 0
+        return 1
+    finally:
+        conn.close()
+
+
+def cmd_maintain(args):
+    from vault_maintenance import enable_incremental_vacuum, run_step
+
+    if args.convert and enable_incremental_vacuum(args.db):
+        print("switched to incremental auto-vacuum", file=sys.stderr)
+    first = None
+    while True:
+        report = run_step(args.db, args.step_pages)
+        first = first or report["before"]
+        if not report["more"] or report["after"]["free_pages"] >= report["before"]["free_pages"]:
+            break
+    print(json.dumps({"before": first, "after": report["after"]}, indent=2))
+    if not report["incremental"] and report["after"]["free_pages"]:
+        print("free pages are only given back after a one-time `maintain --convert` (full VACUUM)",
+              file=sys.stderr)
+    return 0
+
+
+def cmd_attach(args):
+    from vault_attachments import add_attachment, ensure_attachment_tables
+
+    cipher = load_cipher(args.key)
+    conn = sqlite3.connect(args.db)
+    try:
+        if conn.execute("SELECT 1 FROM vault WHERE id = ?", (args.entry,)).fetchone() is None:
+            print(f"no entry {args.entry}", file=sys.stderr)
+            return 1
+        ensure_attachment_tables(conn)
+        if args.file == "-":
+            aid = add_attachment(conn, cipher, args.entry, sys.stdin.buffer, args.name or "stdin")
+        else:
+            with open(args.file, "rb") as src:
+                aid = add_attachment(conn, cipher, args.entry, src, args.name or Path(args.file).name)
+    finally:
+        conn.close()
+    print(aid)
+    return 0
+
+
+def cmd_attachments(args):
+    from vault_attachments import ensure_attachment_tables, list_attachments
+
+    cipher = load_cipher(args.key)
+    conn = sqlite3.connect(args.db)
+    try:
+        ensure_attachment_tables(conn)
+        for aid, kind, name, size, created in list_attachments(conn, cipher, args.entry):
+            print(f"{aid}\t{kind}\t{size}\t{created}\t{name}")
+    finally:
+        conn.close()
+    return 0
+
+
+def cmd_extract(args):
+    from cryptography.exceptions import InvalidTag
+
+    from vault_attachments import export_attachment, export_to_path
+
+    cipher = load_cipher(args.key)
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.out == "-":
+            # stdout can't be taken back, so chunks before a bad one have already gone out
+            export_attachment(conn, cipher, args.id, sys.stdout.buffer)
+        else:
+            export_to_path(conn, cipher, args.id, args.out)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except InvalidTag:
+        print(f"attachment {args.id} failed verification: it was altered or is corrupt", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+def cmd_history(args):
+    from vault_history import ensure_history_table, format_time, load_history
+
+    cipher = load_cipher(args.key)
+    conn = sqlite3.connect(args.db)
+    try:
+        ensure_history_table(conn)
+        for changed_at, pw in load_history(conn, cipher, args.entry):
+            print(f"{format_time(changed_at)}\t{pw if args.show else '••••••••'}")
+    finally:
+        conn.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Password vault command line tools")
+    parser.add_argument("--db", default=str(DB_PATH), help="path to vault.db")
+    parser.add_argument("--key", default=str(KEY_PATH), help="path to the Fernet key file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="list entries a page at a time")
+    p.add_argument("--sort", default="id", choices=["id", "service", "username"])
+    p.add_argument("--desc", action="store_true", help="sort descending")
+    p.add_argument("--page-size", type=page_size, default=PAGE_SIZE)
+    p.add_argument("--search", default="", help="substring filter on service/username")
+    p.add_argument("--show", action="store_true", help="decrypt and print passwords")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("export", help="decrypt every entry into a CSV file")
+    p.add_argument("out", help="CSV file to write")
+    p.add_argument("--workers", type=int, default=None, help="decryption workers (default: CPU count)")
+    p.add_argument("--processes", action="store_true", help="use processes instead of threads")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("verify", help="check vault.db for tampering or corruption")
+    p.add_argument("--full", action="store_true", help="rehash every bucket, not just changed ones")
+    p.add_argument("--accept", action="store_true", help="re-seal flagged rows as they are now")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("maintain", help="vacuum free pages, optimize and checkpoint now")
+    p.add_argument("--step-pages", type=int, default=64)
+    p.add_argument("--convert", action="store_true",
+                   help="first switch to incremental auto-vacuum (one full VACUUM, locks the vault while it runs)")
+    p.set_defaults(func=cmd_maintain)
+
+    p = sub.add_parser("attach", help="attach a file to an entry")
+    p.add_argument("entry", type=int, help="entry id")
+    p.add_argument("file", help="file to attach, - for stdin")
+    p.add_argument("--name", help="name to store (default: the file name)")
+    p.set_defaults(func=cmd_attach)
+
+    p = sub.add_parser("attachments", help="list an entry's attachments and notes")
+    p.add_argument("entry", type=int, help="entry id")
+    p.set_defaults(func=cmd_attachments)
+
+    p = sub.add_parser("extract", help="decrypt an attachment to a file")
+    p.add_argument("id", type=int, help="attachment id")
+    p.add_argument("out", help="file to write, - for stdout")
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser("history", help="list an entry's earlier passwords, newest first")
+    p.add_argument("entry", type=int, help="entry id")
+    p.add_argument("--show", action="store_true", help="print the passwords")
+    p.set_defaults(func=cmd_history)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Compact AEAD storage format for vault passwords.
+
+Fernet tokens are base64 text carrying a version byte, timestamp, IV and
+HMAC, which makes a 12 character password take ~100 bytes and costs an
+HMAC plus a base64 decode on every read. Rows written by VaultCipher are
+raw bytes instead:
+
+    1 byte format version | 12 byte nonce | ciphertext + 16 byte tag
+
+    0x03  AES-256-GCM
+    0x04  ChaCha20-Poly1305
+    0x01, 0x02  the same, from before each algorithm had a key of its own;
+                read only, and rewritten by migrate_rows()
+
+Fernet tokens always start with "g" (base64 of their 0x80 version byte),
+so decrypt() tells the formats apart by the first byte and old rows keep
+working. Each AEAD key is derived from the existing Fernet key with HKDF
+under its own `info`, so no new key file is needed and no key is shared
+between algorithms.
+
+VaultCipher has the same encrypt(bytes)/decrypt(bytes) shape as Fernet
+and can be dropped in wherever a Fernet instance was used.
+
+decrypt_batch() fans bulk decryption (export, re-encryption) out over a
+thread or process pool while still yielding results in input order.
+"""
+
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+log = logging.getLogger(__name__)
+
+FERNET = "fernet"
+AESGCM_V1 = 0x01  # legacy: one key shared by both algorithms
+CHACHA_V1 = 0x02
+AESGCM_V2 = 0x03
+CHACHA_V2 = 0x04
+FORMATS = {"aesgcm": AESGCM_V2, "chacha20": CHACHA_V2}
+
+NONCE_SIZE = 12
+
+
+def _derive(fernet_key, info):
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=info).derive(fernet_key)
+
+
+class VaultCipher:
+    def __init__(self, fernet_key, write_format="aesgcm"):
+        self.key = fernet_key
+        self.fernet = Fernet(fernet_key)
+        legacy = _derive(fernet_key, b"password-vault row cipher v1")
+        self.aeads = {
+            AESGCM_V1: AESGCM(legacy),
+            CHACHA_V1: ChaCha20Poly1305(legacy),
+            AESGCM_V2: AESGCM(_derive(fernet_key, b"password-vault row cipher v2 aesgcm")),
+            CHACHA_V2: ChaCha20Poly1305(_derive(fernet_key, b"password-vault row cipher v2 chacha20")),
+        }
+        self.write_format = write_format
+        self.version = FORMATS.get(write_format)
+
+    def encrypt(self, data):
+        if self.version is None:
+            return self.fernet.encrypt(data)
+        nonce = os.urandom(NONCE_SIZE)
+        return bytes([self.version]) + nonce + self.aeads[self.version].encrypt(nonce, data, None)
+
+    def decrypt(self, token):
+        token = token.encode() if isinstance(token, str) else bytes(token)
+        aead = self.aeads.get(token[0]) if token else None
+        if aead is None:
+            return self.fernet.decrypt(token)
+        return aead.decrypt(token[1:1 + NONCE_SIZE], token[1 + NONCE_SIZE:], None)
+
+    def is_current(self, token):
+        """True if the token is already in the format this cipher writes."""
+        if self.version is None:
+            return not token or token[0] not in self.aeads
+        return bool(token) and token[0] == self.version
+
+
+# ----------------------------- BATCH DECRYPTION -----------------------------
+
+_worker_cipher = None
+
+
+def _init_worker(key, write_format):
+    global _worker_cipher
+    _worker_cipher = VaultCipher(key, write_format)
+
+
+def _decrypt_chunk(cipher, chunk):
+    out = []
+    for rid, token in chunk:
+        try:
+            out.append((rid, cipher.decrypt(token)))
+        except Exception:
+            out.append((rid, None))
+    return out
+
+
+def _decrypt_chunk_in_worker(chunk):
+    return _decrypt_chunk(_worker_cipher, chunk)
+
+
+def decrypt_batch(cipher, items, workers=None, chunk_size=512, max_in_flight=None, processes=False):
+    """Decrypt an iterable of (id, token), yielding (id, plaintext bytes) in input order.
+
+    Rows that fail to decrypt come back as (id, None). At most
+    `max_in_flight` chunks (default 2 per worker) are queued at once, so
+    memory stays bounded however long `items` is. With processes=True each
+    worker builds its own cipher from the key, which sidesteps the GIL for
+    the pure-Python parts of Fernet.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    it = iter(items)
+    if processes:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                   initargs=(cipher.key, cipher.write_format))
+        submit = lambda c: pool.submit(_decrypt_chunk_in_worker, c)
+    else:
+        pool = ThreadPoolExecutor(workers)
+        submit = lambda c: pool.submit(_decrypt_chunk, cipher, c)
+
+    with pool:
+        pending = deque()
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = list(itertools.islice(it, chunk_size))
+                if not chunk:
+                    break
+                pending.append(submit(chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+# ----------------------------- MIGRATION -----------------------------
+
+
+def migrate_rows(conn, cipher, batch=500):
+    """Re-encrypt rows not yet in cipher's format, one short transaction per batch.
+
+    Yields the number of rows converted after each batch so a caller can
+    report progress or stop early.
+    """
+    from vault_integrity import seal_rows
+
+    sealed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'integrity_rows'").fetchone()
+    last = 0
+    while True:
+        rows = conn.execute("SELECT id, password FROM vault WHERE id > ? ORDER BY id LIMIT ?",
+                            (last, batch)).fetchall()
+        if not rows:
+            return
+        last = rows[-1][0]
+        updates = []
+        for rid, token in rows:
+            if cipher.is_current(token):
+                continue
+            try:
+                updates.append((cipher.encrypt(cipher.decrypt(token)), rid, token))
+            except Exception:
+                continue  # leave unreadable rows untouched
+        changed = []
+        for update in updates:
+            # skip rows the UI rewrote since we read them
+            if conn.execute("UPDATE vault SET password = ? WHERE id = ? AND password = ?",
+                            update).rowcount:
+                changed.append(update[1])
+        if changed and sealed:
+            seal_rows(conn, cipher, changed)
+        if updates:
+            conn.commit()
+        yield len(changed)
+
+
+def start_background_migration(db_path, cipher, batch=500, on_error=None):
+    """Convert old rows on a daemon thread with its own connection.
+
+    A failure is logged and left on the returned thread as `error`; when
+    given, on_error(exception) is also called, from the worker thread.
+    Rows converted before the failure stay converted and the rest are
+    picked up on the next start.
+    """
+    def run():
+        try:
+            conn = sqlite3.connect(db_path, timeout=30)
+            try:
+                for _ in migrate_rows(conn, cipher, batch):
+                    pass
+            finally:
+                conn.close()
+        except Exception as e:
+            thread.error = e
+            log.exception("vault migration of %s stopped", db_path)
+            if on_error is not None:
+                on_error(e)
+
+    thread = threading.Thread(target=run, name="vault-migrate", daemon=True)
+    thread.error = None
+    thread.start()
+    return thread
@@ -0,0 +1,254 @@
+"""
+Folders for vault entries, shown as a lazily filled Treeview.
+
+Folders form a tree (`folders.parent_id`) and each entry sits in at most
+one folder (`vault_folder`). Opening the vault only reads the top-level
+folders; the subfolders and entries of a folder are read when its node
+is expanded (<<TreeviewOpen>>), so the initial cost is O(folders) rather
+than O(entries). Entries without a folder live under "Unfiled".
+
+A folder's entries come in keyset pages, fetched and decoded on a worker
+thread and inserted a batch per after() tick, like AsyncPageLoader; a
+"Load more…" row at the end of a folder fetches its next page when
+selected. Opening even a huge "Unfiled" costs one page.
+"""
+
+import sqlite3
+import threading
+
+from vault_metrics import timer
+from vault_query import PAGE_SIZE, service_column
+
+UNFILED = "Unfiled"
+
+# ----------------------------- SCHEMA -----------------------------
+
+
+def ensure_folder_tables(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS folders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    parent_id INTEGER,
+                    name TEXT NOT NULL
+                    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_folders_parent "
+                 "ON folders(parent_id, name COLLATE NOCASE)")
+    conn.execute("""CREATE TABLE IF NOT EXISTS vault_folder (
+                    entry_id INTEGER PRIMARY KEY,
+                    folder_id INTEGER NOT NULL
+                    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_vault_folder_folder "
+                 "ON vault_folder(folder_id, entry_id)")
+    # deleting an entry anywhere also drops its folder link
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS vault_folder_cleanup
+                    AFTER DELETE ON vault BEGIN
+                        DELETE FROM vault_folder WHERE entry_id = old.id;
+                    END""")
+    conn.commit()
+
+
+# ----------------------------- FOLDER ACTIONS -----------------------------
+
+
+def folder_for_path(conn, path):
+    """Return the id of folder "A/B/C", creating missing levels. Empty path -> None."""
+    parent = None
+    for name in [p.strip() for p in path.split("/") if p.strip()]:
+        row = conn.execute("SELECT id FROM folders WHERE parent_id IS ? AND name = ? COLLATE NOCASE",
+                           (parent, name)).fetchone()
+        if row:
+            parent = row[0]
+        else:
+            parent = conn.execute("INSERT INTO folders (parent_id, name) VALUES (?, ?)",
+                                  (parent, name)).lastrowid
+    return parent
+
+
+def all_folder_paths(conn):
+    rows = conn.execute("SELECT id, parent_id, name FROM folders").fetchall()
+    by_id = {fid: (parent, name) for fid, parent, name in rows}
+
+    def path(fid):
+        parts = []
+        while fid is not None:
+            fid, name = by_id[fid]
+            parts.append(name)
+        return "/".join(reversed(parts))
+
+    return sorted((path(fid) for fid in by_id), key=str.lower)
+
+
+def move_entry(conn, entry_id, folder_id):
+    if folder_id is None:
+        conn.execute("DELETE FROM vault_folder WHERE entry_id = ?", (entry_id,))
+    else:
+        conn.execute("INSERT OR REPLACE INTO vault_folder (entry_id, folder_id) VALUES (?, ?)",
+                     (entry_id, folder_id))
+
+
+def child_folders(conn, parent_id):
+    return conn.execute("SELECT id, name FROM folders WHERE parent_id IS ? "
+                        "ORDER BY name COLLATE NOCASE", (parent_id,)).fetchall()
+
+
+def fetch_folder_page(conn, folder_id, after=None, page_size=PAGE_SIZE):
+    """Return (rows, cursor) for one page of the entries directly inside a folder; None = unfiled.
+
+    Rows are (id, service, username, password) sorted by service, as with
+    fetch_page(): pass the cursor back for the next page; it is None once
+    there are no more rows.
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    name = service_column(conn)
+    key = f"v.{name} COLLATE NOCASE"
+    if folder_id is None:
+        sql = (f"SELECT v.id, v.{name}, v.username, v.password FROM vault v "
+               f"LEFT JOIN vault_folder f ON f.entry_id = v.id WHERE f.entry_id IS NULL")
+        params = []
+    else:
+        sql = (f"SELECT v.id, v.{name}, v.username, v.password FROM vault_folder f "
+               f"JOIN vault v ON v.id = f.entry_id WHERE f.folder_id = ?")
+        params = [folder_id]
+    if after is not None:
+        sql += f" AND {key} >= ? AND ({key} > ? OR v.id > ?)"
+        params += [after[0], after[0], after[1]]
+    sql += f" ORDER BY {key}, v.id LIMIT ?"
+    params.append(page_size)
+    rows = conn.execute(sql, params).fetchall()
+    if len(rows) < page_size:
+        return rows, None
+    return rows, (rows[-1][1], rows[-1][0])
+
+
+# ----------------------------- LAZY TREEVIEW -----------------------------
+
+
+class FolderTree:
+    """Fills a Treeview one folder at a time as nodes are opened.
+
+    Folder nodes get a placeholder child so Tk draws the expand arrow;
+    the placeholder is swapped for the real children once they are
+    loaded. Rows go through `decode(row)` on the worker thread and are
+    then inserted by `insert_rows(rows, parent)`, so each UI keeps its own
+    column formatting; entries keep their vault id as iid.
+    """
+
+    def __init__(self, tree, db_path, insert_rows, decode=None, page_size=PAGE_SIZE, batch=50):
+        self.tree = tree
+        self.db_path = db_path
+        self.insert_rows = insert_rows
+        self.decode = decode
+        self.page_size = page_size
+        self.batch = batch
+        self.generation = 0  # bumped by load_roots() so pages for an old tree are dropped
+        self.cursors = {}  # folder iid -> cursor of its next page
+        self.loading = set()
+        tree.bind("<<TreeviewOpen>>", self._on_open, add="+")
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    def load_roots(self):
+        self.generation += 1
+        self.cursors.clear()
+        self.loading.clear()
+        self.tree.delete(*self.tree.get_children())
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for fid, name in child_folders(conn, None):
+                self._add_folder("", fid, name)
+        finally:
+            conn.close()
+        self._add_folder("", None, UNFILED)
+
+    def _add_folder(self, parent, fid, name):
+        iid = f"folder:{fid if fid is not None else 'unfiled'}"
+        self.tree.insert(parent, "end", iid=iid, text=name, open=False)
+        self.tree.insert(iid, "end", iid=iid + ":pending", text="Loading…")
+
+    @staticmethod
+    def _folder_id(iid):
+        key = iid.split(":")[1]
+        return None if key == "unfiled" else int(key)
+
+    def _on_open(self, event=None):
+        iid = self.tree.focus()
+        if not iid.startswith("folder:") or not self.tree.exists(iid + ":pending"):
+            return
+        self._load(iid, None, subfolders=True)
+
+    def _on_select(self, event=None):
+        sel = self.tree.selection()
+        if sel and sel[0].endswith(":more"):
+            iid = sel[0][:-len(":more")]
+            self.tree.item(sel[0], text="Loading…")
+            self._load(iid, self.cursors.pop(iid, None), subfolders=False)
+
+    def _load(self, iid, cursor, subfolders):
+        """Fetch and decode one page of folder `iid` off the Tk thread, then show it."""
+        if iid in self.loading:
+            return
+        self.loading.add(iid)
+        gen = self.generation
+        fid = self._folder_id(iid)
+        result = {}
+
+        def work():
+            conn = sqlite3.connect(self.db_path)
+            try:
+                with timer("open_folder", "db"):
+                    subs = child_folders(conn, fid) if subfolders and fid is not None else []
+                    rows, next_cursor = fetch_folder_page(conn, fid, cursor, self.page_size)
+            except sqlite3.Error as e:
+                result["error"] = e
+                return
+            finally:
+                conn.close()
+            if self.decode is not None:
+                with timer("decode_page", "crypto"):
+                    rows = [self.decode(row) for row in rows]
+            result.update(subs=subs, rows=rows, cursor=next_cursor)
+
+        thread = threading.Thread(target=work, name="vault-folder", daemon=True)
+        thread.start()
+
+        def poll():
+            if gen != self.generation or not self.tree.exists(iid):
+                return
+            if thread.is_alive():
+                self.tree.after(5, poll)
+                return
+            placeholder = iid + (":pending" if subfolders else ":more")
+            if "error" in result:
+                # leave the placeholder so opening or selecting it again retries
+                self.loading.discard(iid)
+                if self.tree.exists(placeholder):
+                    self.tree.item(placeholder, text=f"Couldn't load: {result['error']}")
+                if not subfolders:
+                    self.cursors[iid] = cursor
+                return
+            if self.tree.exists(placeholder):
+                self.tree.delete(placeholder)
+            with timer("open_folder", "widget"):
+                for sub_id, name in result["subs"]:
+                    self._add_folder(iid, sub_id, name)
+            self._insert_batches(gen, iid, result["rows"], 0, result["cursor"])
+
+        self.tree.after(5, poll)
+
+    def _insert_batches(self, gen, iid, rows, start, cursor):
+        if gen != self.generation or not self.tree.exists(iid):
+            return
+        chunk = rows[start:start + self.batch]
+        if chunk:
+            with timer("insert_rows", "widget"):
+                self.insert_rows(chunk, iid)
+        if start + self.batch < len(rows):
+            self.tree.after(1, self._insert_batches, gen, iid, rows, start + self.batch, cursor)
+            return
+        self.loading.discard(iid)
+        if cursor is not None:
+            self.cursors[iid] = cursor
+            self.tree.insert(iid, "end", iid=iid + ":more", text="Load more…")
+
+    @staticmethod
+    def is_folder(iid):
+        return iid.startswith("folder:")
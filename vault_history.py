@@ -0,0 +1,71 @@
+"""
+Password history for vault entries.
+
+Each entry with history has exactly one row in `password_history`, keyed
+by entry id. All of its old passwords sit together in one blob:
+
+    cipher.encrypt(zlib.compress(json [[changed_at, password], ...]))
+
+newest first. Old versions of the same password tend to share most of
+their text, so compressing them together costs far less than one
+encrypted row per version, and the vault table and the list queries
+never see the history at all.
+
+Retention is applied whenever an entry's history is written: at most
+KEEP_VERSIONS versions, none older than KEEP_DAYS days.
+"""
+
+import json
+import time
+import zlib
+
+KEEP_VERSIONS = 10
+KEEP_DAYS = 365
+
+# ----------------------------- SCHEMA -----------------------------
+
+
+def ensure_history_table(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS password_history (
+                    entry_id INTEGER PRIMARY KEY,
+                    versions INTEGER NOT NULL,
+                    changed INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                    )""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS password_history_cleanup
+                    AFTER DELETE ON vault BEGIN
+                        DELETE FROM password_history WHERE entry_id = old.id;
+                    END""")
+    conn.commit()
+
+
+# ----------------------------- HISTORY -----------------------------
+
+
+def _retain(versions, keep, max_days, now):
+    cutoff = now - max_days * 86400
+    return [v for v in versions if v[0] >= cutoff][:keep]
+
+
+def load_history(conn, cipher, entry_id, max_days=KEEP_DAYS, now=None):
+    """[(changed_at, password)] for an entry, newest first; changed_at is a Unix time."""
+    row = conn.execute("SELECT data FROM password_history WHERE entry_id = ?", (entry_id,)).fetchone()
+    if row is None:
+        return []
+    versions = json.loads(zlib.decompress(cipher.decrypt(row[0])))
+    return [tuple(v) for v in _retain(versions, len(versions), max_days, now or time.time())]
+
+
+def record_change(conn, cipher, entry_id, old_password, keep=KEEP_VERSIONS, max_days=KEEP_DAYS,
+                  now=None):
+    """Add the password an entry is about to lose to its history. Caller commits."""
+    now = int(now or time.time())
+    versions = [[now, old_password]] + [list(v) for v in load_history(conn, cipher, entry_id, max_days, now)]
+    versions = _retain(versions, keep, max_days, now)
+    data = cipher.encrypt(zlib.compress(json.dumps(versions, separators=(",", ":")).encode(), 9))
+    conn.execute("INSERT OR REPLACE INTO password_history (entry_id, versions, changed, data) "
+                 "VALUES (?, ?, ?, ?)", (entry_id, len(versions), now, data))
+
+
+def format_time(changed_at):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(changed_at))
@@ -0,0 +1,242 @@
+"""
+Incremental integrity checks for vault.db.
+
+Every entry the apps write gets an HMAC over (id, service, username,
+password) in `integrity_rows`. Rows are grouped into BUCKETS buckets by
+id; each bucket keeps an HMAC over its row MACs and the root HMAC over
+all bucket digests is kept in `integrity_meta`, Merkle-style.
+
+Triggers on the vault table flag a bucket as dirty whenever a row in it
+is inserted, updated or deleted, so a normal verify() only rehashes the
+dirty buckets plus the 256 bucket digests for the root: the cost follows
+the number of changes, not the vault size. verify(full=True) rehashes
+every bucket, which also catches corruption that bypassed SQLite (a
+damaged file, or someone dropping the triggers).
+
+On a vault that has never been sealed, the first verify adopts the rows
+it finds (trust on first use) instead of reporting them.
+"""
+
+import hashlib
+import hmac
+import sqlite3
+import struct
+import threading
+from functools import lru_cache
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from vault_query import service_column
+
+BUCKETS = 256
+COMMIT_EVERY = 16  # buckets per verify() transaction
+
+# ----------------------------- SCHEMA -----------------------------
+
+
+def ensure_integrity_tables(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS integrity_rows (
+                    entry_id INTEGER PRIMARY KEY,
+                    mac BLOB NOT NULL
+                    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS integrity_buckets (
+                    bucket INTEGER PRIMARY KEY,
+                    digest BLOB,
+                    dirty INTEGER NOT NULL DEFAULT 1
+                    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS integrity_meta (
+                    key TEXT PRIMARY KEY,
+                    value BLOB
+                    )""")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_vault_bucket ON vault(id % {BUCKETS}, id)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_integrity_rows_bucket "
+                 f"ON integrity_rows(entry_id % {BUCKETS}, entry_id)")
+    mark = ("INSERT INTO integrity_buckets (bucket, dirty) VALUES ({0}.id % " + str(BUCKETS) + ", 1) "
+            "ON CONFLICT(bucket) DO UPDATE SET dirty = 1;")
+    for event, row in (("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old")):
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS integrity_mark_{event.lower()}
+                         AFTER {event} ON vault BEGIN
+                             {mark.format(row)}
+                         END""")
+    # a row can change id in an UPDATE; flag the bucket it left as well
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS integrity_mark_move
+                     AFTER UPDATE OF id ON vault BEGIN
+                         {mark.format('old')}
+                     END""")
+    if conn.execute("SELECT COUNT(*) FROM integrity_buckets").fetchone()[0] == 0:
+        conn.executemany("INSERT INTO integrity_buckets (bucket, dirty) VALUES (?, 1)",
+                         [(b,) for b in range(BUCKETS)])
+    conn.commit()
+
+
+# ----------------------------- MACS -----------------------------
+
+
+@lru_cache(maxsize=4)
+def _mac_key(fernet_key):
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                info=b"password-vault integrity v1").derive(fernet_key)
+
+
+def _field(value):
+    if isinstance(value, str):
+        value = value.encode()
+    value = bytes(value or b"")
+    return struct.pack(">I", len(value)) + value
+
+
+def row_mac(key, rid, service, username, password):
+    msg = struct.pack(">q", rid) + _field(service) + _field(username) + _field(password)
+    return hmac.new(key, msg, hashlib.sha256).digest()
+
+
+def _digest(key, parts):
+    h = hmac.new(key, digestmod=hashlib.sha256)
+    for p in parts:
+        h.update(p)
+    return h.digest()
+
+
+def _root(conn, key):
+    return _digest(key, [d or b"" for (d,) in
+                         conn.execute("SELECT digest FROM integrity_buckets ORDER BY bucket")])
+
+
+def seal_rows(conn, cipher, ids):
+    """Record the MAC of rows the app just wrote. Caller commits."""
+    key = _mac_key(cipher.key)
+    name = service_column(conn)
+    for rid in ids:
+        row = conn.execute(f"SELECT id, {name}, username, password FROM vault WHERE id = ?",
+                           (rid,)).fetchone()
+        if row:
+            conn.execute("INSERT OR REPLACE INTO integrity_rows (entry_id, mac) VALUES (?, ?)",
+                         (row[0], row_mac(key, *row)))
+
+
+def forget_rows(conn, ids):
+    """Drop MACs of rows the app deleted. Caller commits."""
+    conn.executemany("DELETE FROM integrity_rows WHERE entry_id = ?", [(rid,) for rid in ids])
+
+
+# ----------------------------- VERIFY -----------------------------
+
+
+def verify(conn, cipher, full=False):
+    """Rehash dirty buckets (all buckets with full=True) and the root.
+
+    Returns a dict with the buckets and rows checked and a list of
+    (entry_id, problem) where problem is "modified", "unsealed" or
+    "deleted", plus whether the stored root matched.
+
+    Each batch of COMMIT_EVERY buckets is one transaction, committed with
+    a fresh root, so the apps can write between batches even during a
+    first full adoption.
+    """
+    key = _mac_key(cipher.key)
+    name = service_column(conn)
+    meta = dict(conn.execute("SELECT key, value FROM integrity_meta"))
+    adopting = meta.get("sealed") is None
+
+    # the stored root covers the bucket digests as of the last verify; triggers
+    # only flip dirty flags, so any digest change since then is tampering
+    old_root = meta.get("root")
+    root_ok = old_root is None or hmac.compare_digest(old_root, _root(conn, key))
+
+    if full or adopting:
+        buckets = list(range(BUCKETS))
+    else:
+        buckets = [b for (b,) in conn.execute("SELECT bucket FROM integrity_buckets WHERE dirty = 1")]
+
+    def save_root():
+        conn.execute("INSERT OR REPLACE INTO integrity_meta (key, value) VALUES ('root', ?)",
+                     (_root(conn, key),))
+        conn.commit()
+
+    problems, rows_checked = [], 0
+    for start in range(0, len(buckets), COMMIT_EVERY):
+        # the stored MACs and the rows they are checked against are read in one
+        # transaction, so a UI save or the migration can't land between them;
+        # IMMEDIATE so the digest writes below don't have to upgrade a stale read
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        for b in buckets[start:start + COMMIT_EVERY]:
+            stored = dict(conn.execute(f"SELECT entry_id, mac FROM integrity_rows "
+                                       f"WHERE entry_id % {BUCKETS} = ?", (b,)))
+            macs, bad = [], []
+            for row in conn.execute(f"SELECT id, {name}, username, password FROM vault "
+                                    f"WHERE id % {BUCKETS} = ? ORDER BY id", (b,)):
+                rows_checked += 1
+                mac = row_mac(key, *row)
+                expected = stored.pop(row[0], None)
+                if expected is None and adopting:
+                    conn.execute("INSERT INTO integrity_rows (entry_id, mac) VALUES (?, ?)", (row[0], mac))
+                elif expected is None:
+                    bad.append((row[0], "unsealed"))
+                elif not hmac.compare_digest(expected, mac):
+                    bad.append((row[0], "modified"))
+                macs.append(mac)
+            bad += [(rid, "deleted") for rid in stored]
+            if bad:
+                problems += bad
+                conn.execute("UPDATE integrity_buckets SET dirty = 1 WHERE bucket = ?", (b,))
+            else:
+                conn.execute("UPDATE integrity_buckets SET digest = ?, dirty = 0 WHERE bucket = ?",
+                             (_digest(key, macs), b))
+        # the root goes in with the digests, or the next verify would call them tampered
+        save_root()
+
+    # buckets with problems keep their old digest and stay dirty for next time;
+    # an adoption cut short stays unsealed and picks up where it stopped
+    conn.execute("INSERT OR REPLACE INTO integrity_meta (key, value) VALUES ('sealed', 1)")
+    save_root()
+    return {"buckets_checked": len(buckets), "rows_checked": rows_checked,
+            "problems": problems, "root_ok": root_ok}
+
+
+def describe(report):
+    """One-paragraph summary for a messagebox, or None if everything checked out."""
+    if not report["problems"] and report["root_ok"]:
+        return None
+    counts = {}
+    for _, kind in report["problems"]:
+        counts[kind] = counts.get(kind, 0) + 1
+    parts = [f"{n} {kind}" for kind, n in sorted(counts.items())]
+    if not report["root_ok"]:
+        parts.append("integrity index itself was altered")
+    ids = ", ".join(str(rid) for rid, _ in report["problems"][:10])
+    more = "…" if len(report["problems"]) > 10 else ""
+    return ("The vault failed its integrity check: " + "; ".join(parts) + "."
+            + (f"\nAffected entry ids: {ids}{more}" if ids else ""))
+
+
+def verify_in_background(root, db_path, cipher, on_result, full=False):
+    """Run verify() on a worker thread and call on_result(report, error) on the Tk thread.
+
+    Exactly one of the two is None: error is a message when the check
+    couldn't run at all.
+    """
+    result = {}
+
+    def work():
+        try:
+            conn = sqlite3.connect(db_path, timeout=30)
+            try:
+                result["report"] = verify(conn, cipher, full)
+            finally:
+                conn.close()
+        except Exception as e:
+            result["error"] = str(e) or type(e).__name__
+
+    thread = threading.Thread(target=work, name="vault-verify", daemon=True)
+    thread.start()
+
+    def poll():
+        if thread.is_alive():
+            root.after(200, poll)
+        else:
+            on_result(result.get("report"), result.get("error"))
+
+    root.after(200, poll)
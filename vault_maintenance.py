@@ -0,0 +1,151 @@
+"""
+Background housekeeping for vault.db.
+
+Deleting entries leaves free pages in the file and nothing ever ran
+ANALYZE or checkpointed the WAL. MaintenanceScheduler waits until the
+user has been idle for a while, then runs small steps on a worker
+thread:
+
+    PRAGMA incremental_vacuum(N)   give back up to N free pages
+    PRAGMA optimize                refresh planner statistics when useful
+    PRAGMA wal_checkpoint(PASSIVE) fold the WAL back into the main file
+
+Each step is short enough that a UI write waiting on the lock is never
+held up noticeably, and the next step only runs after another idle
+period. Before/after numbers (file size, free pages, fragmentation) are
+kept in `reports`.
+
+incremental_vacuum only gives pages back once the file uses incremental
+auto-vacuum, and switching an existing file over takes a full VACUUM
+that rewrites it and locks it for as long as that runs. That is never
+scheduled; the user runs it once with `vault_cli.py maintain --convert`
+(enable_incremental_vacuum()). Until then the idle steps still optimize
+and checkpoint.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from vault_timers import IdleLock
+
+STEP_PAGES = 64
+
+# ----------------------------- PRAGMAS -----------------------------
+
+
+def prepare(conn):
+    conn.execute("PRAGMA journal_mode=WAL")
+
+
+def incremental(conn):
+    return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def enable_incremental_vacuum(db_path):
+    """Switch the file to incremental auto-vacuum; returns False if it already was.
+
+    Runs a full VACUUM, which rewrites the whole file and holds it
+    locked until done, so only call this when the user asks for it.
+    """
+    conn = sqlite3.connect(db_path, timeout=5)
+    try:
+        prepare(conn)
+        if incremental(conn):
+            return False
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+
+def stats(conn, db_path):
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    wal = f"{db_path}-wal"
+    return {
+        "file_bytes": os.path.getsize(db_path),
+        "wal_bytes": os.path.getsize(wal) if os.path.exists(wal) else 0,
+        "page_size": page_size,
+        "pages": pages,
+        "free_pages": free,
+        "fragmentation": free / pages if pages else 0.0,
+    }
+
+
+def run_step(db_path, step_pages=STEP_PAGES):
+    """One bounded maintenance pass; returns before/after stats and whether work remains."""
+    conn = sqlite3.connect(db_path, timeout=5)
+    try:
+        t = time.perf_counter()
+        before = stats(conn, db_path)
+        prepare(conn)
+        vacuums = incremental(conn)
+        if vacuums:
+            conn.execute(f"PRAGMA incremental_vacuum({int(step_pages)})")
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        after = stats(conn, db_path)
+    finally:
+        conn.close()
+    # free pages only count as work left when incremental_vacuum can reach them
+    return {"before": before, "after": after, "seconds": time.perf_counter() - t,
+            "incremental": vacuums, "more": vacuums and after["free_pages"] > 0}
+
+
+# ----------------------------- SCHEDULER -----------------------------
+
+
+class MaintenanceScheduler:
+    """Runs run_step() on a worker thread after `idle_seconds` without user input.
+
+    Driven by the shared TimerWheel: an IdleLock watcher fires the step and
+    a wheel timer polls the worker, so no extra after() loops are added.
+    """
+
+    def __init__(self, root, wheel, db_path, idle_seconds=30, rest_seconds=600,
+                 step_pages=STEP_PAGES, keep=20):
+        self.wheel = wheel
+        self.idle_seconds = idle_seconds
+        self.rest_seconds = rest_seconds
+        self.db_path = db_path
+        self.step_pages = step_pages
+        self.keep = keep
+        self.reports = []
+        self._thread = None
+        self._result = None
+        self.idle = IdleLock(wheel, root, idle_seconds, self._start_step, key="maintenance")
+
+    def _start_step(self):
+        if self._thread is not None:
+            return
+
+        def work():
+            try:
+                self._result = run_step(self.db_path, self.step_pages)
+            except sqlite3.Error:
+                self._result = None  # busy or locked; try again next idle period
+
+        self._thread = threading.Thread(target=work, name="vault-maintenance", daemon=True)
+        self._thread.start()
+        self.wheel.schedule("maintenance-poll", 0.2, self._poll)
+
+    def _poll(self):
+        if self._thread.is_alive():
+            self.wheel.schedule("maintenance-poll", 0.2, self._poll)
+            return
+        self._thread = None
+        more = True
+        if self._result is not None:
+            self.reports = (self.reports + [self._result])[-self.keep:]
+            more = self._result["more"]
+        # keep stepping on short idle periods while free pages remain, then rest
+        self.idle.seconds = self.idle_seconds if more else self.rest_seconds
+        self.idle.arm()
+
+    def stop(self):
+        self.idle.disarm()
+        self.wheel.cancel("maintenance-poll")
@@ -0,0 +1,170 @@
+"""
+Opt-in timing instrumentation for the vault apps.
+
+    VAULT_METRICS=1 python passvault.py             # timing summary on exit
+    VAULT_PROFILE=vault.prof python passvault.py    # also write a cProfile/pstats file
+
+Operations are timed with `with timer("load_entries", "db"):` or the
+`@timed("decrypt", "crypto")` decorator. Each (operation, kind) pair keeps
+a count, total/min/max and a power-of-two histogram of durations, where
+kind is one of "db", "crypto" or "widget".
+
+When neither variable is set, `timed` returns the function untouched and
+`timer` hands back a shared no-op context manager, so instrumented code
+pays next to nothing.
+
+StartupClock measures how long a screen takes to paint for the first time
+and to become interactive (first page of entries in the tree).
+"""
+
+import atexit
+import functools
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+PROFILE_PATH = os.environ.get("VAULT_PROFILE", "")
+ENABLED = os.environ.get("VAULT_METRICS", "") not in ("", "0") or bool(PROFILE_PATH)
+
+_NULL = nullcontext()
+STATS = {}
+
+# ----------------------------- RECORDING -----------------------------
+
+
+class Stat:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        # bucket b holds durations in [2**(b-1), 2**b) microseconds
+        b = int(seconds * 1_000_000).bit_length()
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+
+def record(op, kind, seconds):
+    stat = STATS.get((op, kind))
+    if stat is None:
+        stat = STATS[(op, kind)] = Stat()
+    stat.add(seconds)
+
+
+class _Timer:
+    __slots__ = ("op", "kind", "start")
+
+    def __init__(self, op, kind):
+        self.op = op
+        self.kind = kind
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.op, self.kind, time.perf_counter() - self.start)
+        return False
+
+
+def timer(op, kind):
+    if not ENABLED:
+        return _NULL
+    return _Timer(op, kind)
+
+
+def timed(op, kind):
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(op, kind, time.perf_counter() - start)
+
+        return inner
+    return wrap
+
+
+class StartupClock:
+    """Time from `start` to the first paint of `root` and to interactive().
+
+    The two durations are kept on the instance and, when metrics are on,
+    recorded as ("first_paint", "startup") and ("interactive", "startup").
+    """
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.first_paint = None
+        self.interactive_at = None
+
+    def watch(self, root):
+        """Note the first paint of root, now if it is already on screen."""
+        def painted():
+            if self.first_paint is None:
+                self.first_paint = time.perf_counter() - self.start
+                if ENABLED:
+                    record("first_paint", "startup", self.first_paint)
+
+        if root.winfo_ismapped():
+            root.after_idle(painted)
+        else:
+            # after_idle runs once Tk has drawn the newly mapped window
+            root.bind("<Map>", lambda e: root.after_idle(painted), add="+")
+
+    def interactive(self):
+        if self.interactive_at is None:
+            self.interactive_at = time.perf_counter() - self.start
+            if ENABLED:
+                record("interactive", "startup", self.interactive_at)
+
+
+# ----------------------------- REPORTING -----------------------------
+
+
+def summary():
+    lines = [f"{'operation':<22}{'kind':<8}{'count':>8}{'total ms':>12}{'avg ms':>10}{'max ms':>10}"]
+    for (op, kind), s in sorted(STATS.items(), key=lambda kv: -kv[1].total):
+        lines.append(f"{op:<22}{kind:<8}{s.count:>8}{s.total * 1000:>12.2f}"
+                     f"{s.total / s.count * 1000:>10.3f}{s.max * 1000:>10.3f}")
+        hist = "  ".join(f"<{1 << b}us:{n}" for b, n in sorted(s.buckets.items()))
+        lines.append(f"    {hist}")
+    by_kind = {}
+    for (op, kind), s in STATS.items():
+        by_kind[kind] = by_kind.get(kind, 0.0) + s.total
+    lines.append("totals: " + ", ".join(f"{k} {v * 1000:.2f} ms" for k, v in sorted(by_kind.items())))
+    return "\n".join(lines)
+
+
+def _dump():
+    if STATS:
+        print(summary(), file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(_dump)
+    if PROFILE_PATH:
+        import cProfile
+
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+        def _dump_profile():
+            _profiler.disable()
+            _profiler.dump_stats(PROFILE_PATH)
+            print(f"profile written to {PROFILE_PATH}", file=sys.stderr)
+
+        atexit.register(_dump_profile)
@@ -0,0 +1,333 @@
+"""
+Keyset-paginated queries over the vault table.
+
+The three vault UIs and vault_cli.py list entries a page at a time
+instead of fetchall() on the whole table. Pages are addressed by a
+cursor on (sort_key, id), so fetching page N costs the same as page 1
+no matter how many rows the vault holds (no OFFSET scans).
+
+passvault.py/project.py call the name column `service`, password_vault.py
+calls it `website`; service_column() picks whichever the table has.
+
+Sorting by service or username is case-insensitive and served by the
+COLLATE NOCASE indexes from ensure_indexes(), so changing the sort is an
+index scan rather than a sort of the whole table.
+
+AsyncPageLoader does the same paging with the query and decryption on a
+worker thread, handing rows to the Tk thread in small after() batches so
+the window can paint and respond while a page is still loading.
+"""
+
+import sqlite3
+import threading
+
+from vault_metrics import timer
+
+PAGE_SIZE = 200
+
+# ----------------------------- SCHEMA HELPERS -----------------------------
+
+
+def service_column(conn):
+    cols = [row[1] for row in conn.execute("PRAGMA table_info(vault)")]
+    return "website" if "website" in cols else "service"
+
+
+def ensure_indexes(conn):
+    """Create the NOCASE sort indexes; cheap no-op once they exist."""
+    name = service_column(conn)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_vault_service_nocase "
+                 f"ON vault({name} COLLATE NOCASE, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_vault_username_nocase "
+                 "ON vault(username COLLATE NOCASE, id)")
+    conn.commit()
+
+
+def _sort_expr(conn, sort):
+    if sort == "id":
+        return "id"
+    if sort in ("service", "website"):
+        return service_column(conn)
+    if sort == "username":
+        return "username"
+    raise ValueError(f"Cannot sort vault by {sort!r}")
+
+
+# ----------------------------- PAGINATION -----------------------------
+
+
+def _contains(search):
+    """LIKE pattern (used with ESCAPE '\\') matching `search` literally anywhere."""
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _check_page_size(page_size):
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+
+
+def fetch_page(conn, sort="id", descending=False, after=None, page_size=PAGE_SIZE, search=""):
+    """Return (rows, cursor) for one page of (id, service, username, password).
+
+    `after` is the cursor returned by the previous call (None for the first
+    page). The returned cursor is None once there are no more rows.
+    """
+    _check_page_size(page_size)
+    col = _sort_expr(conn, sort)
+    name = service_column(conn)
+    op, order = ("<", "DESC") if descending else (">", "ASC")
+
+    where, params = [], []
+    if search:
+        where.append(f"({name} LIKE ? ESCAPE '\\' OR username LIKE ? ESCAPE '\\')")
+        params += [_contains(search)] * 2
+    if after is not None:
+        if col == "id":
+            where.append(f"id {op} ?")
+            params.append(after[1])
+        else:
+            # spelled out instead of a row value so SQLite can seek the index
+            key = f"{col} COLLATE NOCASE"
+            where.append(f"{key} {op}= ? AND ({key} {op} ? OR id {op} ?)")
+            params += [after[0], after[0], after[1]]
+
+    sql = f"SELECT id, {name}, username, password FROM vault"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if col == "id":
+        sql += f" ORDER BY id {order} LIMIT ?"
+    else:
+        sql += f" ORDER BY {col} COLLATE NOCASE {order}, id {order} LIMIT ?"
+    params.append(page_size)
+
+    rows = conn.execute(sql, params).fetchall()
+    if len(rows) < page_size:
+        return rows, None
+    last = rows[-1]
+    key = {"id": last[0], name: last[1], "username": last[2]}[col]
+    return rows, (key, last[0])
+
+
+def count_rows(conn, search=""):
+    """Number of rows fetch_page() would page through for `search`."""
+    if not search:
+        return conn.execute("SELECT COUNT(*) FROM vault").fetchone()[0]
+    name = service_column(conn)
+    return conn.execute(f"SELECT COUNT(*) FROM vault WHERE {name} LIKE ? ESCAPE '\\' "
+                        f"OR username LIKE ? ESCAPE '\\'", [_contains(search)] * 2).fetchone()[0]
+
+
+def fetch_by_ids(conn, ids):
+    """Rows (id, service, username, password) for `ids`, in the order given."""
+    if not ids:
+        return []
+    name = service_column(conn)
+    marks = ",".join("?" * len(ids))
+    rows = conn.execute(f"SELECT id, {name}, username, password FROM vault WHERE id IN ({marks})",
+                        list(ids)).fetchall()
+    by_id = {row[0]: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def fetch_ids_page(conn, ids, after=None, page_size=PAGE_SIZE):
+    """Like fetch_page(), over a ranked list of ids; the cursor is the next offset."""
+    _check_page_size(page_size)
+    start = after or 0
+    end = start + page_size
+    return fetch_by_ids(conn, ids[start:end]), (end if end < len(ids) else None)
+
+
+def iter_pages(conn, sort="id", descending=False, page_size=PAGE_SIZE, search=""):
+    """Yield pages until the table is exhausted."""
+    cursor = None
+    while True:
+        rows, cursor = fetch_page(conn, sort, descending, cursor, page_size, search)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+
+
+class PageLoader:
+    """Keeps the cursor for a Treeview that fills itself a page at a time.
+
+    Hook on_scroll() into the tree's yscrollcommand; the next page is pulled
+    in when the view reaches the bottom. reset(ids=...) pages through a
+    ranked id list (fuzzy search results) instead of the LIKE query.
+    """
+
+    def __init__(self, db_path, insert_rows, sort="id", descending=False, page_size=PAGE_SIZE):
+        self.db_path = db_path
+        self.insert_rows = insert_rows
+        self.sort = sort
+        self.descending = descending
+        self.page_size = page_size
+        self.search = ""
+        self.ids = None
+        self.cursor = None
+        self.done = True
+
+    def toggle_sort(self, sort):
+        """Sort by `sort`, flipping direction if it is already the sort key.
+
+        The caller clears its view and calls reset() afterwards.
+        """
+        if self.sort == sort:
+            self.descending = not self.descending
+        else:
+            self.sort, self.descending = sort, False
+
+    def heading(self, title, sort):
+        """Column title with an arrow when the view is sorted by it."""
+        if self.sort != sort:
+            return title
+        return title + (" ▼" if self.descending else " ▲")
+
+    def reset(self, search="", ids=None):
+        self.search = search
+        self.ids = ids
+        self.cursor = None
+        self.done = False
+        self.next_page()
+
+    def stop(self):
+        """Stop fetching pages, e.g. while the view shows something else."""
+        self.done = True
+
+    def next_page(self):
+        if self.done:
+            return
+        with timer("fetch_page", "db"):
+            conn = sqlite3.connect(self.db_path)
+            try:
+                if self.ids is not None:
+                    rows, self.cursor = fetch_ids_page(conn, self.ids, self.cursor, self.page_size)
+                else:
+                    rows, self.cursor = fetch_page(conn, self.sort, self.descending, self.cursor,
+                                                   self.page_size, self.search)
+            finally:
+                conn.close()
+        self.done = self.cursor is None
+        with timer("insert_rows", "widget"):
+            self.insert_rows(rows)
+
+    def on_scroll(self, first, last):
+        if float(last) >= 1.0 and not self.done:
+            self.next_page()
+
+
+class AsyncPageLoader(PageLoader):
+    """PageLoader that never blocks the Tk thread.
+
+    Each page is fetched and passed through `decode(row)` on a worker
+    thread; the results go to insert_rows() `batch` rows per after() tick.
+    on_progress(shown, total, busy) is called on the Tk thread as rows
+    arrive, where total is the row count for the current search (None
+    until the first page is back). A reset() or stop() while a page is in
+    flight discards it.
+    """
+
+    def __init__(self, root, db_path, insert_rows, decode=None, sort="id", descending=False,
+                 page_size=PAGE_SIZE, batch=50, on_progress=None):
+        super().__init__(db_path, insert_rows, sort, descending, page_size)
+        self.root = root
+        self.decode = decode
+        self.batch = batch
+        self.on_progress = on_progress
+        self.generation = 0
+        self.busy = False
+        self.shown = 0
+        self.total = None
+        self._wanted = False
+
+    def reset(self, search="", ids=None):
+        self.generation += 1
+        self.busy = self._wanted = False
+        self.shown, self.total = 0, None
+        super().reset(search, ids)
+
+    def stop(self):
+        self.generation += 1
+        self.busy = self._wanted = False
+        super().stop()
+        self._progress()
+
+    def next_page(self):
+        if self.done or self.busy:
+            return
+        self.busy = True
+        gen = self.generation
+        query = (self.sort, self.descending, self.cursor, self.page_size, self.search)
+        ids = self.ids
+        want_total = self.total is None
+        result = {}
+
+        def work():
+            conn = sqlite3.connect(self.db_path)
+            try:
+                with timer("fetch_page", "db"):
+                    if ids is not None:
+                        rows, cursor = fetch_ids_page(conn, ids, query[2], query[3])
+                        total = len(ids)
+                    else:
+                        rows, cursor = fetch_page(conn, *query)
+                        total = count_rows(conn, query[-1]) if want_total else None
+            except sqlite3.Error as e:
+                result["error"] = e
+                return
+            finally:
+                conn.close()
+            if self.decode is not None:
+                with timer("decode_page", "crypto"):
+                    rows = [self.decode(row) for row in rows]
+            result.update(rows=rows, cursor=cursor, total=total)
+
+        thread = threading.Thread(target=work, name="vault-page", daemon=True)
+        thread.start()
+        self._progress()
+
+        def poll():
+            if gen != self.generation:
+                return
+            if thread.is_alive():
+                self.root.after(5, poll)
+            elif "error" in result:
+                self.busy = False
+                self._progress()
+            else:
+                self.cursor = result["cursor"]
+                self.done = self.cursor is None
+                if want_total:
+                    self.total = result["total"]
+                self._insert_batches(gen, result["rows"], 0)
+
+        self.root.after(5, poll)
+
+    def _insert_batches(self, gen, rows, start):
+        if gen != self.generation:
+            return
+        chunk = rows[start:start + self.batch]
+        if chunk:
+            with timer("insert_rows", "widget"):
+                self.insert_rows(chunk)
+            self.shown += len(chunk)
+        if start + self.batch < len(rows):
+            self._progress()
+            self.root.after(1, self._insert_batches, gen, rows, start + self.batch)
+            return
+        self.busy = False
+        self._progress()
+        if self._wanted:
+            # the view reached the bottom while this page was loading
+            self._wanted = False
+            self.next_page()
+
+    def on_scroll(self, first, last):
+        if float(last) >= 1.0 and self.busy:
+            self._wanted = True
+        super().on_scroll(first, last)
+
+    def _progress(self):
+        if self.on_progress is not None:
+            self.on_progress(self.shown, self.total, self.busy)
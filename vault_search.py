@@ -0,0 +1,166 @@
+"""
+Typo-tolerant search over service and username.
+
+TrigramIndex keeps an in-memory inverted index from character trigrams to
+entry ids. It is built once when the vault is opened (names only, no
+passwords are decrypted) and kept current with add()/remove() as entries
+are saved and deleted, so a query never touches SQLite until the matching
+rows are fetched by id.
+
+Candidates are scored by the share of the query's trigrams they contain,
+plus a bonus for plain substring matches, so "gihtub" still finds
+"github.com" while exact hits stay on top. Queries shorter than three
+characters carry too little signal for trigrams and fall back to a
+substring scan.
+
+remove() just forgets the document and its stale ids are skipped at
+query time until the next compaction. Editing an entry (add() for an id
+already indexed, or one removed since the last compaction) moves its id
+only between the posting lists whose trigrams changed, so no list ever
+holds an id twice.
+
+search() returns every match, best first; the UIs page through the list.
+"""
+
+import sqlite3
+import threading
+from collections import Counter
+
+from vault_query import service_column
+
+
+def trigrams(text):
+    text = f"  {text.lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self):
+        self.postings = {}
+        self.docs = {}
+        self.removed = {}  # id -> text of entries removed since the last compaction
+
+    @classmethod
+    def from_db(cls, db_path):
+        index = cls()
+        conn = sqlite3.connect(db_path)
+        try:
+            name = service_column(conn)
+            for rid, service, username in conn.execute(f"SELECT id, {name}, username FROM vault"):
+                index.add(rid, service, username)
+        finally:
+            conn.close()
+        return index
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, rid, service, username):
+        """Index an entry; calling it again for the same id replaces it (edit)."""
+        old = self.docs.pop(rid, None) or self.removed.pop(rid, None)
+        self.docs[rid] = f"{service}\x00{username}".lower()
+        grams = trigrams(service) | trigrams(username)
+        postings = self.postings
+        if old is not None:
+            old_grams = set().union(*map(trigrams, old.split("\x00", 1)))
+            for g in old_grams - grams:
+                postings[g].remove(rid)
+            grams -= old_grams  # already listed under the trigrams it kept
+        for g in grams:
+            ids = postings.get(g)
+            if ids is None:
+                postings[g] = [rid]
+            else:
+                ids.append(rid)
+
+    def remove(self, rid):
+        text = self.docs.pop(rid, None)
+        if text is not None:
+            self.removed[rid] = text
+            if len(self.removed) > 1000 and len(self.removed) > len(self.docs) // 4:
+                self.compact()
+
+    def compact(self):
+        """Rebuild posting lists without ids of removed entries."""
+        docs, self.docs, self.postings, self.removed = self.docs, {}, {}, {}
+        for rid, text in docs.items():
+            self.add(rid, *text.split("\x00", 1))
+
+    def search(self, query, limit=None, min_score=0.3):
+        """Return the ids of all matching entries (or the best `limit`), best match first."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        if len(query) < 3:
+            return [rid for rid, text in self.docs.items() if query in text][:limit]
+        qgrams = trigrams(query)
+        # Rare trigrams pick the candidates; grams shared by a large part of
+        # the vault (".co", "com") add little but cost a lot to count.
+        lists = sorted((self.postings[g] for g in qgrams if g in self.postings), key=len)
+        common = max(2000, len(self.docs) // 20)
+        hits = Counter()
+        for n, ids in enumerate(lists):
+            if n >= 2 and len(ids) > common:
+                break
+            hits.update(ids)
+        scored = []
+        nq = len(qgrams)
+        for rid in hits:
+            text = self.docs.get(rid)
+            if text is None:
+                continue
+            service, username = text.split("\x00", 1)
+            # best single field, measured against the query alone so a long
+            # username doesn't drown a good service match
+            score = max(len(qgrams & trigrams(service)), len(qgrams & trigrams(username))) / nq
+            if query in text:
+                score += 1.0
+            if score >= min_score:
+                scored.append((-score, rid))
+        scored.sort()
+        return [rid for _, rid in scored[:limit]]
+
+
+class BackgroundIndex:
+    """Builds a TrigramIndex on a worker thread so opening the vault isn't delayed.
+
+    add()/remove() calls made while the build runs are queued and replayed
+    once it finishes; search() returns None until the index is ready so
+    callers can fall back to a SQL LIKE query.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.index = None
+        self._pending = []
+        self._lock = threading.Lock()
+        threading.Thread(target=self._build, name="vault-search-index", daemon=True).start()
+
+    def _build(self):
+        index = TrigramIndex.from_db(self.db_path)
+        with self._lock:
+            for op, args in self._pending:
+                getattr(index, op)(*args)
+            self._pending = None
+            self.index = index
+
+    @property
+    def ready(self):
+        return self.index is not None
+
+    def add(self, rid, service, username):
+        self._apply("add", (rid, service, username))
+
+    def remove(self, rid):
+        self._apply("remove", (rid,))
+
+    def _apply(self, op, args):
+        with self._lock:
+            if self.index is None:
+                self._pending.append((op, args))
+            else:
+                getattr(self.index, op)(*args)
+
+    def search(self, query, limit=None):
+        index = self.index
+        return None if index is None else index.search(query, limit)
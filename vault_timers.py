@@ -0,0 +1,167 @@
+"""
+Timer wheel for the vault UIs.
+
+All time-based housekeeping (clipboard auto-clear, idle auto-lock and
+cache expiry) shares one Tk after() tick instead of scheduling one
+after() callback per job.
+"""
+
+import hashlib
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# ----------------------------- TIMER WHEEL -----------------------------
+
+
+class TimerWheel:
+    """Hashed timer wheel driven by a single Tk after() callback.
+
+    Deadlines are bucketed into `slots` by tick number, so scheduling and
+    cancelling are O(1) and a tick only looks at one bucket. The after()
+    loop only runs while something is pending.
+    """
+
+    def __init__(self, root, tick_ms=250, slots=128):
+        self.root = root
+        self.tick_ms = tick_ms
+        self.slots = [dict() for _ in range(slots)]
+        self.now = 0
+        self._where = {}
+        self._after_id = None
+        self._last = None
+
+    def schedule(self, key, seconds, callback):
+        """Run callback after `seconds`; reusing a key replaces the old timer."""
+        self.cancel(key)
+        deadline = self.now + max(1, int(round(seconds * 1000 / self.tick_ms)))
+        slot = deadline % len(self.slots)
+        self.slots[slot][key] = (deadline, callback)
+        self._where[key] = slot
+        self._start()
+        return key
+
+    def cancel(self, key):
+        slot = self._where.pop(key, None)
+        if slot is not None:
+            self.slots[slot].pop(key, None)
+
+    def pending(self, key):
+        return key in self._where
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _start(self):
+        if self._after_id is None:
+            self._last = time.monotonic()
+            self._after_id = self.root.after(self.tick_ms, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+        # catch up if the event loop was busy and we missed ticks
+        steps = max(1, int((now - self._last) * 1000 // self.tick_ms))
+        self._last += steps * self.tick_ms / 1000
+        start = self.now
+        self.now += steps
+        for t in range(start + 1, start + 1 + min(steps, len(self.slots))):
+            self._fire(self.slots[t % len(self.slots)])
+        if self._where:
+            self._after_id = self.root.after(self.tick_ms, self._tick)
+
+    def _fire(self, bucket):
+        due = [(key, cb) for key, (deadline, cb) in bucket.items() if deadline <= self.now]
+        for key, callback in due:
+            bucket.pop(key, None)
+            self._where.pop(key, None)
+            try:
+                callback()
+            except Exception:
+                # keep firing the rest, but a failed auto-lock or clipboard clear must leave a trace
+                log.exception("timer %r failed", key)
+
+
+# ----------------------------- HOUSEKEEPING JOBS -----------------------------
+
+
+def clear_clipboard_later(wheel, root, text, seconds):
+    """Clear the clipboard after `seconds` if it still holds `text`.
+
+    Only a digest of the copied value is kept so the wheel does not hold
+    the plaintext for the whole interval.
+    """
+    digest = hashlib.sha256(text.encode()).digest()
+
+    def _clear():
+        try:
+            current = root.clipboard_get()
+        except Exception:
+            return
+        if hashlib.sha256(current.encode()).digest() == digest:
+            root.clipboard_clear()
+            root.clipboard_append("")
+
+    wheel.schedule("clipboard", seconds, _clear)
+
+
+class IdleLock:
+    """Calls `on_lock` once no keyboard or mouse activity is seen for `seconds`.
+
+    `key` names the wheel slot, so several idle watchers can coexist.
+    """
+
+    def __init__(self, wheel, root, seconds, on_lock, armed=True, key="idle-lock"):
+        self.wheel = wheel
+        self.key = key
+        self.seconds = seconds
+        self.on_lock = on_lock
+        self.armed = False
+        for seq in ("<Any-KeyPress>", "<Any-ButtonPress>", "<Motion>"):
+            root.bind_all(seq, self.touch, add="+")
+        if armed:
+            self.arm()
+
+    def touch(self, event=None):
+        if self.armed:
+            self.wheel.schedule(self.key, self.seconds, self._expire)
+
+    def arm(self):
+        self.armed = True
+        self.touch()
+
+    def disarm(self):
+        self.armed = False
+        self.wheel.cancel(self.key)
+
+    def _expire(self):
+        self.armed = False
+        self.on_lock()
+
+
+class ExpiringCache:
+    """Small dict whose entries are dropped by the wheel after `ttl` seconds."""
+
+    def __init__(self, wheel, ttl):
+        self.wheel = wheel
+        self.ttl = ttl
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.wheel.schedule(("cache", key), self.ttl, lambda: self.data.pop(key, None))
+
+    def pop(self, key):
+        self.wheel.cancel(("cache", key))
+        return self.data.pop(key, None)
+
+    def clear(self):
+        for key in self.data:
+            self.wheel.cancel(("cache", key))
+        self.data.clear()